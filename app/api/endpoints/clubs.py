@@ -1,31 +1,45 @@
 from typing import Optional
 
 from fastapi import APIRouter
+from starlette.responses import Response
 
 from app.schemas import clubs as schemas
 from app.services.clubs.players import TransfermarktClubPlayers
 from app.services.clubs.profile import TransfermarktClubProfile
 from app.services.clubs.search import TransfermarktClubSearch
+from app.utils.responses import service_response
 
 router = APIRouter()
 
 
-@router.get("/search/{club_name}", response_model=schemas.ClubSearch, response_model_exclude_none=True)
-def search_clubs(club_name: str, page_number: Optional[int] = 1) -> dict:
-    tfmkt = TransfermarktClubSearch(query=club_name, page_number=page_number)
-    found_clubs = tfmkt.search_clubs()
-    return found_clubs
-
-
-@router.get("/{club_id}/profile", response_model=schemas.ClubProfile, response_model_exclude_defaults=True)
-def get_club_profile(club_id: str) -> dict:
-    tfmkt = TransfermarktClubProfile(club_id=club_id)
-    club_profile = tfmkt.get_club_profile()
-    return club_profile
-
-
-@router.get("/{club_id}/players", response_model=schemas.ClubPlayers, response_model_exclude_defaults=True)
-def get_club_players(club_id: str, season_id: Optional[str] = None) -> dict:
-    tfmkt = TransfermarktClubPlayers(club_id=club_id, season_id=season_id)
-    club_players = tfmkt.get_club_players()
-    return club_players
+@router.get("/search/{club_name}", response_model=schemas.ClubSearch)
+async def search_clubs(club_name: str, page_number: Optional[int] = 1) -> Response:
+    return await service_response(
+        TransfermarktClubSearch,
+        "search_clubs",
+        schemas.ClubSearch,
+        {"query": club_name, "page_number": page_number},
+        exclude_none=True,
+    )
+
+
+@router.get("/{club_id}/profile", response_model=schemas.ClubProfile)
+async def get_club_profile(club_id: str) -> Response:
+    return await service_response(
+        TransfermarktClubProfile,
+        "get_club_profile",
+        schemas.ClubProfile,
+        {"club_id": club_id},
+        exclude_defaults=True,
+    )
+
+
+@router.get("/{club_id}/players", response_model=schemas.ClubPlayers)
+async def get_club_players(club_id: str, season_id: Optional[str] = None) -> Response:
+    return await service_response(
+        TransfermarktClubPlayers,
+        "get_club_players",
+        schemas.ClubPlayers,
+        {"club_id": club_id, "season_id": season_id},
+        exclude_defaults=True,
+    )
@@ -1,23 +1,31 @@
 from typing import Optional
 
 from fastapi import APIRouter
+from starlette.responses import Response
 
 from app.schemas import competitions as schemas
 from app.services.competitions.clubs import TransfermarktCompetitionClubs
 from app.services.competitions.search import TransfermarktCompetitionSearch
+from app.utils.responses import service_response
 
 router = APIRouter()
 
 
 @router.get("/search/{competition_name}", response_model=schemas.CompetitionSearch)
-def search_competitions(competition_name: str, page_number: Optional[int] = 1):
-    tfmkt = TransfermarktCompetitionSearch(query=competition_name, page_number=page_number)
-    competitions = tfmkt.search_competitions()
-    return competitions
+async def search_competitions(competition_name: str, page_number: Optional[int] = 1) -> Response:
+    return await service_response(
+        TransfermarktCompetitionSearch,
+        "search_competitions",
+        schemas.CompetitionSearch,
+        {"query": competition_name, "page_number": page_number},
+    )
 
 
 @router.get("/{competition_id}/clubs", response_model=schemas.CompetitionClubs)
-def get_competition_clubs(competition_id: str, season_id: Optional[str] = None):
-    tfmkt = TransfermarktCompetitionClubs(competition_id=competition_id, season_id=season_id)
-    competition_clubs = tfmkt.get_competition_clubs()
-    return competition_clubs
+async def get_competition_clubs(competition_id: str, season_id: Optional[str] = None) -> Response:
+    return await service_response(
+        TransfermarktCompetitionClubs,
+        "get_competition_clubs",
+        schemas.CompetitionClubs,
+        {"competition_id": competition_id, "season_id": season_id},
+    )
@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+
+from app.utils.breaker import circuit_breakers
+from app.utils.cache import invalid_ids, not_found_cache, result_cache
+from app.utils.pagecache import page_cache
+from app.utils.ratelimit import rate_limiter
+from app.utils.remotecache import remote_cache
+from app.utils.revalidation import validator_store
+from app.utils.singleflight import single_flight
+
+router = APIRouter()
+
+
+@router.get("/upstream")
+async def get_upstream_status() -> dict:
+    return {
+        "singleFlight": single_flight.stats(),
+        "revalidation": validator_store.stats(),
+        "rateLimiter": rate_limiter.stats(),
+        "circuitBreakers": circuit_breakers.stats(),
+        "resultCache": result_cache.stats(),
+        "notFoundCache": not_found_cache.stats(),
+        "invalidIds": invalid_ids.stats(),
+        "pageCache": page_cache.stats(),
+        "remoteCache": remote_cache.stats(),
+    }
@@ -1,5 +1,8 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
@@ -7,18 +10,33 @@ from slowapi.util import get_remote_address
 from starlette.responses import RedirectResponse
 
 from app.api.api import api_router
+from app.services.base import TransfermarktBase
 from app.settings import settings
+from app.utils.codec import FastJSONResponse
+from app.utils.http import close_async_client, prewarm_connections
+from app.utils.parsers import check_parser_backends
 
 limiter = Limiter(
     key_func=get_remote_address,
     default_limits=[settings.RATE_LIMITING_FREQUENCY],
     enabled=settings.RATE_LIMITING_ENABLE,
 )
-app = FastAPI(title="Transfermarkt API")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.HTTP_PREWARM_ENABLE:
+        await run_in_threadpool(prewarm_connections)
+    yield
+    await close_async_client()
+
+
+app = FastAPI(title="Transfermarkt API", lifespan=lifespan, default_response_class=FastJSONResponse)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 app.add_middleware(SlowAPIMiddleware)
 app.include_router(api_router)
+check_parser_backends(TransfermarktBase.services())
 
 
 @app.get("/", include_in_schema=False)
@@ -1,10 +1,11 @@
 from datetime import datetime
 from typing import Optional
 
-from dateutil import parser
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 from pydantic.alias_generators import to_camel
 
+from app.utils.coercion import parse_date, parse_number
+
 
 class AuditMixin(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now)
@@ -29,10 +30,7 @@ class TransfermarktBaseModel(BaseModel):
         check_fields=False,
     )
     def parse_str_to_date(cls, v: str):
-        try:
-            return parser.parse(v).date() if v else None
-        except parser.ParserError:
-            return None
+        return parse_date(v)
 
     @field_validator(
         "current_market_value",
@@ -45,6 +43,7 @@ class TransfermarktBaseModel(BaseModel):
         "goals",
         "assists",
         "yellow_cards",
+        "second_yellow_cards",
         "red_cards",
         "minutes_played",
         "fee",
@@ -54,17 +53,7 @@ class TransfermarktBaseModel(BaseModel):
         check_fields=False,
     )
     def parse_str_to_int(cls, v: str) -> Optional[int]:
-        if not v or not any(char.isdigit() for char in v):
-            return None
-        value_str = v.lower().replace("€", "").replace("+", "").replace("'", "").strip()
-        if "k" in value_str:
-            return int(float(value_str.replace("k", "")) * 1_000)
-        elif "m" in value_str:
-            return int(float(value_str.replace("m", "")) * 1_000_000)
-        elif "b" in value_str:
-            return int(float(value_str.replace("b", "")) * 1_000_000_000)
-        else:
-            return int(float(value_str))
+        return parse_number(v)
 
     @field_validator("height", mode="before", check_fields=False)
     def parse_height(cls, v: str) -> Optional[int]:
@@ -12,6 +12,7 @@ class PlayerStat(TransfermarktBaseModel):
     goals: Optional[int]
     assists: Optional[int]
     yellow_cards: Optional[int]
+    second_yellow_cards: Optional[int]
     red_cards: Optional[int]
     minutes_played: Optional[int]
 
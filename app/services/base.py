@@ -1,15 +1,65 @@
-from dataclasses import dataclass, field
-from typing import Optional
+import asyncio
+import time
+from concurrent.futures import Future
+from contextvars import copy_context
+from dataclasses import MISSING, dataclass, field, fields
+from functools import partial
+from itertools import count
+from typing import ClassVar, Iterable, Optional, Union
 from xml.etree import ElementTree
 
-import requests
+import httpx
 from bs4 import BeautifulSoup
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 from lxml import etree
-from requests import Response, TooManyRedirects
+from requests import ConnectionError as RequestsConnectionError
+from requests import RequestException, Response, Session, Timeout, TooManyRedirects
+
+from app.settings import settings
+from app.utils.breaker import circuit_breakers
+from app.utils.extraction import Extraction
+from app.utils.http import get_async_client, get_charset, get_executor, get_session, get_timeout
+from app.utils.labels import LabelIndex
+from app.utils.pagecache import HEADER, CachedPage, page_cache, pages_fetched_after
+from app.utils.parsers import LexborElement, LxmlParser, get_parser
+from app.utils.pruning import prune_page
+from app.utils.ratelimit import rate_limiter
+from app.utils.remotecache import remote_cache
+from app.utils.revalidation import validator_store
+from app.utils.singleflight import single_flight
+from app.utils.utils import trim, trim_list
+from app.utils.xpath import Pagination, evaluate
+
+# The header of the responses served from the page caches holding when their body was fetched from upstream
+FETCHED_AT = "X-Fetched-At"
+
+
+class InvalidRequestError(HTTPException):
+    """
+    The not found (404) error of a service whose main page lacks the data it reads, as for an invalid id.
+
+    A page served with a 200 status can also lack it for other reasons, e.g. a captcha, consent or maintenance page,
+    or a truncated body, so it does not prove the id invalid, unlike an `UpstreamNotFoundError` of the main page.
+    """
 
-from app.utils.utils import trim
-from app.utils.xpath import Pagination
+
+class UpstreamNotFoundError(HTTPException):
+    """
+    The not found (404) error mirroring a 404 response from upstream.
+
+    When it is the response to the main page of a service, it proves the id the service reads invalid, see
+    `TransfermarktBase.invalid_id`.
+
+    Args:
+        url (str): The URL upstream answered 404 for.
+        detail (str): The error detail.
+    """
+
+    def __init__(self, url: str, detail: str) -> None:
+        """Initialize the UpstreamNotFoundError class."""
+        super().__init__(status_code=404, detail=detail)
+        self.url = url
 
 
 @dataclass
@@ -19,61 +69,529 @@ class TransfermarktBase:
 
     Args:
         URL (str): The URL for the web page to be fetched.
+        session (Session, optional): The HTTP session used to reach Transfermarkt. Defaults to the
+            process-wide pooled session, so connections are reused across requests.
+        prefetched (dict, optional): Responses already fetched, or futures of responses being fetched,
+            keyed by URL. make_request serves these instead of going to the network; see `prefetch` and
+            `create`.
     Attributes:
+        STREAM_UNTIL (tuple[str, ...]): The ids of the elements the service needs from its page. When set,
+            the page is parsed while it downloads and the download stops once all of them were parsed. The body
+            read is partial, so it is never written to the page caches, shared with other workers and machines, or
+            revalidated by other services. Only the squad page sets it, as all its data is read by the end of
+            the `yw1` squad grid. The services reading the player header also read boxes of `<main>`, e.g. the
+            market value rankings or the youth clubs, which have no id to stop at.
+        PARSER (str): The parser backend of the service, see `app.utils.parsers`. The `PARSER_BACKENDS` setting
+            overrides it per service.
+        REGIONS (tuple[str, ...]): The XPath expressions of the regions of the page the service reads, e.g. the
+            header and `<main>`. When set, the rest of the page body is dropped once parsed, see `prune_page`.
+        CACHE_TTL (float): How long the API keeps serving a result of the service from its result cache, in
+            seconds. The `CACHE_TTLS` setting overrides it per service.
+        CACHE_GRACE (float): How long past its TTL a result is still served, flagged as stale, while it is refreshed
+            in the background, in seconds. The `CACHE_GRACES` setting overrides it per service.
+        ENTITY_ID (str, optional): The argument holding the id of the player or club the service reads, if upstream
+            answers 404 for its main page only when that id is invalid. Such ids are remembered, see `invalid_id`.
         page (ElementTree): The parsed web page content.
         response (dict): A dictionary to store the response data.
+        fetched_at (float, optional): When the oldest page read from the page caches was fetched from upstream, in
+            seconds since the epoch. None if every page was downloaded for this instance.
     """
 
     URL: str
+    STREAM_UNTIL: ClassVar[tuple[str, ...]] = ()
+    PARSER: ClassVar[str] = LxmlParser.NAME
+    REGIONS: ClassVar[tuple[str, ...]] = ()
+    CACHE_TTL: ClassVar[float] = 3600.0
+    CACHE_GRACE: ClassVar[float] = 0.0
+    ENTITY_ID: ClassVar[Optional[str]] = None
     page: ElementTree = field(default_factory=lambda: None, init=False)
     response: dict = field(default_factory=lambda: {}, init=False)
+    fetched_at: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    session: Session = field(default_factory=get_session, repr=False, compare=False)
+    prefetched: dict = field(default_factory=dict, repr=False, compare=False)
 
-    def make_request(self, url: Optional[str] = None) -> Response:
+    @classmethod
+    def upstream_urls(cls, **kwargs) -> list[str]:
         """
-        Make an HTTP GET request to the specified URL.
+        Build the upstream URLs a service instance created with the given arguments will request.
 
         Args:
-            url (str, optional): The URL to make the request to. If not provided, the class's URL
-                attribute will be used.
+            **kwargs: The arguments the service would be instantiated with.
 
         Returns:
-            Response: An HTTP Response object containing the server's response to the request.
+            list[str]: The URLs to fetch, the main page URL first.
+        """
+        params = {f.name: f.default for f in fields(cls) if f.default is not MISSING}
+        params.update(kwargs)
+        return [cls.URL.format(**params)]
+
+    @classmethod
+    async def create(cls, client: Optional[httpx.AsyncClient] = None, **kwargs) -> "TransfermarktBase":
+        """
+        Instantiate the service without blocking the event loop.
+
+        The upstream pages are downloaded with the non-blocking HTTP client, then the instance is built
+        (which parses the pages) in the threadpool, so CPU-bound parsing stays off the event loop. Secondary
+        URLs download as tasks alongside the main page, and are cancelled if any download fails. The main page
+        of services that set `STREAM_UNTIL` is left to the threadpool, which parses it while it downloads.
+
+        Args:
+            client (httpx.AsyncClient, optional): The async client to use. Defaults to the shared one.
+            **kwargs: The arguments the service is instantiated with.
+
+        Returns:
+            TransfermarktBase: The initialized service instance.
 
         Raises:
-            HTTPException: If there are too many redirects, or if the server returns a client or
-                server error status code.
+            HTTPException: If any upstream request fails, as in make_request.
         """
-        url = self.URL if not url else url
+        url, *secondary_urls = cls.upstream_urls(**kwargs)
+        tasks = {
+            secondary_url: asyncio.create_task(cls.make_request_async(secondary_url, client))
+            for secondary_url in secondary_urls
+        }
+        prefetched = {}
         try:
-            response: Response = requests.get(
-                url=url,
-                headers={
-                    "User-Agent": (
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/113.0.0.0 "
-                        "Safari/537.36"
-                    ),
-                },
-            )
-        except TooManyRedirects:
-            raise HTTPException(status_code=404, detail=f"Not found for url: {url}")
-        except ConnectionError:
-            raise HTTPException(status_code=500, detail=f"Connection error for url: {url}")
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Error for url: {url}. {e}")
-        if 400 <= response.status_code < 500:
+            if not cls.STREAM_UNTIL:
+                prefetched[url] = await cls.make_request_async(url, client=client)
+            prefetched.update(zip(tasks, await asyncio.gather(*tasks.values())))
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            # Collect the outcome of every task, so none is reported as never retrieved
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return await run_in_threadpool(cls, prefetched=prefetched, **kwargs)
+
+    @staticmethod
+    def raise_for_status(url: str, status_code: int, reason: str) -> None:
+        """
+        Raise an HTTPException mirroring an upstream client or server error status code.
+
+        Args:
+            url (str): The requested URL.
+            status_code (int): The status code returned by the server.
+            reason (str): The reason phrase returned by the server.
+
+        Raises:
+            UpstreamNotFoundError: If the status code is 404.
+            HTTPException: If the status code is another client or server error.
+        """
+        if status_code == 404:
+            raise UpstreamNotFoundError(url, detail=f"Client Error. {reason} for url: {url}")
+        if 400 <= status_code < 500:
             raise HTTPException(
-                status_code=response.status_code,
-                detail=f"Client Error. {response.reason} for url: {url}",
+                status_code=status_code,
+                detail=f"Client Error. {reason} for url: {url}",
             )
-        elif 500 <= response.status_code < 600:
+        elif 500 <= status_code < 600:
             raise HTTPException(
-                status_code=response.status_code,
-                detail=f"Server Error. {response.reason} for url: {url}",
+                status_code=status_code,
+                detail=f"Server Error. {reason} for url: {url}",
             )
+
+    @classmethod
+    async def make_request_async(cls, url: str, client: Optional[httpx.AsyncClient] = None) -> httpx.Response:
+        """
+        Make a non-blocking HTTP GET request to the specified URL.
+
+        Concurrent requests for the same URL share a single upstream round trip.
+
+        Args:
+            url (str): The URL to make the request to.
+            client (httpx.AsyncClient, optional): The async client to use. Defaults to the shared one.
+
+        Returns:
+            httpx.Response: The server's response to the request.
+
+        Raises:
+            HTTPException: If there are too many redirects, if the request times out, or if the
+                server returns a client or server error status code.
+        """
+        return await single_flight.do_async(("response", url), partial(cls.fetch_async, url, client))
+
+    @classmethod
+    async def fetch_async(cls, url: str, client: Optional[httpx.AsyncClient] = None) -> httpx.Response:
+        """
+        Serve the specified URL from the page caches, or download it with the non-blocking HTTP client.
+
+        See `shared_content`: the caches are looked up, and the downloaded body stored, in the threadpool.
+
+        Args:
+            url (str): The URL to make the request to.
+            client (httpx.AsyncClient, optional): The async client to use. Defaults to the shared one.
+
+        Returns:
+            httpx.Response: The server's response to the request, or a 200 response holding the cached body and
+                its `FETCHED_AT` header.
+
+        Raises:
+            HTTPException: If there are too many redirects, if the request times out, if the host is
+                throttled for too long, if the circuit is open and nothing is stored for the URL, or if
+                the server returns a client or server error status code.
+        """
+        if not (page_cache.enabled or remote_cache.enabled):
+            return await cls.download_async(url, client)
+        cached, token = await run_in_threadpool(cls.shared_content, url)
+        if cached is not None:
+            headers = {FETCHED_AT: repr(cached.fetched_at)}
+            return httpx.Response(200, headers=headers, content=cached.content, request=httpx.Request("GET", url))
+        try:
+            response = await cls.download_async(url, client)
+            if response.status_code == 200:
+                await run_in_threadpool(cls.share_content, url, response.content)
+        finally:
+            await run_in_threadpool(remote_cache.unlock, f"page:{url}", token)
+        return response
+
+    @classmethod
+    async def download_async(cls, url: str, client: Optional[httpx.AsyncClient] = None) -> httpx.Response:
+        """
+        Download the specified URL with the non-blocking HTTP client, through the URL's circuit breaker.
+
+        While the breaker is open the request is not sent: the last stored body of the URL is served as a
+        not modified response instead, if there is one.
+
+        Args:
+            url (str): The URL to make the request to.
+            client (httpx.AsyncClient, optional): The async client to use. Defaults to the shared one.
+
+        Returns:
+            httpx.Response: The server's response to the request.
+
+        Raises:
+            HTTPException: If there are too many redirects, if the request times out, if the host is
+                throttled for too long, if the circuit is open and nothing is stored for the URL, or if
+                the server returns a client or server error status code.
+        """
+        breaker = circuit_breakers.get(url)
+        if not breaker.allow():
+            return httpx.Response(304, content=cls.stale_content(url), request=httpx.Request("GET", url))
+        with breaker.track():
+            response = await cls.get_with_retries_async(url, client or get_async_client())
+            cls.raise_for_status(url, response.status_code, response.reason_phrase)
+        if response.status_code == 304:
+            stored = validator_store.not_modified(url)
+            if stored is None or stored.partial:
+                return await cls.download_async(url, client=client)
+            if page_cache.enabled:
+                await run_in_threadpool(page_cache.set, url, stored.content)
+            return httpx.Response(304, headers=response.headers, content=stored.content, request=response.request)
+        validator_store.store(url, response.headers, response.content)
+        return response
+
+    @classmethod
+    def shared_content(cls, url: str, lock: bool = True) -> tuple[Optional[CachedPage], Optional[str]]:
+        """
+        Look the body of a URL up in the page cache of the machine, then in the remote cache shared by every machine.
+
+        Bodies are served while younger than the service's cache TTL, and while a cached result is refreshed only
+        if they were fetched after it, see `pages_fetched_after`. On a remote miss the lock of the URL is taken, so
+        that a single instance of the API downloads it while the others wait for it, see `RemoteCache.get_or_lock`.
+
+        Args:
+            url (str): The upstream URL.
+            lock (bool, optional): Whether to take the lock on a miss, for a caller that will share the body it
+                downloads. Default is True.
+
+        Returns:
+            tuple[Optional[CachedPage], Optional[str]]: The body and when it was fetched, or None and the token of
+                the remote lock taken, if any, to release once the downloaded body is shared.
+        """
+        fetched_after = pages_fetched_after.get()
+        cached = page_cache.get(url, min(cls.get_cache_ttl(), time.time() - fetched_after))
+        if cached is not None:
+            return cached, None
+        if lock:
+            value, token = remote_cache.get_or_lock(f"page:{url}")
+        else:
+            value, token = remote_cache.get(f"page:{url}"), None
+        if value is None:
+            return None, token
+        (fetched_at,) = HEADER.unpack_from(value)
+        if fetched_at <= fetched_after:
+            return None, None
+        content = value[HEADER.size :]
+        page_cache.set(url, content, fetched_at)
+        return CachedPage(content, fetched_at), None
+
+    @classmethod
+    def share_content(cls, url: str, content: bytes) -> None:
+        """
+        Store a downloaded body in the page cache of the machine and in the remote cache.
+
+        Args:
+            url (str): The upstream URL.
+            content (bytes): The body.
+        """
+        page_cache.set(url, content)
+        if remote_cache.enabled:
+            remote_cache.set(f"page:{url}", HEADER.pack(time.time()) + content, cls.get_cache_ttl())
+
+    @staticmethod
+    async def get_with_retries_async(url: str, client: httpx.AsyncClient) -> httpx.Response:
+        """
+        Send a GET request with the non-blocking HTTP client, pacing it and retrying it as needed.
+
+        Requests wait for a slot from the per-host adaptive rate limiter, and attempts that fail to connect,
+        time out or get a 429/5xx response are retried with jittered exponential backoff.
+
+        Args:
+            url (str): The URL to make the request to.
+            client (httpx.AsyncClient): The async client to use.
+
+        Returns:
+            httpx.Response: The response to the last attempt.
+
+        Raises:
+            HTTPException: If there are too many redirects, if the request times out, or if the host is
+                throttled for too long.
+        """
+        for attempt in count():
+            delay = rate_limiter.acquire(url)
+            if delay is None:
+                raise HTTPException(status_code=503, detail=f"Rate limited for url: {url}")
+            await asyncio.sleep(delay)
+            try:
+                response: httpx.Response = await client.get(url, headers=validator_store.conditional_headers(url))
+            except httpx.TooManyRedirects:
+                raise HTTPException(status_code=404, detail=f"Not found for url: {url}")
+            except (httpx.TimeoutException, httpx.NetworkError) as e:
+                delay = rate_limiter.record(url, attempt, status_code=None)
+                if delay is None:
+                    if isinstance(e, httpx.TimeoutException):
+                        raise HTTPException(status_code=504, detail=f"Timeout for url: {url}")
+                    raise HTTPException(status_code=500, detail=f"Connection error for url: {url}")
+                await asyncio.sleep(delay)
+                continue
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error for url: {url}. {e}")
+            delay = rate_limiter.record(url, attempt, response.status_code, response.headers.get("Retry-After"))
+            if delay is None:
+                return response
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def stale_content(url: str, partial: bool = False) -> bytes:
+        """
+        Return the last stored body of a URL whose circuit breaker is open.
+
+        Args:
+            url (str): The upstream URL.
+            partial (bool, optional): Whether the caller can use a partial stored body, see
+                `ValidatedContent.partial`. Default is False.
+
+        Returns:
+            bytes: The stored body.
+
+        Raises:
+            HTTPException: If nothing usable is stored for the URL.
+        """
+        stored = validator_store.get(url)
+        if stored is None or (stored.partial and not partial):
+            raise HTTPException(status_code=503, detail=f"Service unavailable for url: {url}")
+        return stored.content
+
+    def prefetch(self, url: str) -> None:
+        """
+        Start downloading the specified URL in the background.
+
+        A later make_request for the same URL waits for this download instead of starting a new one, so
+        the caller can parse another page in the meantime.
+
+        Args:
+            url (str): The URL to download.
+        """
+        if url not in self.prefetched:
+            self.prefetched[url] = get_executor().submit(copy_context().run, self.send_request, url)
+
+    def make_request(self, url: Optional[str] = None) -> Union[Response, httpx.Response]:
+        """
+        Make an HTTP GET request to the specified URL, unless its response was prefetched.
+
+        Args:
+            url (str, optional): The URL to make the request to. If not provided, the class's URL
+                attribute will be used.
+
+        Returns:
+            Union[Response, httpx.Response]: An HTTP Response object containing the server's response
+                to the request.
+
+        Raises:
+            HTTPException: If there are too many redirects, if the request times out, or if the
+                server returns a client or server error status code.
+        """
+        url = self.URL if not url else url
+        prefetched = self.prefetched.pop(url, None)
+        if isinstance(prefetched, Future):
+            response = prefetched.result()
+        elif prefetched is not None:
+            response = prefetched
+        else:
+            response = self.send_request(url)
+        self.note_fetched_at(self.cached_fetched_at(response))
+        return response
+
+    @staticmethod
+    def cached_fetched_at(response: Union[Response, httpx.Response]) -> Optional[float]:
+        """
+        Tell when the body of a response served from the page caches was fetched from upstream.
+
+        Args:
+            response (Union[Response, httpx.Response]): The response.
+
+        Returns:
+            Optional[float]: The time in seconds since the epoch, or None if the body was just downloaded.
+        """
+        fetched_at = response.headers.get(FETCHED_AT)
+        return None if fetched_at is None else float(fetched_at)
+
+    def note_fetched_at(self, fetched_at: Optional[float]) -> None:
+        """
+        Keep when a page the service read was fetched, if it is older than the pages read before.
+
+        Args:
+            fetched_at (float, optional): The time in seconds since the epoch, None for a page just downloaded.
+        """
+        if fetched_at is not None and (self.fetched_at is None or fetched_at < self.fetched_at):
+            self.fetched_at = fetched_at
+
+    def send_request(self, url: str) -> Response:
+        """
+        Make an HTTP GET request to the specified URL with the service's session.
+
+        Concurrent requests for the same URL share a single upstream round trip.
+
+        Args:
+            url (str): The URL to make the request to.
+
+        Returns:
+            Response: An HTTP Response object containing the server's response to the request.
+
+        Raises:
+            HTTPException: If there are too many redirects, if the request times out, or if the
+                server returns a client or server error status code.
+        """
+        return single_flight.do(("response", url), partial(self.fetch, url))
+
+    def fetch(self, url: str) -> Response:
+        """
+        Serve the specified URL from the page caches, or download it with the service's session.
+
+        See `shared_content`: a body found in the caches is served without a request, and a downloaded one is
+        stored in them.
+
+        Args:
+            url (str): The URL to make the request to.
+
+        Returns:
+            Response: An HTTP Response object containing the server's response to the request, or a 200 response
+                holding the cached body and its `FETCHED_AT` header.
+
+        Raises:
+            HTTPException: If there are too many redirects, if the request times out, if the host is
+                throttled for too long, if the circuit is open and nothing is stored for the URL, or if
+                the server returns a client or server error status code.
+        """
+        cached, token = self.shared_content(url)
+        if cached is not None:
+            response = Response()
+            response.status_code, response.url, response._content = 200, url, cached.content
+            response.headers[FETCHED_AT] = repr(cached.fetched_at)
+            return response
+        try:
+            response = self.download(url)
+            if response.status_code == 200:
+                self.share_content(url, response.content)
+        finally:
+            remote_cache.unlock(f"page:{url}", token)
         return response
 
+    def download(self, url: str) -> Response:
+        """
+        Download the specified URL with the service's session, through the URL's circuit breaker.
+
+        While the breaker is open the request is not sent: the last stored body of the URL is served as a
+        not modified response instead, if there is one.
+
+        Args:
+            url (str): The URL to make the request to.
+
+        Returns:
+            Response: An HTTP Response object containing the server's response to the request.
+
+        Raises:
+            HTTPException: If there are too many redirects, if the request times out, if the host is
+                throttled for too long, if the circuit is open and nothing is stored for the URL, or if
+                the server returns a client or server error status code.
+        """
+        breaker = circuit_breakers.get(url)
+        if not breaker.allow():
+            response = Response()
+            response.status_code, response.url, response._content = 304, url, self.stale_content(url)
+            return response
+        with breaker.track():
+            response = self.get_with_retries(url)
+            self.raise_for_status(url, response.status_code, response.reason)
+        if response.status_code == 304:
+            stored = validator_store.not_modified(url)
+            if stored is None or stored.partial:
+                return self.download(url)
+            response._content = stored.content
+            page_cache.set(url, stored.content)
+            return response
+        validator_store.store(url, response.headers, response.content)
+        return response
+
+    def get_with_retries(self, url: str, stream: bool = False) -> Response:
+        """
+        Send a GET request with the service's session, pacing it and retrying it as needed.
+
+        Requests wait for a slot from the per-host adaptive rate limiter, and attempts that fail to connect,
+        time out or get a 429/5xx response are retried with jittered exponential backoff.
+
+        Args:
+            url (str): The URL to make the request to.
+            stream (bool, optional): If True, the body of the response is left unread.
+
+        Returns:
+            Response: The response to the last attempt.
+
+        Raises:
+            HTTPException: If there are too many redirects, if the request times out, or if the host is
+                throttled for too long.
+        """
+        for attempt in count():
+            delay = rate_limiter.acquire(url)
+            if delay is None:
+                raise HTTPException(status_code=503, detail=f"Rate limited for url: {url}")
+            time.sleep(delay)
+            try:
+                response: Response = self.session.get(
+                    url=url,
+                    headers=validator_store.conditional_headers(url, partial=stream),
+                    timeout=get_timeout(),
+                    stream=stream,
+                )
+            except TooManyRedirects:
+                raise HTTPException(status_code=404, detail=f"Not found for url: {url}")
+            except (Timeout, RequestsConnectionError) as e:
+                delay = rate_limiter.record(url, attempt, status_code=None)
+                if delay is None:
+                    if isinstance(e, Timeout):
+                        raise HTTPException(status_code=504, detail=f"Timeout for url: {url}")
+                    raise HTTPException(status_code=500, detail=f"Connection error for url: {url}")
+                time.sleep(delay)
+                continue
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Error for url: {url}. {e}")
+            delay = rate_limiter.record(url, attempt, response.status_code, response.headers.get("Retry-After"))
+            if delay is None:
+                return response
+            # Hand the connection back to the pool, as an unread streamed body would hold it until collected
+            response.close()
+            time.sleep(delay)
+
     def request_url_bsoup(self) -> BeautifulSoup:
         """
         Fetch the web page content and parse it using BeautifulSoup.
@@ -101,9 +619,99 @@ class TransfermarktBase:
         """
         return etree.HTML(str(bsoup))
 
+    @classmethod
+    def services(cls) -> list[type]:
+        """
+        Return the services derived from the class, those of the modules imported so far.
+
+        Returns:
+            list[type]: The service classes.
+        """
+        return [service for subclass in cls.__subclasses__() for service in (subclass, *subclass.services())]
+
+    @classmethod
+    def get_parser(cls) -> type:
+        """
+        Return the parser backend of the service, as declared by `PARSER` or overridden by the settings.
+
+        Returns:
+            type: The parser backend, see `app.utils.parsers`.
+        """
+        return get_parser(cls.__name__, cls.PARSER)
+
+    @classmethod
+    def get_cache_ttl(cls) -> float:
+        """
+        Return how long results of the service stay cached, as declared by `CACHE_TTL` or overridden by the settings.
+
+        Returns:
+            float: The TTL in seconds, zero or less to not cache the results.
+        """
+        return settings.CACHE_TTLS.get(cls.__name__, cls.CACHE_TTL)
+
+    @classmethod
+    def get_cache_grace(cls) -> float:
+        """
+        Return how long expired results of the service are served while refreshed, as declared by `CACHE_GRACE` or
+        overridden by the settings.
+
+        Returns:
+            float: The grace window in seconds, zero or less to not serve expired results.
+        """
+        return settings.CACHE_GRACES.get(cls.__name__, cls.CACHE_GRACE)
+
+    @classmethod
+    def invalid_id(cls, **kwargs) -> Optional[str]:
+        """
+        Name the id an `UpstreamNotFoundError` of the service's main page proves invalid, as shared by every service
+        reading it.
+
+        Args:
+            **kwargs: The arguments the service is instantiated with.
+
+        Returns:
+            Optional[str]: The argument and the id, e.g. `player_id:0`, or None if the service has no `ENTITY_ID`.
+        """
+        if cls.ENTITY_ID is None or kwargs.get(cls.ENTITY_ID) is None:
+            return None
+        return f"{cls.ENTITY_ID}:{kwargs[cls.ENTITY_ID]}"
+
+    @classmethod
+    def page_variant(cls) -> str:
+        """
+        Name the form of the parsed page the service works on, its parser backend and the regions it keeps.
+
+        Parsed pages are only shared, in flight and for revalidation, between services working on the same form.
+
+        Returns:
+            str: The parser backend name followed by the regions, e.g. `lxml //main`.
+        """
+        return " ".join((cls.get_parser().NAME, *cls.REGIONS))
+
+    def parse_page(self, content: bytes, charset: Optional[str] = None) -> ElementTree:
+        """
+        Parse the web page content straight from bytes with the service's parser backend.
+
+        With lxml, scripts, styles and inline SVGs are emptied as they are parsed, and the page body is pruned to
+        the service's REGIONS once parsed.
+
+        Args:
+            content (bytes): The web page content.
+            charset (str, optional): The encoding of the content. If None, the parser detects it from the page.
+
+        Returns:
+            ElementTree: An ElementTree representing the parsed web page content, None if it is empty. A
+                LexborElement with the lexbor backend, which is not pruned.
+        """
+        page = self.get_parser().parse(content, charset)
+        return prune_page(page, self.REGIONS) if isinstance(page, etree._Element) else page
+
     def request_url_page(self) -> ElementTree:
         """
-        Fetch the web page content, parse it using BeautifulSoup, and convert it to an ElementTree.
+        Fetch the web page content and parse it into an ElementTree.
+
+        Concurrent calls for the same URL and page variant (see `page_variant`) share a single fetch and parse,
+        and get the same tree, which must therefore be treated as read-only.
 
         Returns:
             ElementTree: An ElementTree representing the parsed web page content for further
@@ -113,8 +721,141 @@ class TransfermarktBase:
             HTTPException: If there are too many redirects, or if the server returns a client or
                 server error status code.
         """
-        bsoup: BeautifulSoup = self.request_url_bsoup()
-        return self.convert_bsoup_to_page(bsoup=bsoup)
+        page, fetched_at = single_flight.do(("page", self.URL, self.page_variant()), self.load_page)
+        self.note_fetched_at(fetched_at)
+        return page
+
+    def load_page(self) -> tuple[ElementTree, Optional[float]]:
+        """
+        Fetch and parse the web page, reusing the already parsed page when upstream reports it unchanged.
+
+        Returns:
+            tuple[ElementTree, Optional[float]]: An ElementTree representing the parsed web page content, and when
+                the page was fetched if it was read from the page caches, see `cached_fetched_at`.
+
+        Raises:
+            HTTPException: If there are too many redirects, or if the server returns a client or
+                server error status code.
+        """
+        variant = self.page_variant()
+        if self.STREAM_UNTIL and self.get_parser().STREAMING and self.URL not in self.prefetched:
+            return self.stream_page()
+        response = self.make_request()
+        if response.status_code == 304:
+            stored = validator_store.get(self.URL)
+            if stored is not None and not stored.partial and variant in stored.pages:
+                return stored.pages[variant], None
+        page = self.parse_page(response.content, charset=get_charset(response.headers.get("Content-Type")))
+        validator_store.set_page(self.URL, response.content, page, variant)
+        return page, self.cached_fetched_at(response)
+
+    def stream_page(self) -> tuple[ElementTree, Optional[float]]:
+        """
+        Fetch the web page and parse it while it downloads, stopping once the STREAM_UNTIL elements are parsed.
+
+        The part of the body read so far is stored for revalidation together with the page parsed from it, marked
+        partial: other callers neither revalidate it nor serve it as the page. Stopping early closes the connection
+        rather than returning it to the pool, which is cheaper than downloading the rest of a large page. A whole
+        body in the page caches is parsed instead, but a partial one is never written to them.
+
+        Returns:
+            tuple[ElementTree, Optional[float]]: An ElementTree representing the parsed web page content, and when
+                the page was fetched if it was read from the page caches.
+
+        Raises:
+            HTTPException: If there are too many redirects, if the request times out, if the host is
+                throttled for too long, if the circuit is open and nothing is stored for the URL, or if
+                the server returns a client or server error status code.
+        """
+        cached, _ = self.shared_content(self.URL, lock=False)
+        if cached is not None:
+            return self.parse_page(cached.content), cached.fetched_at
+        breaker = circuit_breakers.get(self.URL)
+        if not breaker.allow():
+            return self.parse_stream([self.stale_content(self.URL, partial=True)], charset=None)[1], None
+        with breaker.track():
+            with self.get_with_retries(self.URL, stream=True) as response:
+                self.raise_for_status(self.URL, response.status_code, response.reason)
+                if response.status_code != 304:
+                    try:
+                        content, page = self.parse_stream(
+                            response.iter_content(chunk_size=settings.HTTP_STREAM_CHUNK_SIZE),
+                            charset=get_charset(response.headers.get("Content-Type")),
+                        )
+                    except RequestException as e:
+                        raise HTTPException(status_code=500, detail=f"Error for url: {self.URL}. {e}")
+        if response.status_code == 304:
+            stored = validator_store.not_modified(self.URL)
+            if stored is None:
+                return self.stream_page()
+            page = stored.pages.get(self.page_variant())
+            return page if page is not None else self.parse_stream([stored.content], charset=None)[1], None
+        validator_store.store(self.URL, response.headers, content, partial=True)
+        validator_store.set_page(self.URL, content, page, self.page_variant())
+        return page, None
+
+    def parse_stream(self, chunks: Iterable[bytes], charset: Optional[str]) -> tuple[bytes, ElementTree]:
+        """
+        Parse HTML chunk by chunk, stopping at the first chunk after which every STREAM_UNTIL element was parsed.
+
+        It goes through the same lxml parsing as `parse_page`, see `LxmlParser.parse_chunks`, and the page is pruned
+        to the service's REGIONS once parsed, so a streamed page is the same tree as a downloaded one.
+
+        Args:
+            chunks (Iterable[bytes]): The chunks of the HTML document.
+            charset (str, optional): The encoding of the document. If None, the parser detects it.
+
+        Returns:
+            tuple[bytes, ElementTree]: The bytes consumed and the page parsed from them, None if they were
+                empty.
+        """
+        consumed, page = LxmlParser.parse_chunks(chunks, charset, until=self.STREAM_UNTIL)
+        return b"".join(consumed), prune_page(page, self.REGIONS)
+
+    def get_section(self, xpath: str) -> ElementTree:
+        """
+        Locate a section of the web page, so the selectors relative to it only walk its subtree.
+
+        Args:
+            xpath (str): The XPath expression of the section root.
+
+        Returns:
+            ElementTree: The first element matching the XPath. If there is none, an empty element, so the
+                selectors relative to the section find nothing instead of data from elsewhere on the page.
+        """
+        sections = self.evaluate_xpath(xpath)
+        return sections[0] if sections else etree.Element("section")
+
+    def get_labels(self, tags: tuple[str, ...], xpath: Optional[str] = None) -> LabelIndex:
+        """
+        Index the labels of a section of the web page in a single walk, to extract many label-based fields from it.
+
+        Args:
+            tags (tuple[str, ...]): The tags of the label and value elements, e.g. ("th", "td").
+            xpath (str, optional): The XPath expression of the section root, see `get_section`. Default is the
+                whole page.
+
+        Returns:
+            LabelIndex: The index, to pass as the section of `get_text_by_xpath` and `get_list_by_xpath`.
+        """
+        return LabelIndex(self.page if xpath is None else self.get_section(xpath), tags)
+
+    def evaluate_xpath(self, xpath: str, section: Union[ElementTree, LabelIndex, Extraction, None] = None) -> list:
+        """
+        Evaluate an XPath expression against the web page or one of its sections.
+
+        Args:
+            xpath (str): The XPath expression to query elements on the page.
+            section (ElementTree | LabelIndex | Extraction, optional): The section to evaluate the XPath against,
+                as returned by `get_section`, `get_labels` or an `ExtractionPlan`. Default is the whole page.
+
+        Returns:
+            list: The matching elements, strings or attribute values.
+        """
+        section = self.page if section is None else section
+        if isinstance(section, (LabelIndex, Extraction, LexborElement)):
+            return section.evaluate(xpath)
+        return evaluate(section, xpath)
 
     def raise_exception_if_not_found(self, xpath: str):
         """
@@ -124,12 +865,18 @@ class TransfermarktBase:
             xpath (str): The XPath expression to query elements on the page.
 
         Raises:
-            HTTPException: If the specified XPath query does not yield any results, indicating an invalid request.
+            InvalidRequestError: If the specified XPath query does not yield any results, indicating an invalid
+                request.
         """
         if not self.get_text_by_xpath(xpath):
-            raise HTTPException(status_code=404, detail=f"Invalid request (url: {self.URL})")
+            raise InvalidRequestError(status_code=404, detail=f"Invalid request (url: {self.URL})")
 
-    def get_list_by_xpath(self, xpath: str, remove_empty: Optional[bool] = True) -> Optional[list]:
+    def get_list_by_xpath(
+        self,
+        xpath: str,
+        remove_empty: Optional[bool] = True,
+        section: Union[ElementTree, LabelIndex, Extraction, None] = None,
+    ) -> Optional[list]:
         """
         Extract a list of elements from the web page using the specified XPath expression.
 
@@ -137,17 +884,16 @@ class TransfermarktBase:
             xpath (str): The XPath expression to query elements on the page.
             remove_empty (bool, optional): If True, remove empty or whitespace-only elements from
                 the list. Default is True.
+            section (ElementTree | LabelIndex | Extraction, optional): The section of the page to evaluate the
+                XPath against, as returned by `get_section`, `get_labels` or an `ExtractionPlan`. Default is the
+                whole page.
 
         Returns:
             Optional[list]: A list of elements extracted from the web page based on the XPath query.
                 If remove_empty is True, empty or whitespace-only elements are filtered out.
         """
-        elements: list = self.page.xpath(xpath)
-        if remove_empty:
-            elements_valid: list = [trim(e) for e in elements if trim(e)]
-        else:
-            elements_valid: list = [trim(e) for e in elements]
-        return elements_valid or []
+        elements: list = self.evaluate_xpath(xpath, section)
+        return trim_list(elements, remove_empty) or []
 
     def get_text_by_xpath(
         self,
@@ -157,6 +903,7 @@ class TransfermarktBase:
         iloc_from: Optional[int] = None,
         iloc_to: Optional[int] = None,
         join_str: Optional[str] = None,
+        section: Union[ElementTree, LabelIndex, Extraction, None] = None,
     ) -> Optional[str]:
         """
         Extract text content from the web page using the specified XPath expression.
@@ -172,18 +919,21 @@ class TransfermarktBase:
                 index (exclusive).
             join_str (str, optional): If provided, join multiple text elements into a single string
                 using this separator.
+            section (ElementTree | LabelIndex | Extraction, optional): The section of the page to evaluate the
+                XPath against, as returned by `get_section`, `get_labels` or an `ExtractionPlan`. Default is the
+                whole page.
 
         Returns:
             Optional[str]: The extracted text content from the web page based on the XPath query and
                 optional parameters. If no matching element is found, None is returned.
         """
-        element = self.page.xpath(xpath)
+        element = self.evaluate_xpath(xpath, section)
 
         if not element:
             return None
 
         if isinstance(element, list):
-            element = [trim(e) for e in element if trim(e)]
+            element = trim_list(element)
 
         if isinstance(iloc, int):
             element = element[iloc]
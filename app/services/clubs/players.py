@@ -1,9 +1,12 @@
 from dataclasses import dataclass
+from typing import Optional
+
+from lxml import etree
 
 from app.services.base import TransfermarktBase
 from app.utils.regex import REGEX_DOB
-from app.utils.utils import extract_from_url, safe_regex
-from app.utils.xpath import Clubs
+from app.utils.utils import extract_from_url, safe_regex, trim
+from app.utils.xpath import Clubs, Regions, evaluate
 
 
 @dataclass
@@ -15,17 +18,26 @@ class TransfermarktClubPlayers(TransfermarktBase):
         club_id (str): The unique identifier of the football club.
         season_id (str): The unique identifier of the season.
         URL (str): The URL template for the club's players page on Transfermarkt.
+        REGIONS (tuple[str, ...]): The page regions holding the club name, the club URL with the current season and
+            the squad table.
+        CACHE_TTL (float): Squads are cached for six hours, they change with transfers and injuries.
+        CACHE_GRACE (float): Expired squads are served for up to six hours more while they are refreshed.
     """
 
     club_id: str = None
     season_id: str = None
     URL: str = "https://www.transfermarkt.com/-/kader/verein/{club_id}/saison_id/{season_id}/plus/1"
+    REGIONS = (Regions.HEADER, Regions.SUBNAVIGATION_MENU, Regions.MAIN)
+    CACHE_TTL = 21600.0
+    CACHE_GRACE = 21600.0
+    STREAM_UNTIL = ("yw1",)
 
     def __post_init__(self) -> None:
         """Initialize the TransfermarktClubPlayers class."""
         self.URL = self.URL.format(club_id=self.club_id, season_id=self.season_id)
         self.page = self.request_url_page()
         self.raise_exception_if_not_found(xpath=Clubs.Players.CLUB_NAME)
+        self.squad = self.get_section(Clubs.Players.GRID)
         self.__update_season_id()
         self.__update_past_flag()
 
@@ -36,88 +48,65 @@ class TransfermarktClubPlayers(TransfermarktBase):
 
     def __update_past_flag(self) -> None:
         """Check if the season is the current or if it's a past one and update the flag accordingly."""
-        self.past = "Current club" in self.get_list_by_xpath(Clubs.Players.PAST_FLAG)
+        self.past = "Current club" in self.get_list_by_xpath(Clubs.Players.PAST_FLAG, section=self.squad)
+
+    @staticmethod
+    def __get_cell_text(cell: etree.ElementBase) -> Optional[str]:
+        """
+        Extract the first non-empty text of a cell of the squad table.
+
+        Args:
+            cell (etree.ElementBase): The table cell.
+
+        Returns:
+            Optional[str]: The trimmed text, or None if the cell has no text.
+        """
+        return next((text for text in map(trim, cell.itertext()) if text), None)
 
     def __parse_club_players(self) -> list[dict]:
         """
         Parse player information from the webpage and return a list of dictionaries, each representing a player.
 
+        The squad table is walked once, row by row: the cells of each row are named after the columns of the
+        present or past season layout and every field is read from its own cell, so a player with an empty cell
+        cannot shift the data of the players below.
+
         Returns:
             list[dict]: A list of player information dictionaries.
         """
-        page_nationalities = self.page.xpath(Clubs.Players.PAGE_NATIONALITIES)
-        page_players_infos = self.page.xpath(Clubs.Players.PAGE_INFOS)
-        page_players_signed_from = self.page.xpath(
-            Clubs.Players.Past.PAGE_SIGNED_FROM if self.past else Clubs.Players.Present.PAGE_SIGNED_FROM,
-        )
-        page_players_joined_on = self.page.xpath(
-            Clubs.Players.Past.PAGE_JOINED_ON if self.past else Clubs.Players.Present.PAGE_JOINED_ON,
-        )
-        players_ids = [extract_from_url(url) for url in self.get_list_by_xpath(Clubs.Players.URLS)]
-        players_names = self.get_list_by_xpath(Clubs.Players.NAMES)
-        players_positions = self.get_list_by_xpath(Clubs.Players.POSITIONS)
-        players_dobs = [
-            safe_regex(dob_age, REGEX_DOB, "dob") for dob_age in self.get_list_by_xpath(Clubs.Players.DOB_AGE)
-        ]
-        players_ages = [
-            safe_regex(dob_age, REGEX_DOB, "age") for dob_age in self.get_list_by_xpath(Clubs.Players.DOB_AGE)
-        ]
-        players_nationalities = [nationality.xpath(Clubs.Players.NATIONALITIES) for nationality in page_nationalities]
-        players_current_club = (
-            self.get_list_by_xpath(Clubs.Players.Past.CURRENT_CLUB) if self.past else [None] * len(players_ids)
-        )
-        players_heights = self.get_list_by_xpath(
-            Clubs.Players.Past.HEIGHTS if self.past else Clubs.Players.Present.HEIGHTS,
-        )
-        players_foots = self.get_list_by_xpath(
-            Clubs.Players.Past.FOOTS if self.past else Clubs.Players.Present.FOOTS,
-            remove_empty=False,
-        )
-        players_joined_on = ["; ".join(e.xpath(Clubs.Players.JOINED_ON)) for e in page_players_joined_on]
-        players_joined = ["; ".join(e.xpath(Clubs.Players.JOINED)) for e in page_players_infos]
-        players_signed_from = ["; ".join(e.xpath(Clubs.Players.SIGNED_FROM)) for e in page_players_signed_from]
-        players_contracts = (
-            [None] * len(players_ids) if self.past else self.get_list_by_xpath(Clubs.Players.Present.CONTRACTS)
-        )
-        players_marketvalues = self.get_list_by_xpath(Clubs.Players.MARKET_VALUES)
-        players_statuses = ["; ".join(e.xpath(Clubs.Players.STATUSES)) for e in page_players_infos if e is not None]
-
-        return [
-            {
-                "id": idx,
-                "name": name,
-                "position": position,
-                "dateOfBirth": dob,
-                "age": age,
-                "nationality": nationality,
-                "currentClub": current_club,
-                "height": height,
-                "foot": foot,
-                "joinedOn": joined_on,
-                "joined": joined,
-                "signedFrom": signed_from,
-                "contract": contract,
-                "marketValue": market_value,
-                "status": status,
-            }
-            for idx, name, position, dob, age, nationality, current_club, height, foot, joined_on, joined, signed_from, contract, market_value, status, in zip(  # noqa: E501
-                players_ids,
-                players_names,
-                players_positions,
-                players_dobs,
-                players_ages,
-                players_nationalities,
-                players_current_club,
-                players_heights,
-                players_foots,
-                players_joined_on,
-                players_joined,
-                players_signed_from,
-                players_contracts,
-                players_marketvalues,
-                players_statuses,
+        columns = Clubs.Players.Past.COLUMNS if self.past else Clubs.Players.Present.COLUMNS
+        players = []
+        for row in evaluate(self.squad, Clubs.Players.ROWS):
+            cells = row.findall("td")
+            cells = dict(zip(columns, cells + [etree.Element("td") for _ in range(len(columns) - len(cells))]))
+            url = self.get_text_by_xpath(Clubs.Players.URL, section=cells["player"])
+            if url is None:
+                continue
+            dob_age = self.__get_cell_text(cells["dob_age"])
+            players.append(
+                {
+                    "id": extract_from_url(url),
+                    "name": self.get_text_by_xpath(Clubs.Players.NAME, section=cells["player"]),
+                    "position": self.get_text_by_xpath(Clubs.Players.POSITION, section=cells["player"]),
+                    "dateOfBirth": safe_regex(dob_age, REGEX_DOB, "dob"),
+                    "age": safe_regex(dob_age, REGEX_DOB, "age"),
+                    "nationality": evaluate(cells["nationality"], Clubs.Players.NATIONALITIES),
+                    "currentClub": (
+                        self.get_text_by_xpath(Clubs.Players.CURRENT_CLUB, section=cells["current_club"])
+                        if self.past
+                        else None
+                    ),
+                    "height": self.__get_cell_text(cells["height"]),
+                    "foot": next(map(trim, cells["foot"].itertext()), None),
+                    "joinedOn": "; ".join(cells["joined_on"].itertext()),
+                    "joined": "; ".join(evaluate(cells["player"], Clubs.Players.JOINED)),
+                    "signedFrom": "; ".join(evaluate(cells["signed_from"], Clubs.Players.SIGNED_FROM)),
+                    "contract": None if self.past else self.__get_cell_text(cells["contract"]),
+                    "marketValue": self.__get_cell_text(cells["market_value"]),
+                    "status": "; ".join(evaluate(cells["player"], Clubs.Players.STATUSES)),
+                },
             )
-        ]
+        return players
 
     def get_club_players(self) -> dict:
         """
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from app.services.base import TransfermarktBase
 from app.utils.regex import REGEX_BG_COLOR, REGEX_COUNTRY_ID, REGEX_MEMBERS_DATE
 from app.utils.utils import extract_from_url, remove_str, safe_regex, safe_split
-from app.utils.xpath import Clubs
+from app.utils.xpath import Clubs, Regions
 
 
 @dataclass
@@ -14,10 +14,18 @@ class TransfermarktClubProfile(TransfermarktBase):
     Args:
         club_id (str): The unique identifier of the football club.
         URL (str): The URL template for the club's profile page on Transfermarkt.
+        REGIONS (tuple[str, ...]): The page regions holding the club header and its facts.
+        CACHE_TTL (float): Club profiles are cached for six hours.
+        CACHE_GRACE (float): Expired club profiles are served for up to six hours more while they are refreshed.
+        ENTITY_ID (str): The page is not found only for an invalid club id.
     """
 
     club_id: str = None
     URL: str = "https://www.transfermarkt.us/-/datenfakten/verein/{club_id}"
+    REGIONS = (Regions.HEADER, Regions.MAIN)
+    CACHE_TTL = 21600.0
+    CACHE_GRACE = 21600.0
+    ENTITY_ID = "club_id"
 
     def __post_init__(self) -> None:
         """Initialize the TransfermarktClubProfile class."""
@@ -35,53 +43,69 @@ class TransfermarktClubProfile(TransfermarktBase):
         Returns:
             dict: A dictionary containing the club's profile information.
         """
+        header = self.get_labels(("li",), Clubs.Profile.HEADER)
+        facts = self.get_labels(("th", "td"))
         self.response["id"] = self.club_id
         self.response["url"] = self.get_text_by_xpath(Clubs.Profile.URL)
-        self.response["name"] = self.get_text_by_xpath(Clubs.Profile.NAME)
-        self.response["officialName"] = self.get_text_by_xpath(Clubs.Profile.NAME_OFFICIAL)
+        self.response["name"] = self.get_text_by_xpath(Clubs.Profile.NAME, section=header)
+        self.response["officialName"] = self.get_text_by_xpath(Clubs.Profile.NAME_OFFICIAL, section=facts)
         self.response["image"] = safe_split(self.get_text_by_xpath(Clubs.Profile.IMAGE), "?")[0]
-        self.response["legalForm"] = self.get_text_by_xpath(Clubs.Profile.LEGAL_FORM)
-        self.response["addressLine1"] = self.get_text_by_xpath(Clubs.Profile.ADDRESS_LINE_1)
-        self.response["addressLine2"] = self.get_text_by_xpath(Clubs.Profile.ADDRESS_LINE_2)
-        self.response["addressLine3"] = self.get_text_by_xpath(Clubs.Profile.ADDRESS_LINE_3)
-        self.response["tel"] = self.get_text_by_xpath(Clubs.Profile.TEL)
-        self.response["fax"] = self.get_text_by_xpath(Clubs.Profile.FAX)
-        self.response["website"] = self.get_text_by_xpath(Clubs.Profile.WEBSITE)
-        self.response["foundedOn"] = self.get_text_by_xpath(Clubs.Profile.FOUNDED_ON)
-        self.response["members"] = self.get_text_by_xpath(Clubs.Profile.MEMBERS)
+        self.response["legalForm"] = self.get_text_by_xpath(Clubs.Profile.LEGAL_FORM, section=facts)
+        self.response["addressLine1"] = self.get_text_by_xpath(Clubs.Profile.ADDRESS_LINE_1, section=facts)
+        self.response["addressLine2"] = self.get_text_by_xpath(Clubs.Profile.ADDRESS_LINE_2, section=facts)
+        self.response["addressLine3"] = self.get_text_by_xpath(Clubs.Profile.ADDRESS_LINE_3, section=facts)
+        self.response["tel"] = self.get_text_by_xpath(Clubs.Profile.TEL, section=facts)
+        self.response["fax"] = self.get_text_by_xpath(Clubs.Profile.FAX, section=facts)
+        self.response["website"] = self.get_text_by_xpath(Clubs.Profile.WEBSITE, section=facts)
+        self.response["foundedOn"] = self.get_text_by_xpath(Clubs.Profile.FOUNDED_ON, section=facts)
+        self.response["members"] = self.get_text_by_xpath(Clubs.Profile.MEMBERS, section=facts)
         self.response["membersDate"] = safe_regex(
-            self.get_text_by_xpath(Clubs.Profile.MEMBERS_DATE),
+            self.get_text_by_xpath(Clubs.Profile.MEMBERS_DATE, section=facts),
             REGEX_MEMBERS_DATE,
             "date",
         )
-        self.response["otherSports"] = safe_split(self.get_text_by_xpath(Clubs.Profile.OTHER_SPORTS), ",")
+        self.response["otherSports"] = safe_split(
+            self.get_text_by_xpath(Clubs.Profile.OTHER_SPORTS, section=facts),
+            ",",
+        )
         self.response["colors"] = [
             safe_regex(color, REGEX_BG_COLOR, "color")
             for color in self.get_list_by_xpath(Clubs.Profile.COLORS)
             if "#" in color
         ]
-        self.response["stadiumName"] = self.get_text_by_xpath(Clubs.Profile.STADIUM_NAME)
-        self.response["stadiumSeats"] = remove_str(self.get_text_by_xpath(Clubs.Profile.STADIUM_SEATS), ["Seats", "."])
-        self.response["currentTransferRecord"] = self.get_text_by_xpath(Clubs.Profile.TRANSFER_RECORD)
+        self.response["stadiumName"] = self.get_text_by_xpath(Clubs.Profile.STADIUM_NAME, section=header)
+        self.response["stadiumSeats"] = remove_str(
+            self.get_text_by_xpath(Clubs.Profile.STADIUM_SEATS, section=header),
+            ["Seats", "."],
+        )
+        self.response["currentTransferRecord"] = self.get_text_by_xpath(Clubs.Profile.TRANSFER_RECORD, section=header)
         self.response["currentMarketValue"] = self.get_text_by_xpath(
             Clubs.Profile.MARKET_VALUE,
             iloc_to=3,
             join_str="",
+            section=header,
+        )
+        self.response["confederation"] = self.get_text_by_xpath(Clubs.Profile.CONFEDERATION, section=header)
+        self.response["fifaWorldRanking"] = remove_str(
+            self.get_text_by_xpath(Clubs.Profile.RANKING, section=header),
+            "Pos",
         )
-        self.response["confederation"] = self.get_text_by_xpath(Clubs.Profile.CONFEDERATION)
-        self.response["fifaWorldRanking"] = remove_str(self.get_text_by_xpath(Clubs.Profile.RANKING), "Pos")
         self.response["squad"] = {
-            "size": self.get_text_by_xpath(Clubs.Profile.SQUAD_SIZE),
-            "averageAge": self.get_text_by_xpath(Clubs.Profile.SQUAD_AVG_AGE),
-            "foreigners": self.get_text_by_xpath(Clubs.Profile.SQUAD_FOREIGNERS),
-            "nationalTeamPlayers": self.get_text_by_xpath(Clubs.Profile.SQUAD_NATIONAL_PLAYERS),
+            "size": self.get_text_by_xpath(Clubs.Profile.SQUAD_SIZE, section=header),
+            "averageAge": self.get_text_by_xpath(Clubs.Profile.SQUAD_AVG_AGE, section=header),
+            "foreigners": self.get_text_by_xpath(Clubs.Profile.SQUAD_FOREIGNERS, section=header),
+            "nationalTeamPlayers": self.get_text_by_xpath(Clubs.Profile.SQUAD_NATIONAL_PLAYERS, section=header),
         }
         self.response["league"] = {
-            "id": extract_from_url(self.get_text_by_xpath(Clubs.Profile.LEAGUE_ID)),
-            "name": self.get_text_by_xpath(Clubs.Profile.LEAGUE_NAME),
-            "countryId": safe_regex(self.get_text_by_xpath(Clubs.Profile.LEAGUE_COUNTRY_ID), REGEX_COUNTRY_ID, "id"),
-            "countryName": self.get_text_by_xpath(Clubs.Profile.LEAGUE_COUNTRY_NAME),
-            "tier": self.get_text_by_xpath(Clubs.Profile.LEAGUE_TIER),
+            "id": extract_from_url(self.get_text_by_xpath(Clubs.Profile.LEAGUE_ID, section=header)),
+            "name": self.get_text_by_xpath(Clubs.Profile.LEAGUE_NAME, section=header),
+            "countryId": safe_regex(
+                self.get_text_by_xpath(Clubs.Profile.LEAGUE_COUNTRY_ID, section=header),
+                REGEX_COUNTRY_ID,
+                "id",
+            ),
+            "countryName": self.get_text_by_xpath(Clubs.Profile.LEAGUE_COUNTRY_NAME, section=header),
+            "tier": self.get_text_by_xpath(Clubs.Profile.LEAGUE_TIER, section=header),
         }
         self.response["historicalCrests"] = [
             safe_split(crest, "?")[0] for crest in self.get_list_by_xpath(Clubs.Profile.CRESTS_HISTORICAL)
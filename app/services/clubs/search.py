@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 
 from app.services.base import TransfermarktBase
-from app.utils.utils import extract_from_url
-from app.utils.xpath import Clubs
+from app.utils.extraction import ExtractionPlan
+from app.utils.utils import extract_from_urls
+from app.utils.xpath import Clubs, Regions
 
 
 @dataclass
@@ -13,14 +14,30 @@ class TransfermarktClubSearch(TransfermarktBase):
     Args:
         query (str): The search query for finding football clubs.
         URL (str): The URL template for the search query.
+        REGIONS (tuple[str, ...]): The page region holding the search result boxes.
+        CACHE_TTL (float): Search results are cached for ten minutes.
+        CACHE_GRACE (float): Expired search results are served for up to half an hour more while they are refreshed.
         page_number (int): The page number of search results (default is 1).
+        PLAN (ExtractionPlan): The columns extracted from the search results.
     """
 
     query: str = None
     URL: str = (
         "https://www.transfermarkt.com/schnellsuche/ergebnis/schnellsuche?query={query}&Verein_page={page_number}"
     )
+    REGIONS = (Regions.MAIN,)
+    CACHE_TTL = 600.0
+    CACHE_GRACE = 1800.0
     page_number: int = 1
+    PLAN = ExtractionPlan(
+        fields=(
+            Clubs.Search.NAMES,
+            Clubs.Search.URLS,
+            Clubs.Search.COUNTRIES,
+            Clubs.Search.SQUADS,
+            Clubs.Search.MARKET_VALUES,
+        ),
+    )
 
     def __post_init__(self) -> None:
         """Initialize the TransfermarktClubSearch class."""
@@ -36,12 +53,13 @@ class TransfermarktClubSearch(TransfermarktBase):
                 football club found in the search results, including the club's unique identifier,
                 URL, name, country, squad size, and market value.
         """
-        clubs_names = self.get_list_by_xpath(Clubs.Search.NAMES)
-        clubs_urls = self.get_list_by_xpath(Clubs.Search.URLS)
-        clubs_countries = self.get_list_by_xpath(Clubs.Search.COUNTRIES)
-        clubs_squads = self.get_list_by_xpath(Clubs.Search.SQUADS)
-        clubs_market_values = self.get_list_by_xpath(Clubs.Search.MARKET_VALUES)
-        clubs_ids = [extract_from_url(url) for url in clubs_urls]
+        results = self.PLAN.extract(self.get_section(Clubs.Search.BASE))[0]
+        clubs_names = self.get_list_by_xpath(Clubs.Search.NAMES, section=results)
+        clubs_urls = self.get_list_by_xpath(Clubs.Search.URLS, section=results)
+        clubs_countries = self.get_list_by_xpath(Clubs.Search.COUNTRIES, section=results)
+        clubs_squads = self.get_list_by_xpath(Clubs.Search.SQUADS, section=results)
+        clubs_market_values = self.get_list_by_xpath(Clubs.Search.MARKET_VALUES, section=results)
+        clubs_ids = extract_from_urls(clubs_urls)
 
         return [
             {
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
 
 from app.services.base import TransfermarktBase
-from app.utils.utils import extract_from_url
-from app.utils.xpath import Competitions
+from app.utils.utils import extract_from_url, extract_from_urls
+from app.utils.xpath import Competitions, Regions
 
 
 @dataclass
@@ -14,11 +14,17 @@ class TransfermarktCompetitionClubs(TransfermarktBase):
         competition_id (str): The unique identifier of the competition.
         season_id (str): The season identifier. If not provided, it will be extracted from the URL.
         URL (str): The URL template for the competition's page on Transfermarkt.
+        REGIONS (tuple[str, ...]): The page regions holding the competition name, its season tab and its clubs.
+        CACHE_TTL (float): Competition clubs are cached for six hours.
+        CACHE_GRACE (float): Expired competition clubs are served for up to six hours more while they are refreshed.
     """
 
     competition_id: str = None
     season_id: str = None
     URL: str = "https://www.transfermarkt.com/-/startseite/wettbewerb/{competition_id}/plus/?saison_id={season_id}"
+    REGIONS = (Regions.HEADER, Regions.TABS, Regions.MAIN)
+    CACHE_TTL = 21600.0
+    CACHE_GRACE = 21600.0
 
     def __post_init__(self) -> None:
         """Initialize the TransfermarktCompetitionClubs class."""
@@ -35,9 +41,10 @@ class TransfermarktCompetitionClubs(TransfermarktBase):
             list: A list of dictionaries, where each dictionary contains information about a
                 football club in the competition, including the club's unique identifier and name.
         """
-        urls = self.get_list_by_xpath(Competitions.Clubs.URLS)
-        names = self.get_list_by_xpath(Competitions.Clubs.NAMES)
-        ids = [extract_from_url(url) for url in urls]
+        clubs = self.get_section(Competitions.Clubs.GRID)
+        urls = self.get_list_by_xpath(Competitions.Clubs.URLS, section=clubs)
+        names = self.get_list_by_xpath(Competitions.Clubs.NAMES, section=clubs)
+        ids = extract_from_urls(urls)
 
         return [{"id": idx, "name": name} for idx, name in zip(ids, names)]
 
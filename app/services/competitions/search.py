@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 
 from app.services.base import TransfermarktBase
-from app.utils.utils import extract_from_url
-from app.utils.xpath import Competitions
+from app.utils.extraction import ExtractionPlan
+from app.utils.utils import extract_from_urls
+from app.utils.xpath import Competitions, Regions
 
 
 @dataclass
@@ -13,14 +14,33 @@ class TransfermarktCompetitionSearch(TransfermarktBase):
     Args:
         query (str): The search query for finding football clubs.
         URL (str): The URL template for the search query.
+        REGIONS (tuple[str, ...]): The page region holding the search result boxes.
+        CACHE_TTL (float): Search results are cached for ten minutes.
+        CACHE_GRACE (float): Expired search results are served for up to half an hour more while they are refreshed.
         page_number (int): The page number of search results (default is 1).
+        PLAN (ExtractionPlan): The columns extracted from the search results.
     """
 
     query: str = None
     URL: str = (
         "https://www.transfermarkt.com/schnellsuche/ergebnis/schnellsuche?query={query}&Wettbewerb_page={page_number}"
     )
+    REGIONS = (Regions.MAIN,)
+    CACHE_TTL = 600.0
+    CACHE_GRACE = 1800.0
     page_number: int = 1
+    PLAN = ExtractionPlan(
+        fields=(
+            Competitions.Search.URLS,
+            Competitions.Search.NAMES,
+            Competitions.Search.COUNTRIES,
+            Competitions.Search.CLUBS,
+            Competitions.Search.PLAYERS,
+            Competitions.Search.TOTAL_MARKET_VALUES,
+            Competitions.Search.MEAN_MARKET_VALUES,
+            Competitions.Search.CONTINENTS,
+        ),
+    )
 
     def __post_init__(self) -> None:
         """Initialize the TransfermarktCompetitionSearch class."""
@@ -36,14 +56,15 @@ class TransfermarktCompetitionSearch(TransfermarktBase):
                 including its unique identifier, name, country, associated clubs, number of players,
                 total market value, mean market value, and continent.
         """
-        idx = [extract_from_url(url) for url in self.get_list_by_xpath(Competitions.Search.URLS)]
-        name = self.get_list_by_xpath(Competitions.Search.NAMES)
-        country = self.get_list_by_xpath(Competitions.Search.COUNTRIES)
-        clubs = self.get_list_by_xpath(Competitions.Search.CLUBS)
-        players = self.get_list_by_xpath(Competitions.Search.PLAYERS)
-        total_market_value = self.get_list_by_xpath(Competitions.Search.TOTAL_MARKET_VALUES)
-        mean_market_value = self.get_list_by_xpath(Competitions.Search.MEAN_MARKET_VALUES)
-        continent = self.get_list_by_xpath(Competitions.Search.CONTINENTS)
+        results = self.PLAN.extract(self.get_section(Competitions.Search.BASE))[0]
+        idx = extract_from_urls(self.get_list_by_xpath(Competitions.Search.URLS, section=results))
+        name = self.get_list_by_xpath(Competitions.Search.NAMES, section=results)
+        country = self.get_list_by_xpath(Competitions.Search.COUNTRIES, section=results)
+        clubs = self.get_list_by_xpath(Competitions.Search.CLUBS, section=results)
+        players = self.get_list_by_xpath(Competitions.Search.PLAYERS, section=results)
+        total_market_value = self.get_list_by_xpath(Competitions.Search.TOTAL_MARKET_VALUES, section=results)
+        mean_market_value = self.get_list_by_xpath(Competitions.Search.MEAN_MARKET_VALUES, section=results)
+        continent = self.get_list_by_xpath(Competitions.Search.CONTINENTS, section=results)
 
         return [
             {
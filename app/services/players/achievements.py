@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 
 from app.services.base import TransfermarktBase
+from app.utils.extraction import ExtractionPlan
 from app.utils.utils import extract_from_url, trim
-from app.utils.xpath import Players
+from app.utils.xpath import Players, Regions
 
 
 @dataclass
@@ -15,10 +16,35 @@ class TransfermarktPlayerAchievements(TransfermarktBase):
 
     Attributes:
         URL (str): The URL to fetch the player's achievements data.
+        REGIONS (tuple[str, ...]): The page region holding the achievement boxes.
+        CACHE_TTL (float): Achievements are cached for a day, they change a few times a season.
+        CACHE_GRACE (float): Expired achievements are served for up to a day more while they are refreshed.
+        ENTITY_ID (str): The page is not found only for an invalid player id.
+        DETAILS_PLAN (ExtractionPlan): The fields extracted from each detail row of an achievement.
+        PLAN (ExtractionPlan): The fields extracted from each achievement, with its detail rows.
     """
 
     player_id: str = None
     URL: str = "https://www.transfermarkt.com/-/erfolge/spieler/{player_id}"
+    REGIONS = (Regions.MAIN,)
+    CACHE_TTL = 86400.0
+    CACHE_GRACE = 86400.0
+    ENTITY_ID = "player_id"
+    DETAILS_PLAN = ExtractionPlan(
+        rows=Players.Achievements.DETAILS,
+        fields=(
+            Players.Achievements.SEASON,
+            Players.Achievements.CLUB_NAME,
+            Players.Achievements.CLUB_URL,
+            Players.Achievements.COMPETITION_NAME,
+            Players.Achievements.COMPETITION_URL,
+        ),
+    )
+    PLAN = ExtractionPlan(
+        rows=Players.Achievements.ACHIEVEMENTS,
+        fields=(Players.Achievements.TITLE,),
+        plans=(DETAILS_PLAN,),
+    )
 
     def __post_init__(self):
         """Initialize the TransfermarktPlayerAchievements class."""
@@ -36,21 +62,21 @@ class TransfermarktPlayerAchievements(TransfermarktBase):
                 'details' with their respective values.
         """
 
-        achievements = self.page.xpath(Players.Achievements.ACHIEVEMENTS)
+        achievements = self.PLAN.extract(self.page)
 
         player_achievements = []
         for achievement in achievements:
-            title = trim(achievement.xpath(Players.Achievements.TITLE)).split(" ", 1)[-1]
-            details = achievement.xpath(Players.Achievements.DETAILS)
+            title = trim(achievement.evaluate(Players.Achievements.TITLE)).split(" ", 1)[-1]
+            details = achievement.extract(self.DETAILS_PLAN)
 
             achievement_details = []
             for detail in details:
-                competition_name = trim(detail.xpath(Players.Achievements.COMPETITION_NAME))
-                competition_url = trim(detail.xpath(Players.Achievements.COMPETITION_URL))
+                competition_name = trim(detail.evaluate(Players.Achievements.COMPETITION_NAME))
+                competition_url = trim(detail.evaluate(Players.Achievements.COMPETITION_URL))
                 competition_id = extract_from_url(competition_url)
-                season_name = trim(detail.xpath(Players.Achievements.SEASON))
-                club_name = trim(detail.xpath(Players.Achievements.CLUB_NAME))
-                club_url = trim(detail.xpath(Players.Achievements.CLUB_URL))
+                season_name = trim(detail.evaluate(Players.Achievements.SEASON))
+                club_name = trim(detail.evaluate(Players.Achievements.CLUB_NAME))
+                club_url = trim(detail.evaluate(Players.Achievements.CLUB_URL))
                 club_id = extract_from_url(club_url)
 
                 achievement_detail = {
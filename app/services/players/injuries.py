@@ -1,10 +1,10 @@
 from dataclasses import dataclass
 from typing import List, Optional
-from xml.etree import ElementTree
 
 from app.services.base import TransfermarktBase
-from app.utils.utils import extract_from_url, trim
-from app.utils.xpath import Players
+from app.utils.extraction import ExtractionPlan
+from app.utils.utils import extract_from_urls, trim
+from app.utils.xpath import Players, Regions
 
 
 @dataclass
@@ -18,11 +18,32 @@ class TransfermarktPlayerInjuries(TransfermarktBase):
 
     Attributes:
         URL (str): The URL to fetch the player's injury history data.
+        REGIONS (tuple[str, ...]): The page region holding the injury table and its pagination.
+        CACHE_TTL (float): Injuries are cached for six hours.
+        CACHE_GRACE (float): Expired injuries are served for up to six hours more while they are refreshed.
+        ENTITY_ID (str): The page is not found only for an invalid player id.
+        PLAN (ExtractionPlan): The fields extracted from each injury row.
     """
 
     player_id: str = None
     URL: str = "https://www.transfermarkt.com/player/verletzungen/spieler/{player_id}/plus/1/page/{page_number}"
+    REGIONS = (Regions.MAIN,)
+    CACHE_TTL = 21600.0
+    CACHE_GRACE = 21600.0
+    ENTITY_ID = "player_id"
     page_number: int = 1
+    PLAN = ExtractionPlan(
+        rows=Players.Injuries.RESULTS,
+        fields=(
+            Players.Injuries.SEASONS,
+            Players.Injuries.INJURY,
+            Players.Injuries.FROM,
+            Players.Injuries.UNTIL,
+            Players.Injuries.DAYS,
+            Players.Injuries.GAMES_MISSED,
+            Players.Injuries.GAMES_MISSED_CLUBS_URLS,
+        ),
+    )
 
     def __post_init__(self):
         """Initialize the TransfermarktPlayerInjuries class."""
@@ -40,18 +61,18 @@ class TransfermarktPlayerInjuries(TransfermarktBase):
                 'until', 'days', 'gamesMissed', and 'gamesMissedClubs' with their respective values.
 
         """
-        injuries: ElementTree = self.page.xpath(Players.Injuries.RESULTS)
+        injuries = self.PLAN.extract(self.page)
         player_injuries = []
 
         for injury in injuries:
-            season = trim(injury.xpath(Players.Injuries.SEASONS))
-            injury_type = trim(injury.xpath(Players.Injuries.INJURY))
-            date_from = trim(injury.xpath(Players.Injuries.FROM))
-            date_until = trim(injury.xpath(Players.Injuries.UNTIL))
-            days = trim(injury.xpath(Players.Injuries.DAYS))
-            games_missed = trim(injury.xpath(Players.Injuries.GAMES_MISSED))
-            games_missed_clubs_urls = injury.xpath(Players.Injuries.GAMES_MISSED_CLUBS_URLS)
-            games_missed_clubs_ids = [extract_from_url(club_url) for club_url in games_missed_clubs_urls]
+            season = trim(injury.evaluate(Players.Injuries.SEASONS))
+            injury_type = trim(injury.evaluate(Players.Injuries.INJURY))
+            date_from = trim(injury.evaluate(Players.Injuries.FROM))
+            date_until = trim(injury.evaluate(Players.Injuries.UNTIL))
+            days = trim(injury.evaluate(Players.Injuries.DAYS))
+            games_missed = trim(injury.evaluate(Players.Injuries.GAMES_MISSED))
+            games_missed_clubs_urls = injury.evaluate(Players.Injuries.GAMES_MISSED_CLUBS_URLS)
+            games_missed_clubs_ids = extract_from_urls(games_missed_clubs_urls)
 
             player_injuries.append(
                 {
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
 
 from app.services.base import TransfermarktBase
-from app.utils.utils import extract_from_url, to_camel_case, zip_lists_into_dict
-from app.utils.xpath import Players
+from app.utils.utils import extract_from_urls, to_camel_case, zip_lists_into_dict
+from app.utils.xpath import Players, Regions
 
 
 @dataclass
@@ -13,10 +13,18 @@ class TransfermarktPlayerJerseyNumbers(TransfermarktBase):
     Args:
         player_id (str): The unique identifier of the player.
         URL (str): The URL template for the player's stats page on Transfermarkt.
+        REGIONS (tuple[str, ...]): The page region holding the jersey numbers table.
+        CACHE_TTL (float): Jersey numbers are cached for a day.
+        CACHE_GRACE (float): Expired jersey numbers are served for up to a day more while they are refreshed.
+        ENTITY_ID (str): The page is not found only for an invalid player id.
     """
 
     player_id: str = None
     URL: str = "https://www.transfermarkt.com/-/rueckennummern/spieler/{player_id}"
+    REGIONS = (Regions.MAIN,)
+    CACHE_TTL = 86400.0
+    CACHE_GRACE = 86400.0
+    ENTITY_ID = "player_id"
 
     def __post_init__(self) -> None:
         """Initialize the TransfermarktJerseyNumbers class."""
@@ -32,14 +40,15 @@ class TransfermarktPlayerJerseyNumbers(TransfermarktBase):
             list: A list of dictionaries where each dictionary represents the jersey number for a specific season/club.
             Each dictionary includes keys for seasons, clubs and jersey numbers for the player.
         """
+        items = self.get_section(Players.JerseyNumbers.ITEMS)
         headers = to_camel_case(
-            ["Season", "Club", "Jersey number"] + self.get_list_by_xpath(Players.JerseyNumbers.HEADERS),
+            ["Season", "Club", "Jersey number"] + self.get_list_by_xpath(Players.JerseyNumbers.HEADERS, section=items),
         )
 
-        seasons = self.get_list_by_xpath(Players.JerseyNumbers.SEASONS)
-        clubs_urls = self.get_list_by_xpath(Players.JerseyNumbers.CLUBS_URLS)
-        clubs_ids = [extract_from_url(url) for url in clubs_urls]
-        jerseynumbers = self.get_list_by_xpath(Players.JerseyNumbers.DATA)
+        seasons = self.get_list_by_xpath(Players.JerseyNumbers.SEASONS, section=items)
+        clubs_urls = self.get_list_by_xpath(Players.JerseyNumbers.CLUBS_URLS, section=items)
+        clubs_ids = extract_from_urls(clubs_urls)
+        jerseynumbers = self.get_list_by_xpath(Players.JerseyNumbers.DATA, section=items)
         data = [[season, club_id, number] for season, club_id, number in list(zip(seasons, clubs_ids, jerseynumbers))]
 
         return [zip_lists_into_dict(headers, stat) for stat in data]
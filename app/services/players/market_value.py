@@ -1,10 +1,10 @@
-import json
 from dataclasses import dataclass
 
 from app.services.base import TransfermarktBase
+from app.utils.codec import loads
 from app.utils.regex import REGEX_CHART_CLUB_ID
 from app.utils.utils import safe_regex, zip_lists_into_dict
-from app.utils.xpath import Players
+from app.utils.xpath import Players, Regions
 
 
 @dataclass
@@ -17,19 +17,34 @@ class TransfermarktPlayerMarketValue(TransfermarktBase):
 
     Attributes:
         URL (str): The URL to fetch the player's market value data.
+        REGIONS (tuple[str, ...]): The page regions holding the player header and the market value facts.
+        CACHE_TTL (float): Market values are cached for a day, Transfermarkt updates them a few times a season.
+        CACHE_GRACE (float): Expired market values are served for up to a day more while they are refreshed.
+        ENTITY_ID (str): The page is not found only for an invalid player id.
         URL_MARKET_VALUE (str): The URL to fetch the player's market value history chart data.
     """
 
     player_id: str = None
     URL: str = "https://www.transfermarkt.com/-/marktwertverlauf/spieler/{player_id}"
+    REGIONS = (Regions.HEADER, Regions.MAIN)
+    CACHE_TTL = 86400.0
+    CACHE_GRACE = 86400.0
+    ENTITY_ID = "player_id"
     URL_MARKET_VALUE: str = "https://www.transfermarkt.com/ceapi/marketValueDevelopment/graph/{player_id}"
 
+    @classmethod
+    def upstream_urls(cls, **kwargs) -> list[str]:
+        """Build the URLs of the market value page and of its chart data."""
+        return super().upstream_urls(**kwargs) + [cls.URL_MARKET_VALUE.format(**kwargs)]
+
     def __post_init__(self) -> None:
         """Initialize the TransfermarktPlayerMarketValue class."""
         self.URL = self.URL.format(player_id=self.player_id)
+        self.URL_MARKET_VALUE = self.URL_MARKET_VALUE.format(player_id=self.player_id)
+        self.prefetch(url=self.URL_MARKET_VALUE)
         self.page = self.request_url_page()
         self.raise_exception_if_not_found(xpath=Players.Profile.NAME)
-        self.market_value_chart = self.make_request(url=self.URL_MARKET_VALUE.format(player_id=self.player_id))
+        self.market_value_chart = self.make_request(url=self.URL_MARKET_VALUE)
 
     def __parse_market_value_history(self) -> list:
         """
@@ -40,7 +55,7 @@ class TransfermarktPlayerMarketValue(TransfermarktBase):
                 player's market value history. Each dictionary contains keys 'date', 'age',
                 'clubID', 'clubName', and 'value' with their respective values.
         """
-        data = json.loads(self.market_value_chart.content).get("list")
+        data = loads(self.market_value_chart.content).get("list")
 
         club_image = None
         for entry in data:
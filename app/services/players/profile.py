@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from app.services.base import TransfermarktBase
 from app.utils.regex import REGEX_DOB_AGE
 from app.utils.utils import extract_from_url, safe_regex, trim
-from app.utils.xpath import Players
+from app.utils.xpath import Players, Regions, evaluate
 
 
 @dataclass
@@ -16,10 +16,18 @@ class TransfermarktPlayerProfile(TransfermarktBase):
 
     Attributes:
         URL (str): The URL to fetch the player's profile data.
+        REGIONS (tuple[str, ...]): The page regions holding the player header, the player id and the profile boxes.
+        CACHE_TTL (float): Player profiles are cached for six hours.
+        CACHE_GRACE (float): Expired player profiles are served for up to six hours more while they are refreshed.
+        ENTITY_ID (str): The page is not found only for an invalid player id.
     """
 
     player_id: str = None
     URL: str = "https://www.transfermarkt.com/-/profil/spieler/{player_id}"
+    REGIONS = (Regions.HEADER, Regions.SUBNAVIGATION, Regions.MAIN)
+    CACHE_TTL = 21600.0
+    CACHE_GRACE = 21600.0
+    ENTITY_ID = "player_id"
 
     def __post_init__(self) -> None:
         """Initialize the TransfermarktPlayerProfile class."""
@@ -33,12 +41,12 @@ class TransfermarktPlayerProfile(TransfermarktBase):
         Returns:
             list: A list of dictionaries, each containing ID, profile URL, name, and profile type
         """
-        relatives = self.page.xpath(Players.Profile.RELATIVES)
+        relatives = evaluate(self.page, Players.Profile.RELATIVES)
 
         result = []
         for relative in relatives:
-            url = trim(relative.xpath(Players.Profile.RELATIVE_URL))
-            name = trim(relative.xpath(Players.Profile.RELATIVE_NAME))
+            url = trim(evaluate(relative, Players.Profile.RELATIVE_URL))
+            name = trim(evaluate(relative, Players.Profile.RELATIVE_NAME))
             result.append(
                 {
                     "id": extract_from_url(url),
@@ -59,57 +67,71 @@ class TransfermarktPlayerProfile(TransfermarktBase):
             dict: A dictionary containing the player's unique identifier, profile information, and the timestamp of when
                 the data was last updated.
         """
+        header = self.get_labels(("span",), Players.Profile.HEADER)
+        info_table = self.get_labels(("span",), Players.Profile.INFO_TABLE)
+        positions = self.get_labels(("dt", "dd"), Players.Profile.POSITIONS)
+        spans = self.get_labels(("span",))
         self.response["id"] = self.get_text_by_xpath(Players.Profile.ID)
         self.response["url"] = self.get_text_by_xpath(Players.Profile.URL)
-        self.response["name"] = self.get_text_by_xpath(Players.Profile.NAME, join_str=" ")
+        self.response["name"] = self.get_text_by_xpath(Players.Profile.NAME, join_str=" ", section=header)
         self.response["description"] = self.get_text_by_xpath(Players.Profile.DESCRIPTION)
-        self.response["fullName"] = self.get_text_by_xpath(Players.Profile.FULL_NAME)
-        self.response["nameInHomeCountry"] = self.get_text_by_xpath(Players.Profile.NAME_IN_HOME_COUNTRY)
-        self.response["imageUrl"] = self.get_text_by_xpath(Players.Profile.IMAGE_URL)
+        self.response["fullName"] = self.get_text_by_xpath(Players.Profile.FULL_NAME, section=info_table)
+        self.response["nameInHomeCountry"] = self.get_text_by_xpath(
+            Players.Profile.NAME_IN_HOME_COUNTRY,
+            section=info_table,
+        )
+        self.response["imageUrl"] = self.get_text_by_xpath(Players.Profile.IMAGE_URL, section=header)
         self.response["dateOfBirth"] = safe_regex(
-            self.get_text_by_xpath(Players.Profile.DATE_OF_BIRTH_AGE),
+            self.get_text_by_xpath(Players.Profile.DATE_OF_BIRTH_AGE, section=header),
             REGEX_DOB_AGE,
             "dob",
         )
         self.response["placeOfBirth"] = {
-            "city": self.get_text_by_xpath(Players.Profile.PLACE_OF_BIRTH_CITY),
-            "country": self.get_text_by_xpath(Players.Profile.PLACE_OF_BIRTH_COUNTRY),
+            "city": self.get_text_by_xpath(Players.Profile.PLACE_OF_BIRTH_CITY, section=info_table),
+            "country": self.get_text_by_xpath(Players.Profile.PLACE_OF_BIRTH_COUNTRY, section=info_table),
         }
         self.response["age"] = safe_regex(
-            self.get_text_by_xpath(Players.Profile.DATE_OF_BIRTH_AGE),
+            self.get_text_by_xpath(Players.Profile.DATE_OF_BIRTH_AGE, section=header),
             REGEX_DOB_AGE,
             "age",
         )
-        self.response["height"] = self.get_text_by_xpath(Players.Profile.HEIGHT)
-        self.response["citizenship"] = self.get_list_by_xpath(Players.Profile.CITIZENSHIP)
-        self.response["isRetired"] = self.get_text_by_xpath(Players.Profile.RETIRED_SINCE_DATE) is not None
-        self.response["retiredSince"] = self.get_text_by_xpath(Players.Profile.RETIRED_SINCE_DATE)
+        self.response["height"] = self.get_text_by_xpath(Players.Profile.HEIGHT, section=info_table)
+        self.response["citizenship"] = self.get_list_by_xpath(Players.Profile.CITIZENSHIP, section=info_table)
+        self.response["isRetired"] = (
+            self.get_text_by_xpath(Players.Profile.RETIRED_SINCE_DATE, section=header) is not None
+        )
+        self.response["retiredSince"] = self.get_text_by_xpath(Players.Profile.RETIRED_SINCE_DATE, section=header)
         self.response["position"] = {
-            "main": self.get_text_by_xpath(Players.Profile.POSITION_MAIN),
-            "other": self.get_list_by_xpath(Players.Profile.POSITION_OTHER),
+            "main": self.get_text_by_xpath(Players.Profile.POSITION_MAIN, section=positions),
+            "other": self.get_list_by_xpath(Players.Profile.POSITION_OTHER, section=positions),
         }
-        self.response["foot"] = self.get_text_by_xpath(Players.Profile.FOOT)
-        self.response["shirtNumber"] = self.get_text_by_xpath(Players.Profile.SHIRT_NUMBER)
+        self.response["foot"] = self.get_text_by_xpath(Players.Profile.FOOT, section=info_table)
+        self.response["shirtNumber"] = self.get_text_by_xpath(Players.Profile.SHIRT_NUMBER, section=header)
         self.response["club"] = {
-            "id": extract_from_url(self.get_text_by_xpath(Players.Profile.CURRENT_CLUB_URL)),
-            "name": self.get_text_by_xpath(Players.Profile.CURRENT_CLUB_NAME),
-            "joined": self.get_text_by_xpath(Players.Profile.CURRENT_CLUB_JOINED),
-            "contractExpires": self.get_text_by_xpath(Players.Profile.CURRENT_CLUB_CONTRACT_EXPIRES),
-            "contractOption": self.get_text_by_xpath(Players.Profile.CURRENT_CLUB_CONTRACT_OPTION),
-            "lastClubId": extract_from_url(self.get_text_by_xpath(Players.Profile.LAST_CLUB_URL)),
-            "lastClubName": self.get_text_by_xpath(Players.Profile.LAST_CLUB_NAME),
-            "mostGamesFor": self.get_text_by_xpath(Players.Profile.MOST_GAMES_FOR_CLUB_NAME),
+            "id": extract_from_url(self.get_text_by_xpath(Players.Profile.CURRENT_CLUB_URL, section=header)),
+            "name": self.get_text_by_xpath(Players.Profile.CURRENT_CLUB_NAME, section=header),
+            "joined": self.get_text_by_xpath(Players.Profile.CURRENT_CLUB_JOINED, section=spans),
+            "contractExpires": self.get_text_by_xpath(Players.Profile.CURRENT_CLUB_CONTRACT_EXPIRES, section=spans),
+            "contractOption": self.get_text_by_xpath(Players.Profile.CURRENT_CLUB_CONTRACT_OPTION, section=spans),
+            "lastClubId": extract_from_url(self.get_text_by_xpath(Players.Profile.LAST_CLUB_URL, section=header)),
+            "lastClubName": self.get_text_by_xpath(Players.Profile.LAST_CLUB_NAME, section=header),
+            "mostGamesFor": self.get_text_by_xpath(Players.Profile.MOST_GAMES_FOR_CLUB_NAME, section=header),
         }
-        self.response["marketValue"] = self.get_text_by_xpath(Players.Profile.MARKET_VALUE, iloc_to=3, join_str="")
+        self.response["marketValue"] = self.get_text_by_xpath(
+            Players.Profile.MARKET_VALUE,
+            iloc_to=3,
+            join_str="",
+            section=header,
+        )
         self.response["agent"] = {
-            "name": self.get_text_by_xpath(Players.Profile.AGENT_NAME),
-            "url": self.get_text_by_xpath(Players.Profile.AGENT_URL),
+            "name": self.get_text_by_xpath(Players.Profile.AGENT_NAME, section=info_table),
+            "url": self.get_text_by_xpath(Players.Profile.AGENT_URL, section=info_table),
         }
-        self.response["outfitter"] = self.get_text_by_xpath(Players.Profile.OUTFITTER)
-        self.response["socialMedia"] = self.get_list_by_xpath(Players.Profile.SOCIAL_MEDIA)
+        self.response["outfitter"] = self.get_text_by_xpath(Players.Profile.OUTFITTER, section=info_table)
+        self.response["socialMedia"] = self.get_list_by_xpath(Players.Profile.SOCIAL_MEDIA, section=info_table)
         self.response["trainerProfile"] = {
-            "id": extract_from_url(self.get_text_by_xpath(Players.Profile.TRAINER_PROFILE_URL)),
-            "url": self.get_text_by_xpath(Players.Profile.TRAINER_PROFILE_URL),
+            "id": extract_from_url(self.get_text_by_xpath(Players.Profile.TRAINER_PROFILE_URL, section=header)),
+            "url": self.get_text_by_xpath(Players.Profile.TRAINER_PROFILE_URL, section=header),
             "position": self.get_text_by_xpath(Players.Profile.TRAINER_PROFILE_POSITION),
         }
         self.response["relatives"] = self.__parse_player_relatives()
@@ -1,10 +1,10 @@
 from dataclasses import dataclass
-from xml.etree import ElementTree
 
 from app.services.base import TransfermarktBase
+from app.utils.extraction import ExtractionPlan
 from app.utils.regex import REGEX_CHART_CLUB_ID
 from app.utils.utils import extract_from_url, safe_regex, trim
-from app.utils.xpath import Players
+from app.utils.xpath import Players, Regions
 
 
 @dataclass
@@ -15,14 +15,34 @@ class TransfermarktPlayerSearch(TransfermarktBase):
     Args:
         query (str): The search query for finding football clubs.
         URL (str): The URL template for the search query.
+        REGIONS (tuple[str, ...]): The page region holding the search result boxes.
+        CACHE_TTL (float): Search results are cached for ten minutes.
+        CACHE_GRACE (float): Expired search results are served for up to half an hour more while they are refreshed.
         page_number (int): The page number of search results (default is 1).
+        PLAN (ExtractionPlan): The fields extracted from each search result row.
     """
 
     query: str = None
     URL: str = (
         "https://www.transfermarkt.com/schnellsuche/ergebnis/schnellsuche?query={query}&Spieler_page={page_number}"
     )
+    REGIONS = (Regions.MAIN,)
+    CACHE_TTL = 600.0
+    CACHE_GRACE = 1800.0
     page_number: int = 1
+    PLAN = ExtractionPlan(
+        rows=Players.Search.RESULTS,
+        fields=(
+            Players.Search.ID,
+            Players.Search.NAME,
+            Players.Search.POSITION,
+            Players.Search.CLUB_NAME,
+            Players.Search.CLUB_IMAGE,
+            Players.Search.AGE,
+            Players.Search.NATIONALITIES,
+            Players.Search.MARKET_VALUE,
+        ),
+    )
 
     def __post_init__(self) -> None:
         """Initialize the TransfermarktPlayerSearch class."""
@@ -38,18 +58,18 @@ class TransfermarktPlayerSearch(TransfermarktBase):
         Returns:
             list: A list of dictionaries, with each dictionary representing a player search result.
         """
-        search_results: list[ElementTree] = self.page.xpath(Players.Search.RESULTS)
+        search_results = self.PLAN.extract(self.get_section(Players.Search.BASE))
         results = []
 
         for result in search_results:
-            idx = extract_from_url(result.xpath(Players.Search.ID))
-            name = trim(result.xpath(Players.Search.NAME))
-            position = trim(result.xpath(Players.Search.POSITION))
-            club_name = trim(result.xpath(Players.Search.CLUB_NAME))
-            club_id = safe_regex(result.xpath(Players.Search.CLUB_IMAGE), REGEX_CHART_CLUB_ID, "club_id")
-            age = trim(result.xpath(Players.Search.AGE))
-            nationalities = result.xpath(Players.Search.NATIONALITIES)
-            market_value = trim(result.xpath(Players.Search.MARKET_VALUE))
+            idx = extract_from_url(result.evaluate(Players.Search.ID))
+            name = trim(result.evaluate(Players.Search.NAME))
+            position = trim(result.evaluate(Players.Search.POSITION))
+            club_name = trim(result.evaluate(Players.Search.CLUB_NAME))
+            club_id = safe_regex(result.evaluate(Players.Search.CLUB_IMAGE), REGEX_CHART_CLUB_ID, "club_id")
+            age = trim(result.evaluate(Players.Search.AGE))
+            nationalities = result.evaluate(Players.Search.NATIONALITIES)
+            market_value = trim(result.evaluate(Players.Search.MARKET_VALUE))
 
             results.append(
                 {
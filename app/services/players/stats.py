@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 
 from app.services.base import TransfermarktBase
-from app.utils.utils import extract_from_url, to_camel_case, zip_lists_into_dict
-from app.utils.xpath import Players
+from app.utils.extraction import ExtractionPlan
+from app.utils.utils import extract_from_urls, to_camel_case, zip_lists_into_dict
+from app.utils.xpath import Players, Regions
 
 
 @dataclass
@@ -13,10 +14,25 @@ class TransfermarktPlayerStats(TransfermarktBase):
     Args:
         player_id (str): The unique identifier of the player.
         URL (str): The URL template for the player's stats page on Transfermarkt.
+        REGIONS (tuple[str, ...]): The page region holding the stats table.
+        CACHE_TTL (float): Stats are cached for six hours, they change with every match played.
+        CACHE_GRACE (float): Expired stats are served for up to six hours more while they are refreshed.
+        ENTITY_ID (str): The page is not found only for an invalid player id.
+        ROWS_PLAN (ExtractionPlan): The fields extracted from each row of the stats table.
+        PLAN (ExtractionPlan): The fields extracted from the stats table, with its rows.
     """
 
     player_id: str = None
     URL: str = "https://www.transfermarkt.com/-/leistungsdatendetails/spieler/{player_id}"
+    REGIONS = (Regions.MAIN,)
+    CACHE_TTL = 21600.0
+    CACHE_GRACE = 21600.0
+    ENTITY_ID = "player_id"
+    ROWS_PLAN = ExtractionPlan(rows=Players.Stats.ROWS, fields=(Players.Stats.DATA,))
+    PLAN = ExtractionPlan(
+        fields=(Players.Stats.HEADERS, Players.Stats.COMPETITIONS_URLS, Players.Stats.CLUBS_URLS),
+        plans=(ROWS_PLAN,),
+    )
 
     def __post_init__(self) -> None:
         """Initialize the TransfermarktPlayerStats class."""
@@ -33,18 +49,21 @@ class TransfermarktPlayerStats(TransfermarktBase):
                 Each dictionary includes keys for competition ID, club ID, season ID, competition name, and various
                 statistical values for the player.
         """
-        rows = self.page.xpath(Players.Stats.ROWS)
+        items = self.PLAN.extract(self.get_section(Players.Stats.ITEMS))[0]
+        rows = items.extract(self.ROWS_PLAN)
         headers = to_camel_case(
             ["Competition id", "Club id", "Season id", "Competition name"]
-            + self.get_list_by_xpath(Players.Stats.HEADERS),
+            + self.get_list_by_xpath(Players.Stats.HEADERS, section=items),
         )
 
-        competitions_urls = self.get_list_by_xpath(Players.Stats.COMPETITIONS_URLS)
-        clubs_urls = self.get_list_by_xpath(Players.Stats.CLUBS_URLS)
-        competitions_ids = [extract_from_url(url) for url in competitions_urls]
-        clubs_ids = [extract_from_url(url) for url in clubs_urls]
+        competitions_urls = self.get_list_by_xpath(Players.Stats.COMPETITIONS_URLS, section=items)
+        clubs_urls = self.get_list_by_xpath(Players.Stats.CLUBS_URLS, section=items)
+        competitions_ids = extract_from_urls(competitions_urls)
+        clubs_ids = extract_from_urls(clubs_urls)
         stats = [
-            [item for text in row.xpath(Players.Stats.DATA) if text != "\xa0" for item in text.split("\xa0/\xa0")][1:]
+            [item for text in row.evaluate(Players.Stats.DATA) if text != "\xa0" for item in text.split("\xa0/\xa0")][
+                1:
+            ]
             for row in rows
         ]
         data = [
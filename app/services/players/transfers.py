@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 
 from app.services.base import TransfermarktBase
+from app.utils.codec import loads
 from app.utils.utils import extract_from_url, safe_split
-from app.utils.xpath import Players
+from app.utils.xpath import Players, Regions
 
 
 @dataclass
@@ -13,18 +14,33 @@ class TransfermarktPlayerTransfers(TransfermarktBase):
     Args:
         player_id (str): The unique identifier of the player.
         URL (str): The URL template for the player's transfers page on Transfermarkt.
+        REGIONS (tuple[str, ...]): The page regions holding the player name and the youth clubs box.
+        CACHE_TTL (float): Transfer histories are cached for a day.
+        CACHE_GRACE (float): Expired transfer histories are served for up to a day more while they are refreshed.
+        ENTITY_ID (str): The page is not found only for an invalid player id.
     """
 
     player_id: str = None
     URL: str = "https://www.transfermarkt.com/-/transfers/spieler/{player_id}"
+    REGIONS = (Regions.HEADER, Regions.MAIN)
+    CACHE_TTL = 86400.0
+    CACHE_GRACE = 86400.0
+    ENTITY_ID = "player_id"
     URL_TRANSFERS: str = "https://www.transfermarkt.com/ceapi/transferHistory/list/{player_id}"
 
+    @classmethod
+    def upstream_urls(cls, **kwargs) -> list[str]:
+        """Build the URLs of the transfers page and of its transfer history data."""
+        return super().upstream_urls(**kwargs) + [cls.URL_TRANSFERS.format(**kwargs)]
+
     def __post_init__(self) -> None:
         """Initialize the TransfermarktPlayerTransfers class."""
         self.URL = self.URL.format(player_id=self.player_id)
+        self.URL_TRANSFERS = self.URL_TRANSFERS.format(player_id=self.player_id)
+        self.prefetch(url=self.URL_TRANSFERS)
         self.page = self.request_url_page()
         self.raise_exception_if_not_found(xpath=Players.Profile.NAME)
-        self.transfer_history = self.make_request(url=self.URL_TRANSFERS.format(player_id=self.player_id))
+        self.transfer_history = self.make_request(url=self.URL_TRANSFERS)
 
     def __parse_player_transfer_history(self) -> list:
         """
@@ -36,7 +52,7 @@ class TransfermarktPlayerTransfers(TransfermarktBase):
         Returns:
             list: A list of dictionaries, each containing details of the player's transfer history,
         """
-        transfers = self.transfer_history.json().get("transfers")
+        transfers = loads(self.transfer_history.content).get("transfers")
 
         return [
             {
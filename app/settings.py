@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,6 +7,50 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env")
     RATE_LIMITING_ENABLE: bool = False
     RATE_LIMITING_FREQUENCY: str = "2/3seconds"
+    HTTP_POOL_CONNECTIONS: int = 4
+    HTTP_POOL_MAXSIZE: int = 32
+    HTTP_CONNECT_TIMEOUT: float = 3.05
+    HTTP_READ_TIMEOUT: float = 15.0
+    HTTP_ASYNC_MAX_CONNECTIONS: int = 256
+    HTTP_PREFETCH_WORKERS: int = 16
+    HTTP_REVALIDATION_MAX_ENTRIES: int = 64
+    HTTP_STREAM_CHUNK_SIZE: int = 16384
+    HTTP_RATE_INITIAL: float = 4.0
+    HTTP_RATE_MIN: float = 0.25
+    HTTP_RATE_MAX: float = 20.0
+    HTTP_RATE_BURST: int = 8
+    HTTP_RATE_MAX_WAIT: float = 10.0
+    HTTP_RETRY_ATTEMPTS: int = 2
+    HTTP_RETRY_BACKOFF_BASE: float = 0.5
+    HTTP_RETRY_BACKOFF_MAX: float = 8.0
+    HTTP_BREAKER_WINDOW: float = 30.0
+    HTTP_BREAKER_MIN_CALLS: int = 10
+    HTTP_BREAKER_FAILURE_RATE: float = 0.5
+    HTTP_BREAKER_SLOW_CALL_DURATION: float = 8.0
+    HTTP_BREAKER_SLOW_CALL_RATE: float = 0.8
+    HTTP_BREAKER_OPEN_DURATION: float = 15.0
+    HTTP_BREAKER_PROBES: int = 2
+    HTTP_PREWARM_ENABLE: bool = True
+    HTTP_PREWARM_URLS: list[str] = ["https://www.transfermarkt.com", "https://www.transfermarkt.us"]
+    HTTP_PREWARM_CONNECTIONS: int = 4
+    PARSER_BACKENDS: dict[str, str] = {}
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_TTLS: dict[str, float] = {}
+    CACHE_GRACES: dict[str, float] = {}
+    CACHE_EARLY_REFRESH_BETA: float = 1.0
+    CACHE_NOT_FOUND_TTL: float = 300.0
+    CACHE_NOT_FOUND_MAX_ENTRIES: int = 10000
+    INVALID_IDS_CAPACITY: int = 100000
+    INVALID_IDS_ERROR_RATE: float = 1e-6
+    INVALID_IDS_LIFETIME: float = 86400.0
+    PAGE_CACHE_DIR: Optional[str] = None
+    PAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    REMOTE_CACHE_URL: Optional[str] = None
+    REMOTE_CACHE_PREFIX: str = "tfmkt:"
+    REMOTE_CACHE_TIMEOUT: float = 0.5
+    REMOTE_CACHE_LOCK_TTL: float = 30.0
+    REMOTE_CACHE_LOCK_WAIT: float = 2.0
+    REMOTE_CACHE_MAX_WAITERS: int = 8
 
 
 settings = Settings()
@@ -0,0 +1,131 @@
+import hashlib
+import math
+import threading
+import time
+from typing import Callable
+
+
+class BloomFilter:
+    """
+    A compact probabilistic set: it may answer that it holds an item it was never given, at `error_rate` at most
+    while it holds no more than `capacity` items, but never that it misses one it was given.
+
+    Items are hashed once with BLAKE2b, and the positions of their bits derived from the two halves of the digest
+    (double hashing).
+
+    Args:
+        capacity (int): The number of items the filter is sized for.
+        error_rate (float): The false positive rate at capacity, e.g. `1e-6`.
+
+    Attributes:
+        size (int): The number of bits of the filter.
+        hashes (int): The number of bits set per item.
+        count (int): The number of items added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, item: str) -> list[int]:
+        """
+        Return the bits of an item.
+
+        Args:
+            item (str): The item.
+
+        Returns:
+            list[int]: The positions of its bits.
+        """
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+    def add(self, item: str) -> None:
+        """
+        Add an item.
+
+        Args:
+            item (str): The item.
+        """
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(item))
+
+
+class RotatingBloomFilter:
+    """
+    A Bloom filter forgetting its items after a while, made of two generations of filters.
+
+    Items are added to the current generation, and looked up in both. Once the current generation is `lifetime`
+    old, or full, it becomes the previous one and a new one starts, so an item is remembered for at least
+    `lifetime` and at most twice that.
+
+    Args:
+        capacity (int): The number of items each generation is sized for.
+        error_rate (float): The false positive rate of each generation at capacity.
+        lifetime (float): How long a generation takes items, in seconds.
+        clock (Callable, optional): The clock timing generations, in seconds.
+
+    Attributes:
+        rejected (int): The number of lookups that found their item.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        lifetime: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.lifetime = lifetime
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._current = BloomFilter(capacity, error_rate)
+        self._previous = None
+        self._started_at = clock()
+        self.rejected = 0
+
+    def _rotate(self) -> None:
+        """Start a new generation if the current one is old or full. The caller holds the lock."""
+        if self.clock() - self._started_at >= self.lifetime or self._current.count >= self.capacity:
+            expired = self.clock() - self._started_at >= 2 * self.lifetime
+            self._previous = None if expired else self._current
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._started_at = self.clock()
+
+    def add(self, item: str) -> None:
+        """
+        Add an item.
+
+        Args:
+            item (str): The item.
+        """
+        with self._lock:
+            self._rotate()
+            self._current.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        with self._lock:
+            self._rotate()
+            found = item in self._current or (self._previous is not None and item in self._previous)
+            if found:
+                self.rejected += 1
+            return found
+
+    def stats(self) -> dict:
+        """
+        Summarize the filter.
+
+        Returns:
+            dict: The items in the current generation, its size in bytes and the lookups that found their item.
+        """
+        with self._lock:
+            return {"items": self._current.count, "bytes": len(self._current.bits), "rejected": self.rejected}
@@ -0,0 +1,232 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator
+from urllib.parse import urlsplit
+
+from app.settings import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_failure(error: BaseException) -> bool:
+    """
+    Tell whether an error raised by an upstream call means the upstream is unhealthy.
+
+    Client errors such as 404 are the upstream answering correctly and do not count; throttling (429),
+    server errors, timeouts and connection errors do.
+
+    Args:
+        error (BaseException): The error raised by the call.
+
+    Returns:
+        bool: True if the error counts as a failure.
+    """
+    status_code = getattr(error, "status_code", None)
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker tripping on the failure rate or slow call rate of a rolling window of calls.
+
+    While closed, calls go through and their outcomes are recorded. Once the window holds at least
+    `min_calls` calls and either rate reaches its threshold, the breaker opens and rejects every call
+    for `open_duration` seconds. It then turns half-open and lets `probes` calls through: if they all
+    succeed quickly it closes again, otherwise it re-opens.
+
+    Args:
+        window (float): The length of the rolling window, in seconds.
+        min_calls (int): The number of calls in the window needed before the breaker can trip.
+        failure_rate (float): The share of failed calls that trips the breaker.
+        slow_call_duration (float): The duration, in seconds, above which a call is slow.
+        slow_call_rate (float): The share of slow calls that trips the breaker.
+        open_duration (float): How long the breaker stays open before probing, in seconds.
+        probes (int): The number of half-open probe calls, all of which must succeed to close.
+        clock (Callable, optional): The monotonic clock used to time calls.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_duration: float,
+        slow_call_rate: float,
+        open_duration: float,
+        probes: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate = slow_call_rate
+        self.open_duration = open_duration
+        self.probes = probes
+        self.clock = clock
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.probes_succeeded = 0
+        self.rejected = 0
+        self._calls: deque[tuple[float, bool, bool]] = deque()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Tell whether a call may go through, turning the breaker half-open once it has been open long enough.
+
+        Returns:
+            bool: True if the call may go through; it must then be recorded with `record`.
+        """
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.open_duration:
+                self.state, self.probes_in_flight, self.probes_succeeded = HALF_OPEN, 0, 0
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and self.probes_in_flight + self.probes_succeeded < self.probes:
+                self.probes_in_flight += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, failed: bool, duration: float) -> None:
+        """
+        Record the outcome of a call that was allowed through.
+
+        Args:
+            failed (bool): Whether the call failed.
+            duration (float): How long the call took, in seconds.
+        """
+        slow = duration >= self.slow_call_duration
+        with self._lock:
+            now = self.clock()
+            if self.state == HALF_OPEN:
+                self.probes_in_flight = max(self.probes_in_flight - 1, 0)
+                if failed or slow:
+                    self._open(now)
+                else:
+                    self.probes_succeeded += 1
+                    if self.probes_succeeded >= self.probes:
+                        self.state = CLOSED
+                return
+            if self.state == OPEN:
+                return
+            self._calls.append((now, failed, slow))
+            while self._calls and self._calls[0][0] <= now - self.window:
+                self._calls.popleft()
+            calls = len(self._calls)
+            if calls < self.min_calls:
+                return
+            failures = sum(1 for _, f, _ in self._calls if f)
+            slow_calls = sum(1 for _, _, s in self._calls if s)
+            if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        """Open the breaker, forgetting the calls recorded so far."""
+        self.state = OPEN
+        self.opened_at = now
+        self._calls.clear()
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """
+        Time the enclosed call and record its outcome, a failure being any error `is_failure` accepts.
+
+        Yields:
+            None
+        """
+        start = self.clock()
+        try:
+            yield
+        except BaseException as e:
+            self.record(failed=is_failure(e), duration=self.clock() - start)
+            raise
+        self.record(failed=False, duration=self.clock() - start)
+
+    def stats(self) -> dict:
+        """
+        Summarize the state of the breaker.
+
+        Returns:
+            dict: The state, the number of calls, failures and slow calls in the window, and the number
+                of rejected calls.
+        """
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.open_duration:
+                state = HALF_OPEN
+            else:
+                state = self.state
+            return {
+                "state": state,
+                "calls": len(self._calls),
+                "failures": sum(1 for _, f, _ in self._calls if f),
+                "slowCalls": sum(1 for _, _, s in self._calls if s),
+                "rejected": self.rejected,
+            }
+
+
+class CircuitBreakers:
+    """A registry of circuit breakers, one per upstream host and URL family (HTML pages or `ceapi` JSON)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    @staticmethod
+    def key(url: str) -> str:
+        """
+        Build the breaker key of a URL.
+
+        Args:
+            url (str): The upstream URL.
+
+        Returns:
+            str: The host and URL family, such as `www.transfermarkt.com/ceapi`.
+        """
+        parts = urlsplit(url)
+        family = "ceapi" if parts.path.startswith("/ceapi/") else "html"
+        return f"{parts.hostname}/{family}"
+
+    def get(self, url: str) -> CircuitBreaker:
+        """
+        Return the breaker guarding a URL.
+
+        Args:
+            url (str): The upstream URL.
+
+        Returns:
+            CircuitBreaker: The breaker, created on first use.
+        """
+        key = self.key(url)
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(
+                    window=settings.HTTP_BREAKER_WINDOW,
+                    min_calls=settings.HTTP_BREAKER_MIN_CALLS,
+                    failure_rate=settings.HTTP_BREAKER_FAILURE_RATE,
+                    slow_call_duration=settings.HTTP_BREAKER_SLOW_CALL_DURATION,
+                    slow_call_rate=settings.HTTP_BREAKER_SLOW_CALL_RATE,
+                    open_duration=settings.HTTP_BREAKER_OPEN_DURATION,
+                    probes=settings.HTTP_BREAKER_PROBES,
+                )
+            return self._breakers[key]
+
+    def stats(self) -> dict:
+        """
+        Summarize the state of every breaker.
+
+        Returns:
+            dict: The state of each breaker, keyed by host and URL family.
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.stats() for key, breaker in breakers.items()}
+
+
+circuit_breakers = CircuitBreakers()
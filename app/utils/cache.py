@@ -0,0 +1,341 @@
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Hashable, Optional
+
+from app.settings import settings
+from app.utils.bloom import RotatingBloomFilter
+
+
+@dataclass
+class CachedResult:
+    """
+    A serialized service result kept by the result cache.
+
+    Attributes:
+        content (bytes): The JSON body of the response.
+        fetched_at (datetime): When the upstream pages the result was parsed from were fetched.
+        expires_at (float): When the result turns stale, on the cache's clock.
+        stale_until (float): When the result is dropped, at the end of its grace window, on the cache's clock.
+        delta (float): How long the result took to build, in seconds, which weighs its early refresh.
+        refreshing (bool): Whether a refresh of the result is in progress.
+    """
+
+    content: bytes
+    fetched_at: datetime
+    expires_at: float
+    stale_until: float
+    delta: float = 0.0
+    refreshing: bool = False
+
+    def age(self, now: datetime) -> int:
+        """
+        Count the seconds since the result was fetched, for the `Age` header.
+
+        Args:
+            now (datetime): The current time.
+
+        Returns:
+            int: The age of the result in whole seconds.
+        """
+        return max(0, int((now - self.fetched_at).total_seconds()))
+
+
+class ResultCache:
+    """
+    A bounded LRU cache of serialized service results, each expiring after its own TTL.
+
+    The cache is bounded by the total size of the bodies it keeps: the least recently used results are evicted
+    once it grows past `max_bytes`, and a body larger than that is not kept at all.
+
+    Past its TTL a result turns stale but is kept for its grace window, so it can still be served while it is
+    refreshed (stale-while-revalidate). A fresh result may also be refreshed early, with a probability rising as it
+    nears expiry and with the time it took to build (the XFetch algorithm), so hot results built at the same time do
+    not all expire, and get rebuilt, at once.
+
+    Args:
+        max_bytes (int): The maximum total size of the kept bodies. Zero disables the cache.
+        beta (float, optional): How eagerly results are refreshed before they expire. Zero never does.
+        clock (Callable, optional): The clock timing expiries, in seconds.
+        random (Callable, optional): The source of random numbers in [0, 1) drawing early refreshes.
+
+    Attributes:
+        hits (int): The number of lookups answered from the cache with a fresh result.
+        stale_hits (int): The number of lookups answered from the cache with a stale result.
+        misses (int): The number of lookups that found nothing, or an expired result.
+        evictions (int): The number of results dropped to make room for others.
+        refreshes (int): The number of refreshes claimed, see `claim_refresh`.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        beta: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        random: Callable[[], float] = random.random,
+    ):
+        self.max_bytes = max_bytes
+        self.beta = beta
+        self.clock = clock
+        self.random = random
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, CachedResult] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResult]:
+        """
+        Return the result kept for a key, fresh or stale, marking it as recently used.
+
+        Args:
+            key (Hashable): The key of the result, see `result_key`.
+
+        Returns:
+            Optional[CachedResult]: The result, or None if none is kept or its grace window ended.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            now = self.clock()
+            if entry is not None and entry.stale_until <= now:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= now:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(
+        self,
+        key: Hashable,
+        content: bytes,
+        ttl: float,
+        fetched_at: datetime,
+        grace: float = 0.0,
+        delta: float = 0.0,
+    ) -> Optional[CachedResult]:
+        """
+        Keep a result for a key, evicting the least recently used ones as needed.
+
+        Args:
+            key (Hashable): The key of the result, see `result_key`.
+            content (bytes): The JSON body of the response.
+            ttl (float): How long the result stays fresh, in seconds. It may be negative for a result read back
+                stale from another cache.
+            fetched_at (datetime): When the upstream pages the result was parsed from were fetched.
+            grace (float, optional): How long the result is kept past its TTL, stale, in seconds.
+            delta (float, optional): How long the result took to build, in seconds.
+
+        Returns:
+            Optional[CachedResult]: The kept result, or None if it is too large or its grace window already ended.
+        """
+        if ttl + max(grace, 0.0) <= 0 or len(content) > self.max_bytes:
+            return None
+        with self._lock:
+            self._remove(key)
+            now = self.clock()
+            entry = self._entries[key] = CachedResult(
+                content=content,
+                fetched_at=fetched_at,
+                expires_at=now + ttl,
+                stale_until=now + ttl + max(grace, 0.0),
+                delta=delta,
+            )
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            return entry
+
+    def is_stale(self, entry: CachedResult) -> bool:
+        """
+        Tell whether a result is past its TTL.
+
+        Args:
+            entry (CachedResult): The result.
+
+        Returns:
+            bool: Whether the result is stale.
+        """
+        return entry.expires_at <= self.clock()
+
+    def needs_refresh(self, entry: CachedResult) -> bool:
+        """
+        Tell whether a result should be refreshed: if it is stale, or if it is drawn for an early refresh.
+
+        A fresh result is drawn when `now - delta * beta * log(random()) >= expires_at`, so the closer it is to
+        expiry, and the longer it takes to build, the likelier it is refreshed ahead of time.
+
+        Args:
+            entry (CachedResult): The result.
+
+        Returns:
+            bool: Whether to refresh the result.
+        """
+        now = self.clock()
+        if entry.expires_at <= now:
+            return True
+        if not (entry.delta and self.beta):
+            return False
+        return now - entry.delta * self.beta * math.log(1.0 - self.random()) >= entry.expires_at
+
+    def claim_refresh(self, entry: CachedResult) -> bool:
+        """
+        Claim the refresh of a result, so concurrent requests do not all refresh it.
+
+        Args:
+            entry (CachedResult): The result.
+
+        Returns:
+            bool: Whether the caller has to refresh the result, False if a refresh is already in progress.
+        """
+        with self._lock:
+            if entry.refreshing:
+                return False
+            entry.refreshing = True
+            self.refreshes += 1
+            return True
+
+    def release_refresh(self, entry: CachedResult) -> None:
+        """
+        Release the claim on the refresh of a result that failed, so a later request can try again.
+
+        Args:
+            entry (CachedResult): The result.
+        """
+        with self._lock:
+            entry.refreshing = False
+
+    def _remove(self, key: Hashable) -> None:
+        """Drop the result kept for a key, if any. The caller holds the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.content)
+
+    def clear(self) -> None:
+        """Drop every result."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        """
+        Summarize the cache counters.
+
+        Returns:
+            dict: The number of kept results and their size, fresh and stale hits, misses, evictions and refreshes.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "staleHits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "refreshes": self.refreshes,
+            }
+
+
+class NotFoundCache:
+    """
+    A bounded LRU cache of the not found (404) outcomes of service calls, each expiring after a short TTL.
+
+    Args:
+        max_entries (int): The maximum number of outcomes kept. Zero disables the cache.
+        clock (Callable, optional): The clock timing expiries, in seconds.
+
+    Attributes:
+        hits (int): The number of requests answered with a kept outcome.
+    """
+
+    def __init__(self, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[str, float]] = OrderedDict()
+        self.hits = 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """
+        Return the detail of the not found outcome kept for a key.
+
+        Args:
+            key (Hashable): The key of the service call, see `result_key`.
+
+        Returns:
+            Optional[str]: The detail of the 404 error, or None if none is kept or it expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            detail, expires_at = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return detail
+
+    def set(self, key: Hashable, detail: str, ttl: float) -> None:
+        """
+        Keep the not found outcome of a service call.
+
+        Args:
+            key (Hashable): The key of the service call, see `result_key`.
+            detail (str): The detail of the 404 error.
+            ttl (float): How long the outcome is kept, in seconds. Zero or less keeps nothing.
+        """
+        if ttl <= 0 or not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = (detail, self.clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """
+        Summarize the cache counters.
+
+        Returns:
+            dict: The number of kept outcomes and the requests they answered.
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits}
+
+
+def result_key(service: str, **kwargs) -> tuple:
+    """
+    Build the cache key of the result of a service called with some arguments.
+
+    Args:
+        service (str): The name of the service class, e.g. `TransfermarktPlayerProfile`.
+        **kwargs: The arguments the service is instantiated with.
+
+    Returns:
+        tuple: The key.
+    """
+    return (service, *sorted(kwargs.items()))
+
+
+result_cache = ResultCache(max_bytes=settings.CACHE_MAX_BYTES, beta=settings.CACHE_EARLY_REFRESH_BETA)
+not_found_cache = NotFoundCache(max_entries=settings.CACHE_NOT_FOUND_MAX_ENTRIES)
+invalid_ids = RotatingBloomFilter(
+    capacity=settings.INVALID_IDS_CAPACITY,
+    error_rate=settings.INVALID_IDS_ERROR_RATE,
+    lifetime=settings.INVALID_IDS_LIFETIME,
+)
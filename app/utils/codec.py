@@ -0,0 +1,60 @@
+import json
+from typing import Any, Union
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # e.g. a platform without an orjson wheel, see `loads` and `dumps`
+    orjson = None
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document, such as a `ceapi` payload, with orjson if it is installed and the stdlib otherwise.
+
+    Args:
+        content (Union[bytes, str]): The document, as UTF-8 bytes or text.
+
+    Returns:
+        Any: The decoded document.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode a JSON-compatible value into compact UTF-8 JSON, with orjson if it is installed and the stdlib otherwise.
+
+    Both paths output the same bytes as Starlette's `JSONResponse`: no whitespace and non-ASCII characters left as
+    they are.
+
+    Args:
+        content (Any): The value, e.g. a response already serialized by FastAPI.
+
+    Returns:
+        bytes: The encoded value.
+
+    Raises:
+        TypeError: If the value holds something that is not JSON-compatible.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    A JSON response encoded with `dumps`, the default response class of the API.
+
+    Unlike FastAPI's `ORJSONResponse`, it falls back to the stdlib encoder when orjson is not installed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Encode the response content."""
+        return dumps(content)
@@ -0,0 +1,136 @@
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Optional, Union
+
+from dateutil import parser
+
+MONTHS = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
+# The date formats Transfermarkt writes, e.g. `Jun 30, 2028`, and the ISO dates of the `ceapi` payloads
+DATE_FORMATS = (
+    re.compile(r"(?P<month>[A-Z][a-z]{2}) (?P<day>\d{1,2}), (?P<year>\d{4})"),
+    re.compile(r"(?P<year>\d{4})-(?P<month>\d{2})-(?P<day>\d{2})"),
+)
+# A money value or a number, e.g. `€1.50m`, `+€500k`, `€-86.40m`, `&#8364;2.00bn` or `1.234'`
+MONEY = re.compile(
+    r"\s*\+?(?:€|&#8364;)?\+?(?P<number>-?\d+(?:\.\d+)?)(?P<unit>bn|[kmb])?'?\s*",
+    re.IGNORECASE,
+)
+UNITS = {None: 1, "k": 1_000, "m": 1_000_000, "b": 1_000_000_000, "bn": 1_000_000_000}
+
+
+@lru_cache(maxsize=4096)
+def parse_known_date(text: str) -> Optional[date]:
+    """
+    Parse a date written in one of the `DATE_FORMATS`, memoizing the result.
+
+    Args:
+        text (str): The date, e.g. `Jun 30, 2028`.
+
+    Returns:
+        Optional[date]: The date, or None if the text is in none of the formats or is not a valid date.
+    """
+    for date_format in DATE_FORMATS:
+        match = date_format.fullmatch(text)
+        if match is None:
+            continue
+        month = match["month"]
+        try:
+            return date(int(match["year"]), MONTHS[month] if month in MONTHS else int(month), int(match["day"]))
+        except (KeyError, ValueError):
+            return None
+    return None
+
+
+def parse_date(text: Union[str, date, None]) -> Optional[date]:
+    """
+    Parse a date read from Transfermarkt.
+
+    The formats Transfermarkt writes are parsed directly and memoized, as the same dates repeat across the rows of
+    a response. Any other text holding a digit falls back to dateutil. Text without a digit, such as `-`, is not a
+    date.
+
+    Args:
+        text (Union[str, date, None]): The date, e.g. `Jun 30, 2028`, or a date already parsed.
+
+    Returns:
+        Optional[date]: The date, or None if the text is empty or is not a date.
+    """
+    if isinstance(text, date):
+        return text
+    if not text:
+        return None
+    known = parse_known_date(text)
+    if known is not None:
+        return known
+    if not any(char.isdigit() for char in text):
+        return None
+    try:
+        return parser.parse(text).date()
+    except (parser.ParserError, OverflowError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parse_money(text: str) -> Optional[int]:
+    """
+    Parse a money value or a number read from Transfermarkt, memoizing the result.
+
+    The usual forms, such as `€1.50m`, `€500k`, `€1.34bn`, `+€2.00m` or `25`, are read in a single match. Any other
+    text holding a digit is read as before: the currency sign, plus signs and apostrophes are dropped and a `k`, `m`
+    or `b` anywhere scales the number.
+
+    Args:
+        text (str): The value, e.g. `€1.50m`.
+
+    Returns:
+        Optional[int]: The value in units, e.g. 1500000, or None if the text holds no digit.
+
+    Raises:
+        ValueError: If the text holds a digit but is not a number.
+    """
+    match = MONEY.fullmatch(text)
+    if match is not None:
+        unit = match["unit"]
+        return int(float(match["number"]) * UNITS[unit.lower() if unit else None])
+
+    if not any(char.isdigit() for char in text):
+        return None
+    value = text.lower().replace("€", "").replace("+", "").replace("'", "").strip()
+    for unit in ("k", "m", "b"):
+        if unit in value:
+            return int(float(value.replace(unit, "")) * UNITS[unit])
+    return int(float(value))
+
+
+def parse_number(value: Union[str, int, None]) -> Optional[int]:
+    """
+    Parse a number or money value field, see `parse_money`.
+
+    Args:
+        value (Union[str, int, None]): The value, as read from Transfermarkt or already parsed.
+
+    Returns:
+        Optional[int]: The value in units, or None if it is empty or holds no digit.
+
+    Raises:
+        ValueError: If the value holds a digit but is not a number.
+    """
+    if isinstance(value, int):
+        return value
+    if not value:
+        return None
+    return parse_money(value)
@@ -0,0 +1,123 @@
+from typing import Any, Iterable, Optional
+
+from lxml import etree
+
+from app.utils.xpath import evaluate
+
+
+def evaluate_node(node: Any, xpath: str) -> list:
+    """
+    Evaluate a selector against an lxml element, or against an element of another parser backend.
+
+    Args:
+        node (Any): The element, an lxml element or one answering the selectors through its own `evaluate`, e.g. a
+            `LexborElement`.
+        xpath (str): The selector.
+
+    Returns:
+        list: The matching elements, strings or attribute values.
+    """
+    if isinstance(node, etree._Element):
+        return evaluate(node, xpath)
+    return node.evaluate(xpath)
+
+
+class Extraction:
+    """
+    The fields extracted by an `ExtractionPlan` for one row, or for the whole context of a plan without rows.
+
+    Pass it as the section of `get_text_by_xpath` and `get_list_by_xpath`, or query it directly with `evaluate`:
+    the selectors declared by the plan are answered from the extracted results, and any other selector is
+    evaluated against the row.
+
+    Args:
+        node (etree.ElementBase): The row element.
+        results (dict[str, list]): The result of each declared selector.
+        children (dict[ExtractionPlan, list[Extraction]]): The rows of the nested plans found in the row.
+    """
+
+    def __init__(
+        self,
+        node: etree.ElementBase,
+        results: dict[str, list],
+        children: dict["ExtractionPlan", list["Extraction"]],
+    ) -> None:
+        """Hold the results extracted for the row."""
+        self.node = node
+        self.results = results
+        self.children = children
+
+    def evaluate(self, xpath: str) -> list:
+        """
+        Evaluate an XPath expression against the row, answering the declared selectors from the extracted results.
+
+        Args:
+            xpath (str): The XPath expression to evaluate.
+
+        Returns:
+            list: The same result as evaluating the expression against the row.
+        """
+        if xpath in self.results:
+            return self.results[xpath]
+        return evaluate_node(self.node, xpath)
+
+    def extract(self, plan: "ExtractionPlan") -> list["Extraction"]:
+        """
+        Extract the rows of a plan nested in this row's plan, or of any other plan relative to the row.
+
+        Args:
+            plan (ExtractionPlan): The plan to extract.
+
+        Returns:
+            list[Extraction]: The rows of the plan found in the row.
+        """
+        if plan in self.children:
+            return self.children[plan]
+        return plan.extract(self.node)
+
+
+class ExtractionPlan:
+    """
+    The rows a service reads from a page and the fields it reads from each row.
+
+    The rows are selected once, then every field selector is evaluated against each row through its compiled form,
+    and the nested plans are extracted from each row the same way.
+
+    Args:
+        fields (Iterable[str]): The selectors of the fields, relative to each row.
+        rows (str, optional): The selector of the rows, relative to the context. Default is no rows, the context
+            itself being the only row.
+        plans (Iterable[ExtractionPlan], optional): Plans extracting nested rows from each row.
+    """
+
+    def __init__(
+        self,
+        fields: Iterable[str],
+        rows: Optional[str] = None,
+        plans: Iterable["ExtractionPlan"] = (),
+    ) -> None:
+        """Hold the selectors of the plan."""
+        self.rows = rows
+        self.fields = tuple(dict.fromkeys(fields))
+        self.plans = tuple(plans)
+
+    def extract(self, context: Any) -> list[Extraction]:
+        """
+        Extract the declared fields of every row under a context.
+
+        Args:
+            context (Any): The page or the page section to extract the rows from.
+
+        Returns:
+            list[Extraction]: The extracted rows in document order, or the context itself as the only row if the
+                plan has no rows.
+        """
+        rows = [context] if self.rows is None else evaluate_node(context, self.rows)
+        return [
+            Extraction(
+                row,
+                {xpath: evaluate_node(row, xpath) for xpath in self.fields},
+                {plan: plan.extract(row) for plan in self.plans},
+            )
+            for row in rows
+        ]
@@ -0,0 +1,161 @@
+import codecs
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+from requests import RequestException, Response, Session
+from requests.adapters import HTTPAdapter
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS: dict = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/113.0.0.0 "
+        "Safari/537.36"
+    ),
+}
+
+
+def get_timeout() -> tuple[float, float]:
+    """
+    Return the (connect, read) timeout pair used for every upstream request.
+
+    Returns:
+        tuple[float, float]: The connect and read timeouts, in seconds.
+    """
+    return settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT
+
+
+def get_charset(content_type: Optional[str]) -> Optional[str]:
+    """
+    Return the charset declared by a `Content-Type` header.
+
+    Unlike requests, which assumes ISO-8859-1 for any text response without a charset, this returns None
+    in that case, so the HTML parser can pick the encoding up from the page's own `<meta>` tag.
+
+    Args:
+        content_type (str, optional): The header value.
+
+    Returns:
+        Optional[str]: The declared charset, or None if there is none or Python does not know it.
+    """
+    for param in (content_type or "").split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset":
+            charset = value.strip().strip("'\"")
+            try:
+                return codecs.lookup(charset).name
+            except LookupError:
+                return None
+    return None
+
+
+def build_session() -> Session:
+    """
+    Build a requests Session backed by keep-alive connection pools.
+
+    The pool sizes come from the settings: `HTTP_POOL_CONNECTIONS` is the number of per-host pools
+    kept around and `HTTP_POOL_MAXSIZE` is the number of connections each host pool keeps alive.
+
+    Returns:
+        Session: A new Session with the default headers and pooled adapters mounted.
+    """
+    session = Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@lru_cache(maxsize=None)
+def get_session() -> Session:
+    """
+    Return the process-wide pooled Session shared by every Transfermarkt service.
+
+    Returns:
+        Session: The shared Session, built on first use.
+    """
+    return build_session()
+
+
+@lru_cache(maxsize=None)
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide executor used to download secondary upstream resources in the background.
+
+    Returns:
+        ThreadPoolExecutor: The shared executor, built on first use.
+    """
+    return ThreadPoolExecutor(max_workers=settings.HTTP_PREFETCH_WORKERS, thread_name_prefix="prefetch")
+
+
+@lru_cache(maxsize=None)
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide non-blocking HTTP client used by the async service path.
+
+    The client keeps up to `HTTP_ASYNC_MAX_CONNECTIONS` connections open at once, so a single worker can
+    have hundreds of upstream requests in flight without tying up a thread for each of them.
+
+    Returns:
+        httpx.AsyncClient: The shared async client, built on first use.
+    """
+    return httpx.AsyncClient(
+        headers=DEFAULT_HEADERS,
+        timeout=httpx.Timeout(settings.HTTP_READ_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_ASYNC_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_POOL_MAXSIZE,
+        ),
+        follow_redirects=True,
+        max_redirects=30,
+    )
+
+
+async def close_async_client() -> None:
+    """Close the shared async client, if it was ever built, so the next call to get_async_client builds a new one."""
+    if get_async_client.cache_info().currsize:
+        await get_async_client().aclose()
+        get_async_client.cache_clear()
+
+
+def prewarm_connections(session: Session = None) -> None:
+    """
+    Open keep-alive connections to the upstream hosts so the first API calls skip DNS, TCP and TLS setup.
+
+    `HTTP_PREWARM_CONNECTIONS` requests are sent to each URL at once, at most `HTTP_POOL_MAXSIZE` since the pool
+    of a host keeps no more. Their responses are all held until the last one arrives, so every request opens its
+    own connection instead of reusing one another request just released, then the connections go back to the pool.
+
+    Failures are logged and ignored: pre-warming is an optimization and must never prevent startup.
+
+    Args:
+        session (Session, optional): The Session whose pools should be warmed. Defaults to the shared one.
+    """
+    session = session or get_session()
+    connections = min(settings.HTTP_PREWARM_CONNECTIONS, settings.HTTP_POOL_MAXSIZE)
+    urls = [url for url in settings.HTTP_PREWARM_URLS for _ in range(connections)]
+
+    def warm(url: str) -> Optional[Response]:
+        try:
+            return session.head(url, timeout=get_timeout(), allow_redirects=False, stream=True)
+        except RequestException as e:
+            logger.warning("Could not pre-warm connection to %s: %s", url, e)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(len(urls), 1)) as executor:
+        responses = list(executor.map(warm, urls))
+    for response in responses:
+        if response is not None:
+            # Reading the empty body releases the connection to the pool, closing the response would close it
+            response.content
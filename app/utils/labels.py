@@ -0,0 +1,169 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from lxml import etree
+
+from app.utils.xpath import evaluate
+
+LABEL_SELECTOR = re.compile(
+    r"^(?P<scope>\.?)//(?P<tag>\w+)\[(?:text\(\)='(?P<exact>[^']*)'|contains\(text\(\),\s*'(?P<contains>[^']*)'\))\]"
+    r"(?://following::(?P<value_tag>\w+)\[(?P<position>\d+)\])?(?P<rest>.*)$",
+)
+
+
+class LabelSelector(NamedTuple):
+    """
+    A label selector split into its parts.
+
+    Attributes:
+        relative (bool): Whether the selector is relative to the section (`.//`) instead of the document (`//`).
+        tag (str): The tag of the label element.
+        label (str): The label text.
+        exact (bool): Whether a text node of the label must equal the text (`text()=`) instead of its first text
+            node containing it (`contains(text(), ...)`).
+        value_tag (str): The tag of the value element following the label, if the selector has a `following::`
+            step.
+        position (int): The position of the value element among the following elements with its tag.
+        rest (str): The rest of the selector, relative to the label or value element.
+    """
+
+    relative: bool
+    tag: str
+    label: str
+    exact: bool
+    value_tag: Optional[str]
+    position: int
+    rest: str
+
+
+@lru_cache(maxsize=1024)
+def parse_label_selector(xpath: str) -> Optional[LabelSelector]:
+    """
+    Split a label selector into its parts.
+
+    Args:
+        xpath (str): The XPath expression to parse.
+
+    Returns:
+        Optional[LabelSelector]: The parts of the selector, or None if it is not a label selector.
+    """
+    match = LABEL_SELECTOR.match(xpath)
+    if match is None:
+        return None
+    return LabelSelector(
+        relative=bool(match["scope"]),
+        tag=match["tag"],
+        label=match["contains"] if match["exact"] is None else match["exact"],
+        exact=match["exact"] is not None,
+        value_tag=match["value_tag"],
+        position=int(match["position"] or 0),
+        rest=match["rest"],
+    )
+
+
+class LabelIndex:
+    """
+    Index of the labels of a page section, built in a single walk over the section.
+
+    Profile pages lay most of their data out as a label element followed by a value element, e.g.
+    `<span>Height:</span><span>1,78 m</span>`, and the selectors find them with one full scan per field. The index
+    collects the elements of the given tags in document order once and answers those label selectors from it:
+
+    - `.//tag[text()='Label']...` and `.//tag[contains(text(),'Label')]...` find the label in the index.
+    - `//following::value_tag[n]` takes the n-th value element after the label from the index.
+    - The rest of the selector is evaluated against the label or value element only.
+
+    Any other selector, and the rare cases the index cannot answer exactly (a label matched more than once, a
+    label with child elements before a `following::` axis, a value outside the section), is evaluated as a plain
+    XPath against the section, so the results are always the same. Results are memoized per selector.
+
+    Args:
+        section (etree.ElementBase): The section root, or the page root to index the whole page.
+        tags (tuple[str, ...]): The tags of the label and value elements to index.
+    """
+
+    def __init__(self, section: etree.ElementBase, tags: tuple[str, ...]) -> None:
+        """Walk the section once and index its elements of the given tags."""
+        self.section = section
+        self.tags = frozenset(tags)
+        self.nodes = [node for node in section.iter(*tags) if node is not section]
+        self.texts = [[text for text in [node.text, *(child.tail for child in node)] if text] for node in self.nodes]
+        self.exact: dict[tuple[str, str], list[int]] = {}
+        self.first: dict[str, list[tuple[int, str]]] = {}
+        for i, (node, texts) in enumerate(zip(self.nodes, self.texts)):
+            for text in texts:
+                self.exact.setdefault((node.tag, text), []).append(i)
+            if texts:
+                self.first.setdefault(node.tag, []).append((i, texts[0]))
+        self.results: dict[str, list] = {}
+
+    def evaluate(self, xpath: str) -> list:
+        """
+        Evaluate an XPath expression against the section, answering label selectors from the index.
+
+        Args:
+            xpath (str): The XPath expression to evaluate.
+
+        Returns:
+            list: The same result as evaluating the expression against the section.
+        """
+        if xpath not in self.results:
+            result = self.lookup(xpath)
+            self.results[xpath] = evaluate(self.section, xpath) if result is None else result
+        return self.results[xpath]
+
+    def lookup(self, xpath: str) -> Optional[list]:
+        """
+        Answer a label selector from the index.
+
+        Args:
+            xpath (str): The XPath expression to answer.
+
+        Returns:
+            Optional[list]: The result of the expression, or None if the index cannot answer it exactly.
+        """
+        selector = parse_label_selector(xpath)
+        if selector is None or selector.tag not in self.tags:
+            return None
+        if not selector.relative and self.section.getparent() is not None:
+            return None
+
+        if selector.exact:
+            labels = self.exact.get((selector.tag, selector.label), [])
+        else:
+            labels = [i for i, text in self.first.get(selector.tag, []) if selector.label in text]
+        if not labels:
+            return []
+        if len(labels) > 1:
+            return None
+
+        node = self.nodes[labels[0]]
+        if selector.value_tag is not None:
+            if selector.value_tag not in self.tags or len(node):
+                return None
+            node = self.following(labels[0], selector.value_tag, selector.position)
+            if node is None:
+                return None
+        if selector.rest == "//text()":
+            return list(node.itertext())
+        return evaluate(node, "self::node()" + selector.rest)
+
+    def following(self, label: int, tag: str, position: int) -> Optional[etree.ElementBase]:
+        """
+        Find the n-th element of a tag following a label in the section.
+
+        Args:
+            label (int): The index of the label element, which must have no child elements.
+            tag (str): The tag of the element to find.
+            position (int): The position of the element among the following ones with that tag, starting at 1.
+
+        Returns:
+            Optional[etree.ElementBase]: The element, or None if it is not in the section.
+        """
+        for node in self.nodes[label + 1 :]:
+            if node.tag == tag:
+                position -= 1
+                if not position:
+                    return node
+        return None
@@ -0,0 +1,217 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from contextvars import ContextVar
+from typing import Callable, NamedTuple, Optional
+
+from app.settings import settings
+
+# The header of a cache file: when its page was fetched, in seconds since the epoch
+HEADER = struct.Struct("<d")
+# While a cached result is refreshed, when the pages it was built from were fetched, in seconds since the epoch: the
+# page caches only serve pages fetched after it then, so the refresh does not rebuild the result from the same pages
+pages_fetched_after: ContextVar[float] = ContextVar("pages_fetched_after", default=0.0)
+
+
+class CachedPage(NamedTuple):
+    """
+    A body read from a page cache.
+
+    Attributes:
+        content (bytes): The body.
+        fetched_at (float): When the body was fetched from upstream, in seconds since the epoch.
+    """
+
+    content: bytes
+    fetched_at: float
+
+
+class DiskPageCache:
+    """
+    A size-bounded cache of upstream bodies on disk, shared by every worker process using the same directory.
+
+    Each body is kept in its own file, named after the hash of its URL and holding the time it was fetched followed
+    by the zlib-compressed body. Files are written to a temporary name and renamed into place, so a worker never
+    reads a partial file, and read through a memory map.
+
+    Once the files outgrow `max_bytes`, the least recently used are removed until they take up no more than
+    `LOW_WATER` of it, so a full cache does not list its directory on every write. Reads touch the modification
+    time of the files to mark them as used.
+
+    Args:
+        directory (str, optional): The directory of the cache files. None disables the cache.
+        max_bytes (int): The maximum total size of the cache files.
+        level (int, optional): The zlib compression level.
+        clock (Callable, optional): The wall clock timing the ages of the bodies, in seconds since the epoch, as
+            it is shared between processes.
+
+    Attributes:
+        hits (int): The number of bodies read from the cache by this process.
+        misses (int): The number of lookups that found nothing, or a body too old.
+        writes (int): The number of bodies written by this process.
+        evictions (int): The number of files removed by this process to make room for others.
+    """
+
+    LOW_WATER = 0.9
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        max_bytes: int,
+        level: int = 6,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.level = level
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache has a directory and room for something."""
+        return bool(self.directory) and self.max_bytes > 0
+
+    def path(self, url: str) -> str:
+        """
+        Return the path of the cache file of a URL.
+
+        Args:
+            url (str): The upstream URL.
+
+        Returns:
+            str: The path of the file.
+        """
+        return os.path.join(self.directory, hashlib.sha256(url.encode()).hexdigest())
+
+    def get(self, url: str, max_age: float) -> Optional[CachedPage]:
+        """
+        Return the body cached for a URL, unless it is older than `max_age`.
+
+        Args:
+            url (str): The upstream URL.
+            max_age (float): How old the body may be, in seconds.
+
+        Returns:
+            Optional[CachedPage]: The body and when it was fetched, or None if none is cached, it is too old or its
+                file is unreadable.
+        """
+        if not self.enabled or max_age <= 0:
+            return None
+        path = self.path(url)
+        content = None
+        try:
+            with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                (fetched_at,) = HEADER.unpack_from(mapped)
+                if self.clock() - fetched_at < max_age:
+                    with memoryview(mapped) as view, view[HEADER.size :] as compressed:
+                        content = zlib.decompress(compressed)
+            if content is not None:
+                os.utime(path)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, struct.error, zlib.error):
+            # An empty or corrupted file, dropped so it is fetched again
+            self._unlink(path)
+        with self._lock:
+            if content is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return None if content is None else CachedPage(content, fetched_at)
+
+    def set(self, url: str, content: bytes, fetched_at: Optional[float] = None) -> None:
+        """
+        Cache the body of a URL, replacing the one cached before.
+
+        Args:
+            url (str): The upstream URL.
+            content (bytes): The body.
+            fetched_at (float, optional): When the body was fetched, in seconds since the epoch. Defaults to now.
+        """
+        if not self.enabled:
+            return
+        fetched_at = self.clock() if fetched_at is None else fetched_at
+        data = HEADER.pack(fetched_at) + zlib.compress(content, self.level)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "wb") as file:
+                    file.write(data)
+                os.replace(temporary, self.path(url))
+            except BaseException:
+                self._unlink(temporary)
+                raise
+        except OSError:
+            return
+        with self._lock:
+            self.writes += 1
+            if self._size is not None:
+                self._size += len(data)
+        if self._size is None or self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used files until they take up no more than `LOW_WATER` of `max_bytes`."""
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(file_size for _, file_size, _ in files)
+        evicted = 0
+        if size > self.max_bytes:
+            for _, file_size, path in sorted(files):
+                if size <= self.max_bytes * self.LOW_WATER:
+                    break
+                self._unlink(path)
+                size -= file_size
+                evicted += 1
+        with self._lock:
+            self._size = size
+            self.evictions += evicted
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        """Remove a file, if another process did not remove it first."""
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> dict:
+        """
+        Summarize the cache counters of this process.
+
+        Returns:
+            dict: Whether the cache is enabled, the size of its files when last listed, hits, misses, writes and
+                evictions.
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+
+page_cache = DiskPageCache(directory=settings.PAGE_CACHE_DIR, max_bytes=settings.PAGE_CACHE_MAX_BYTES)
@@ -0,0 +1,532 @@
+import ast
+import inspect
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Iterable, NamedTuple, Optional
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from app.settings import settings
+from app.utils.pruning import BOILERPLATE, empty_boilerplate
+from app.utils.xpath import SELECTORS
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is optional, see `LexborParser`
+    LexborHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+ATTRIBUTE_PREDICATE = re.compile(r"^@(?P<name>[\w-]+)(?:\s*=\s*(?P<value>'[^']*'|\"[^\"]*\"))?$")
+FUNCTION_PREDICATE = re.compile(
+    r"^(?P<function>contains|starts-with)\(\s*@(?P<name>[\w-]+)\s*,\s*(?P<value>'[^']+'|\"[^\"]+\")\s*\)$",
+)
+POSITION_PREDICATE = re.compile(r"^[1-9]\d*$")
+CSS_OPERATORS = {None: "=", "contains": "*=", "starts-with": "^="}
+STEP = re.compile(r"^(?P<name>[\w-]+|\*)(?P<predicates>(?:\[.*\])?)$")
+TERMINAL_STEP = re.compile(r"^(?P<prefix>.+?)(?P<axis>//?)(?:(?P<text>text\(\))|@(?P<attribute>[\w-]+))$")
+
+
+class CssStep(NamedTuple):
+    """
+    A location step of an XPath selector, as a CSS compound selector.
+
+    Attributes:
+        descendants (bool): Whether the step selects among the descendants (`//`) instead of the children (`/`).
+        selector (str): The CSS compound selector matching the elements of the step, e.g. `td[class="hauptlink"]`.
+    """
+
+    descendants: bool
+    selector: str
+
+
+class CssSelector(NamedTuple):
+    """
+    An XPath selector translated into CSS steps walked one at a time, and a terminal step resolved in Python.
+
+    Attributes:
+        relative (bool): Whether the selector is relative to its context (`./`, `.//`) instead of the document.
+        steps (tuple[CssStep, ...]): The element steps.
+        descendants (bool): Whether the terminal step reads the descendants of the elements (`//`) instead of
+            the elements themselves (`/`).
+        text (bool): Whether the terminal step is `text()`.
+        attribute (str): The attribute read by the terminal step, if it is an `@attribute` step.
+    """
+
+    relative: bool
+    steps: tuple[CssStep, ...]
+    descendants: bool = False
+    text: bool = False
+    attribute: Optional[str] = None
+
+
+def split_top_level(xpath: str, separator: str) -> list[str]:
+    """
+    Split an XPath expression on a character appearing outside of predicates and string literals.
+
+    Args:
+        xpath (str): The expression, e.g. `.//td[@class='a/b']//a`.
+        separator (str): The character to split on, `/` for the steps of a path or `[` for the predicates of a
+            step.
+
+    Returns:
+        list[str]: The parts, e.g. `[".", "", "td[@class='a/b']", "", "a"]` for the steps of the example, an
+            empty step standing for the `descendant-or-self::node()` of a `//`.
+    """
+    parts, start, depth, quote = [], 0, 0, None
+    for i, char in enumerate(xpath):
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char == separator and not depth:
+            parts.append(xpath[start:i])
+            start = i + 1
+        if not quote and char == "[":
+            depth += 1
+        elif not quote and char == "]":
+            depth -= 1
+    return [*parts, xpath[start:]]
+
+
+def css_string(literal: str) -> str:
+    """
+    Convert an XPath string literal into a CSS string.
+
+    Args:
+        literal (str): The literal, quotes included.
+
+    Returns:
+        str: The CSS string, double quoted.
+    """
+    return '"{}"'.format(literal[1:-1].replace("\\", "\\\\").replace('"', '\\"'))
+
+
+def css_step(step: str) -> Optional[str]:
+    """
+    Translate an XPath location step into a CSS compound selector.
+
+    Only the name test, a leading position and attribute predicates are translated: `@a`, `@a='v'`,
+    `contains(@a, 'v')` and `starts-with(@a, 'v')`. A position after another predicate counts among the elements
+    passing it, which CSS cannot express.
+
+    Args:
+        step (str): The step, e.g. `td[3][@class='zentriert']`.
+
+    Returns:
+        Optional[str]: The CSS compound selector, e.g. `td:nth-of-type(3)[class="zentriert"]`, or None if the step
+            cannot be translated.
+    """
+    match = STEP.match(step)
+    if match is None:
+        return None
+    name = match["name"]
+    css = [name]
+    for i, predicate in enumerate(split_top_level(match["predicates"], "[")[1:]):
+        predicate = predicate[:-1].strip()
+        if POSITION_PREDICATE.match(predicate) and i == 0:
+            css.append(f":nth-child({predicate})" if name == "*" else f":nth-of-type({predicate})")
+            continue
+        attribute = ATTRIBUTE_PREDICATE.match(predicate) or FUNCTION_PREDICATE.match(predicate)
+        if attribute is None:
+            return None
+        if attribute["value"] is None:
+            css.append(f"[{attribute['name']}]")
+        else:
+            operator = CSS_OPERATORS[attribute.groupdict().get("function")]
+            css.append(f"[{attribute['name']}{operator}{css_string(attribute['value'])}]")
+    return "".join(css)
+
+
+@lru_cache(maxsize=1024)
+def translate_xpath(xpath: str) -> Optional[CssSelector]:
+    """
+    Translate an XPath selector into CSS steps, if it has a CSS equivalent.
+
+    Args:
+        xpath (str): The selector, e.g. `.//td[@class='hauptlink']//a/@href`.
+
+    Returns:
+        Optional[CssSelector]: The translated selector, or None if the selector uses anything but child and
+            descendant steps, translatable predicates (see `css_step`) and a terminal `text()` or `@attribute`
+            step.
+    """
+    terminal = TERMINAL_STEP.match(xpath)
+    prefix = xpath if terminal is None else terminal["prefix"]
+    if terminal is None and prefix == ".":
+        return None
+    if prefix != "." and (not prefix.startswith(("//", "./")) or prefix.endswith("/")):
+        return None
+    steps, descendants = [], False
+    for step in split_top_level(prefix, "/")[1:]:
+        if not step:
+            descendants = True
+            continue
+        selector = css_step(step)
+        if selector is None:
+            return None
+        steps.append(CssStep(descendants, selector))
+        descendants = False
+    if not steps and prefix != ".":
+        return None
+    if terminal is None:
+        return CssSelector(relative=prefix.startswith("."), steps=tuple(steps))
+    return CssSelector(
+        relative=prefix.startswith("."),
+        steps=tuple(steps),
+        descendants=terminal["axis"] == "//",
+        text=bool(terminal["text"]),
+        attribute=terminal["attribute"],
+    )
+
+
+class LexborElement:
+    """
+    An element of a page parsed with lexbor, answering the XPath selectors that have a CSS equivalent.
+
+    Pass it as the section of `get_text_by_xpath` and `get_list_by_xpath`, or query it directly with `evaluate`.
+
+    Args:
+        node (LexborNode): The element.
+        document (LexborHTMLParser): The parsed page, which selectors starting with `//` are evaluated against.
+    """
+
+    __slots__ = ("node", "document")
+
+    def __init__(self, node: Any, document: Any) -> None:
+        """Wrap the lexbor node."""
+        self.node = node
+        self.document = document
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the wrapped nodes."""
+        return isinstance(other, LexborElement) and other.node.mem_id == self.node.mem_id
+
+    def __hash__(self) -> int:
+        """Hash the wrapped node."""
+        return self.node.mem_id
+
+    def evaluate(self, xpath: str) -> list:
+        """
+        Evaluate an XPath selector against the element.
+
+        Args:
+            xpath (str): The selector, see `translate_xpath` for the supported ones.
+
+        Returns:
+            list: The matching elements, as LexborElement, or the strings or attribute values.
+
+        Raises:
+            ValueError: If the selector has no CSS equivalent.
+        """
+        selector = translate_xpath(xpath)
+        if selector is None:
+            raise ValueError(f"Selector not supported by the lexbor parser: {xpath}")
+        nodes = [self.node] if selector.relative else [self.document]
+        for step in selector.steps:
+            found, seen = [], set()
+            for node in nodes:
+                if step.descendants:
+                    matches = node.css(step.selector)
+                else:
+                    matches = (child for child in node.iter() if child.css_matches(step.selector))
+                for match in matches:
+                    if match.mem_id not in seen and match.mem_id != getattr(node, "mem_id", None):
+                        seen.add(match.mem_id)
+                        found.append(match)
+            nodes = found
+        if selector.text:
+            return self.texts(nodes, selector.descendants)
+        if selector.attribute is not None:
+            return self.attributes(nodes, selector.attribute, selector.descendants)
+        return [LexborElement(node, self.document) for node in nodes]
+
+    @staticmethod
+    def texts(nodes: list, descendants: bool) -> list[str]:
+        """
+        Read the text nodes of elements, as a terminal `text()` step.
+
+        Args:
+            nodes (list): The elements.
+            descendants (bool): Whether to read the text nodes of their descendants too.
+
+        Returns:
+            list[str]: The text of each text node, in document order.
+        """
+        texts, seen = [], set()
+        for node in nodes:
+            for child in node.traverse(include_text=True) if descendants else node.iter(include_text=True):
+                if child.tag == "-text" and child.mem_id not in seen:
+                    seen.add(child.mem_id)
+                    texts.append(child.text(deep=False))
+        return texts
+
+    @staticmethod
+    def attributes(nodes: list, name: str, descendants: bool) -> list[str]:
+        """
+        Read an attribute of elements, as a terminal `@attribute` step.
+
+        Args:
+            nodes (list): The elements.
+            name (str): The attribute name.
+            descendants (bool): Whether to read the attribute of their descendants too.
+
+        Returns:
+            list[str]: The attribute values, in document order.
+        """
+        values, seen = [], set()
+        for node in nodes:
+            for element in node.traverse() if descendants else (node,):
+                attributes = element.attributes
+                if name in attributes and element.mem_id not in seen:
+                    seen.add(element.mem_id)
+                    values.append(attributes[name] or "")
+        return values
+
+
+def split_unclosed_tag(data: bytes) -> tuple[bytes, bytes]:
+    """
+    Split off the end of some markup from its last `<` if no `>` follows it, e.g. a tag cut by a chunk boundary.
+
+    Args:
+        data (bytes): The markup.
+
+    Returns:
+        tuple[bytes, bytes]: The markup up to the unclosed tag, and the unclosed tag, empty if there is none.
+    """
+    start = data.rfind(b"<")
+    if start == -1 or data.find(b">", start) != -1:
+        return data, b""
+    return data[:start], data[start:]
+
+
+class LxmlParser:
+    """
+    Parses pages straight from bytes with lxml, the default backend.
+
+    Attributes:
+        NAME (str): The name of the backend in the settings.
+        STREAMING (bool): Whether pages can be parsed while they download, see `TransfermarktBase.STREAM_UNTIL`.
+        CHUNK_SIZE (int): The number of bytes fed to the parser at once.
+        available (bool): Whether the parser library is installed.
+    """
+
+    NAME = "lxml"
+    STREAMING = True
+    CHUNK_SIZE = 65536
+    available = True
+
+    @classmethod
+    def parse(cls, content: bytes, charset: Optional[str] = None) -> Optional[etree.ElementBase]:
+        """
+        Parse a page, emptying its scripts, styles and inline SVGs as they are parsed, see `parse_chunks`.
+
+        The content is fed to the parser in chunks, so the blocks emptied are freed before the end of the page is
+        parsed.
+
+        Args:
+            content (bytes): The page content.
+            charset (str, optional): The encoding of the content. If None, lxml detects it from the page.
+
+        Returns:
+            Optional[etree.ElementBase]: The root of the parsed page, None if it is empty.
+        """
+        chunks = (content[start : start + cls.CHUNK_SIZE] for start in range(0, len(content), cls.CHUNK_SIZE))
+        return cls.parse_chunks(chunks, charset)[1]
+
+    @staticmethod
+    def parse_chunks(
+        chunks: Iterable[bytes],
+        charset: Optional[str] = None,
+        until: tuple[str, ...] = (),
+    ) -> tuple[list[bytes], Optional[etree.ElementBase]]:
+        """
+        Parse a page chunk by chunk, emptying its scripts, styles and inline SVGs as they are parsed.
+
+        Downloaded and streamed pages both go through it, so they are parsed into the same tree, see
+        `empty_boilerplate` and `TransfermarktBase.parse_stream`.
+
+        Args:
+            chunks (Iterable[bytes]): The chunks of the page content.
+            charset (str, optional): The encoding of the content. If None, lxml detects it from the page.
+            until (tuple[str, ...], optional): The ids of the elements after which parsing stops, at the end of the
+                first chunk by which all of them were parsed. Default is to parse every chunk.
+
+        Returns:
+            tuple[list[bytes], Optional[etree.ElementBase]]: The chunks consumed and the root of the page parsed from
+                them, None if they were empty.
+        """
+        parser = etree.HTMLPullParser(events=("end",), tag=None if until else BOILERPLATE, encoding=charset)
+        pending = set(until)
+        consumed = []
+        cut = b""
+        for chunk in chunks:
+            consumed.append(chunk)
+            # Hold a tag cut by the end of the chunk back for the next feed, as libxml2 reads the halves of a
+            # `</script>` fed apart as script text, and the rest of the page with them
+            data, cut = split_unclosed_tag(cut + chunk)
+            parser.feed(data)
+            for _, element in parser.read_events():
+                pending.discard(element.get("id"))
+                if element.tag in BOILERPLATE:
+                    empty_boilerplate(element)
+            if until and not pending:
+                break
+        else:
+            parser.feed(cut)
+        try:
+            return consumed, parser.close()
+        except etree.XMLSyntaxError:
+            return consumed, None
+
+
+class SoupParser:
+    """
+    Parses pages with BeautifulSoup's `html.parser`, then with lxml from the markup it outputs.
+
+    Slower than `LxmlParser`, it is kept for services whose output depends on how `html.parser` repairs markup.
+
+    Attributes:
+        NAME (str): The name of the backend in the settings.
+        STREAMING (bool): Whether pages can be parsed while they download.
+        available (bool): Whether the parser library is installed.
+    """
+
+    NAME = "bs4"
+    STREAMING = False
+    available = True
+
+    @staticmethod
+    def parse(content: bytes, charset: Optional[str] = None) -> etree.ElementBase:
+        """
+        Parse a page.
+
+        Args:
+            content (bytes): The page content.
+            charset (str, optional): The encoding of the content. If None, BeautifulSoup detects it.
+
+        Returns:
+            etree.ElementBase: The root of the parsed page, None if it is empty.
+        """
+        return etree.HTML(str(BeautifulSoup(markup=content, features="html.parser", from_encoding=charset)))
+
+
+class LexborParser:
+    """
+    Parses pages with lexbor through selectolax.
+
+    The page answers the XPath selectors that have a CSS equivalent (see `translate_xpath`), so only services
+    reading their page through such selectors can use it, see `check_parser_backends`. No service declares it: it
+    is only used for the services the `PARSER_BACKENDS` setting sets to it. Requires the `lexbor` extra.
+
+    Attributes:
+        NAME (str): The name of the backend in the settings.
+        STREAMING (bool): Whether pages can be parsed while they download.
+        available (bool): Whether the parser library is installed.
+    """
+
+    NAME = "lexbor"
+    STREAMING = False
+    available = LexborHTMLParser is not None
+
+    @staticmethod
+    def parse(content: bytes, charset: Optional[str] = None) -> Optional[LexborElement]:
+        """
+        Parse a page.
+
+        Args:
+            content (bytes): The page content.
+            charset (str, optional): The encoding of the content. Defaults to UTF-8.
+
+        Returns:
+            Optional[LexborElement]: The root of the parsed page, None if it is empty.
+        """
+        document = LexborHTMLParser(content.decode(charset or "utf-8", errors="replace"))
+        return None if document.root is None else LexborElement(document.root, document)
+
+
+PARSERS = {parser.NAME: parser for parser in (LxmlParser, SoupParser, LexborParser)}
+
+
+def get_parser(service: str, default: str = LxmlParser.NAME) -> type:
+    """
+    Return the parser backend of a service.
+
+    The backend declared by the service can be overridden per service with the `PARSER_BACKENDS` setting, checked at
+    startup by `check_parser_backends`. A backend whose library is not installed falls back to lxml.
+
+    Args:
+        service (str): The name of the service class, e.g. `TransfermarktPlayerInjuries`.
+        default (str, optional): The backend declared by the service.
+
+    Returns:
+        type: The parser backend.
+    """
+    name = settings.PARSER_BACKENDS.get(service, default)
+    parser = PARSERS[name]
+    if not parser.available:
+        warn_unavailable(name, service)
+        return LxmlParser
+    return parser
+
+
+def service_selectors(service: type) -> dict[str, str]:
+    """
+    Return the selectors of `app.utils.xpath` a service reads, those its module and the modules of its bases name.
+
+    Args:
+        service (type): The service class.
+
+    Returns:
+        dict[str, str]: The XPath expressions by qualified name, e.g. "Players.Profile.NAME".
+    """
+    selectors = {}
+    for module in {inspect.getmodule(cls) for cls in service.__mro__ if cls is not object}:
+        for node in ast.walk(ast.parse(inspect.getsource(module))):
+            name = ast.unparse(node) if isinstance(node, ast.Attribute) else None
+            if name in SELECTORS:
+                selectors[name] = SELECTORS[name].path
+    return selectors
+
+
+def check_parser_backends(services: list[type]) -> None:
+    """
+    Check the parser backends of the services, as declared and as overridden by the `PARSER_BACKENDS` setting.
+
+    A service parsed with lexbor must only read selectors with a CSS equivalent, see `translate_xpath`, or every
+    request to it would fail.
+
+    Args:
+        services (list[type]): The service classes.
+
+    Raises:
+        ValueError: If the setting names an unknown service, if a backend is unknown, or if a service parsed with
+            lexbor reads a selector without CSS equivalent.
+    """
+    names = {service.__name__: service for service in services}
+    unknown = sorted(set(settings.PARSER_BACKENDS) - set(names))
+    if unknown:
+        raise ValueError(f"Unknown services in PARSER_BACKENDS: {', '.join(unknown)}")
+    for service in services:
+        name = settings.PARSER_BACKENDS.get(service.__name__, service.PARSER)
+        if name not in PARSERS:
+            raise ValueError(f"Unknown parser backend for {service.__name__}: {name}")
+        if name == LexborParser.NAME:
+            selectors = service_selectors(service)
+            unsupported = sorted(key for key, xpath in selectors.items() if translate_xpath(xpath) is None)
+            if unsupported:
+                raise ValueError(f"Selectors of {service.__name__} not supported by lexbor: {', '.join(unsupported)}")
+
+
+@lru_cache(maxsize=None)
+def warn_unavailable(name: str, service: str) -> None:
+    """
+    Warn once per service that its parser backend is not installed.
+
+    Args:
+        name (str): The name of the backend.
+        service (str): The name of the service class.
+    """
+    logger.warning("The %s parser backend of %s is not installed, using lxml", name, service)
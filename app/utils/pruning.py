@@ -0,0 +1,73 @@
+from typing import Optional
+
+from lxml import etree
+
+from app.utils.xpath import evaluate
+
+# The elements emptied as soon as they are parsed, see `empty_boilerplate`
+BOILERPLATE = ("script", "style", "svg")
+# The scripts read by a selector, see `Players.MarketValue.HIGHCHARTS`
+KEPT_SCRIPTS = ("Highcharts.Chart",)
+# The elements an inline SVG is drawn with
+SVG_TAGS = frozenset(
+    {"circle", "clippath", "defs", "ellipse", "g", "line", "lineargradient", "mask", "path", "pattern", "polygon"}
+    | {"polyline", "radialgradient", "rect", "stop", "symbol", "text", "title", "tspan", "use"},
+)
+
+
+def empty_boilerplate(element: etree.ElementBase, kept: tuple[str, ...] = KEPT_SCRIPTS) -> None:
+    """
+    Empty a script, style or inline SVG element once the parser has closed it, so its content is freed while the
+    rest of the page is parsed.
+
+    Inline scripts and styles make up most of the bytes of the live pages, and no selector reads them. The element
+    itself is kept, with its attributes and the text following it, so the text nodes around it stay split as they
+    were and every selector finds the same results. Scripts holding a `kept` marker are left whole, and so are SVGs
+    holding anything but SVG markup, e.g. a table the parser nested into an unclosed `<svg>`.
+
+    Args:
+        element (etree.ElementBase): The element, as closed by the parser.
+        kept (tuple[str, ...], optional): Markers of the scripts to keep whole, e.g. the Highcharts script.
+    """
+    if element.tag == "svg":
+        if any(isinstance(child.tag, str) and child.tag not in SVG_TAGS for child in element.iterdescendants()):
+            return
+    elif any(marker in (element.text or "") for marker in kept):
+        return
+    attributes = dict(element.attrib)
+    element.clear(keep_tail=True)
+    element.attrib.update(attributes)
+
+
+def prune_page(page: Optional[etree.ElementBase], regions: tuple[str, ...]) -> Optional[etree.ElementBase]:
+    """
+    Drop everything from a parsed page but its `<head>` and the regions a service reads.
+
+    Navigation, ads and footers are removed once the page is parsed, so the selectors walking the whole page skip
+    them and the page kept for revalidation holds less memory. Parsing still builds them: this does not make the
+    parse itself cheaper. The page is left whole unless every region is found, so a layout change cannot hide the
+    data the service reads.
+
+    Args:
+        page (etree.ElementBase, optional): The root of the parsed page, pruned in place.
+        regions (tuple[str, ...]): The XPath expressions of the roots of the regions to keep.
+
+    Returns:
+        Optional[etree.ElementBase]: The page.
+    """
+    if page is None or not regions:
+        return page
+    roots = set(page.findall("head"))
+    for region in regions:
+        found = evaluate(page, region)
+        if not found:
+            return page
+        roots.update(found)
+    ancestors = {ancestor for root in roots for ancestor in root.iterancestors()}
+    for ancestor in ancestors:
+        if ancestor in roots or any(element in roots for element in ancestor.iterancestors()):
+            continue
+        for child in list(ancestor):
+            if child not in roots and child not in ancestors:
+                ancestor.remove(child)
+    return page
@@ -0,0 +1,230 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from app.settings import settings
+
+RETRYABLE_STATUS_CODES: frozenset = frozenset({429, 500, 502, 503, 504})
+THROTTLING_STATUS_CODES: frozenset = frozenset({429, 503})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a `Retry-After` header, given either in seconds or as an HTTP date.
+
+    Args:
+        value (str, optional): The header value.
+
+    Returns:
+        Optional[float]: The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveTokenBucket:
+    """
+    A token bucket whose refill rate adapts to how much traffic the upstream host tolerates.
+
+    The rate grows additively while requests succeed and shrinks multiplicatively, at most once per
+    second, when the host throttles (429/503), so it settles just below the highest tolerated rate.
+    A `Retry-After` from the host blocks the bucket until that time.
+
+    Args:
+        rate (float): The initial refill rate, in requests per second.
+        min_rate (float): The lowest rate throttling can bring the bucket down to.
+        max_rate (float): The highest rate successes can bring the bucket up to.
+        burst (int): The maximum number of tokens the bucket holds.
+        clock (Callable, optional): The monotonic clock used to refill tokens.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self.last_decrease = float("-inf")
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Take a token, possibly borrowing it from the future.
+
+        Args:
+            max_wait (float): The longest acceptable wait, in seconds.
+
+        Returns:
+            Optional[float]: How long to wait before sending the request, or None, without taking a
+                token, if that would be longer than `max_wait`.
+        """
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = max((1 - self.tokens) / self.rate, self.blocked_until - now, 0.0)
+            if wait > max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+    def on_success(self) -> None:
+        """Increase the rate after a request the host served."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 1 / self.rate)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """
+        Decrease the rate after the host throttled a request.
+
+        Args:
+            retry_after (float, optional): The number of seconds the host asked to wait.
+        """
+        with self._lock:
+            now = self.clock()
+            self.throttled += 1
+            if now - self.last_decrease >= 1:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.last_decrease = now
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def stats(self) -> dict:
+        """
+        Summarize the state of the bucket.
+
+        Returns:
+            dict: The current rate, available tokens, seconds left blocked and throttled responses count.
+        """
+        with self._lock:
+            return {
+                "rate": round(self.rate, 3),
+                "tokens": round(self.tokens, 3),
+                "blockedFor": round(max(self.blocked_until - self.clock(), 0.0), 3),
+                "throttled": self.throttled,
+            }
+
+
+class RateLimiter:
+    """
+    Per-host adaptive rate limiting and retry policy for upstream requests.
+
+    Attributes:
+        retries (int): The number of retried attempts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: dict[str, AdaptiveTokenBucket] = {}
+        self.retries = 0
+
+    def bucket(self, url: str) -> AdaptiveTokenBucket:
+        """
+        Return the token bucket of the host of a URL.
+
+        Args:
+            url (str): The upstream URL.
+
+        Returns:
+            AdaptiveTokenBucket: The bucket, created on first use.
+        """
+        host = urlsplit(url).hostname
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = AdaptiveTokenBucket(
+                    rate=settings.HTTP_RATE_INITIAL,
+                    min_rate=settings.HTTP_RATE_MIN,
+                    max_rate=settings.HTTP_RATE_MAX,
+                    burst=settings.HTTP_RATE_BURST,
+                )
+            return self._buckets[host]
+
+    def acquire(self, url: str) -> Optional[float]:
+        """
+        Reserve a request slot on the host of a URL.
+
+        Args:
+            url (str): The upstream URL.
+
+        Returns:
+            Optional[float]: How long to wait before sending the request, or None if the host is
+                throttled for longer than `HTTP_RATE_MAX_WAIT` and the request should not be sent.
+        """
+        return self.bucket(url).reserve(max_wait=settings.HTTP_RATE_MAX_WAIT)
+
+    def record(
+        self,
+        url: str,
+        attempt: int,
+        status_code: Optional[int],
+        retry_after: Optional[str] = None,
+    ) -> Optional[float]:
+        """
+        Record the outcome of an attempt and decide whether to retry it.
+
+        Args:
+            url (str): The upstream URL.
+            attempt (int): The number of attempts already retried.
+            status_code (int, optional): The response status code, or None if the request failed
+                without a response (connection error or timeout).
+            retry_after (str, optional): The `Retry-After` header of the response.
+
+        Returns:
+            Optional[float]: The jittered exponential backoff to wait before retrying, or None if the
+                attempt should not be retried.
+        """
+        bucket = self.bucket(url)
+        delay = parse_retry_after(retry_after)
+        if status_code in THROTTLING_STATUS_CODES:
+            bucket.on_throttled(delay)
+        elif status_code is not None and status_code < 500:
+            bucket.on_success()
+        retryable = status_code is None or status_code in RETRYABLE_STATUS_CODES
+        if not retryable or attempt >= settings.HTTP_RETRY_ATTEMPTS:
+            return None
+        backoff = random.uniform(0, min(settings.HTTP_RETRY_BACKOFF_MAX, settings.HTTP_RETRY_BACKOFF_BASE * 2**attempt))
+        delay = max(backoff, delay or 0.0)
+        if delay > settings.HTTP_RATE_MAX_WAIT:
+            return None
+        with self._lock:
+            self.retries += 1
+        return delay
+
+    def stats(self) -> dict:
+        """
+        Summarize the state of every host bucket.
+
+        Returns:
+            dict: The number of retries and the state of the bucket of each host.
+        """
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {
+            "retries": self.retries,
+            "hosts": {host: bucket.stats() for host, bucket in buckets.items()},
+        }
+
+
+rate_limiter = RateLimiter()
@@ -1,6 +1,16 @@
-REGEX_DOB: str = r"^(?P<dob>.*)\s\((?P<age>\d*)\)"
-REGEX_MEMBERS_DATE: str = r"\(Score: (?P<date>.+)\)"
-REGEX_BG_COLOR: str = r"background-color:(?P<color>.+);"
-REGEX_CHART_CLUB_ID: str = r"(?P<club_id>\d+)"
-REGEX_COUNTRY_ID: str = r"(?P<id>\d)"
-REGEX_DOB_AGE: str = r"^(?P<dob>\w{3} \d{1,2}, \d{4}) \((?P<age>\d{2})\)"
+import re
+
+REGEX_DOB: re.Pattern = re.compile(r"^(?P<dob>.*)\s\((?P<age>\d*)\)")
+REGEX_MEMBERS_DATE: re.Pattern = re.compile(r"\(Score: (?P<date>.+)\)")
+REGEX_BG_COLOR: re.Pattern = re.compile(r"background-color:(?P<color>.+);")
+REGEX_CHART_CLUB_ID: re.Pattern = re.compile(r"(?P<club_id>\d+)")
+REGEX_COUNTRY_ID: re.Pattern = re.compile(r"(?P<id>\d)")
+REGEX_DOB_AGE: re.Pattern = re.compile(r"^(?P<dob>\w{3} \d{1,2}, \d{4}) \((?P<age>\d{2})\)")
+REGEX_TFMKT_URL: re.Pattern = re.compile(
+    r"/(?P<code>[\w%-]+)"
+    r"/(?P<category>[\w-]+)"
+    r"/(?P<type>[\w-]+)"
+    r"/(?P<id>\w+)"
+    r"(/saison_id/(?P<season_id>\d{4}))?"
+    r"(/transfer_id/(?P<transfer_id>\d+))?",
+)
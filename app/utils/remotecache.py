@@ -0,0 +1,242 @@
+import secrets
+import threading
+import time
+import zlib
+from typing import Any, Callable, Optional
+
+from redis import Redis, exceptions
+
+from app.settings import settings
+
+# Deletes a lock only if it still holds the token of its owner, so a lock that expired and was taken by another
+# instance is left alone
+UNLOCK_SCRIPT = 'if redis.call("get", KEYS[1]) == ARGV[1] then return redis.call("del", KEYS[1]) else return 0 end'
+
+
+def build_client(url: str, timeout: float) -> Redis:
+    """
+    Build the client of the remote cache server.
+
+    Args:
+        url (str): The server URL, `redis://[[user]:password@]host[:port][/db]`, or `rediss://` over TLS.
+        timeout (float): The connect and read timeout of every command, in seconds.
+
+    Returns:
+        Redis: The client, whose pool of connections is shared by threads.
+    """
+    return Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+
+
+class RemoteCache:
+    """
+    A cache of upstream pages and service results shared by every instance of the API, on a Redis-compatible server.
+
+    Values are compressed with zlib. The cache never fails a request: errors count as misses, and after a connection
+    error the server is left alone for `RETRY_AFTER` seconds, so an unreachable server does not add its timeout to
+    every request.
+
+    `get_or_lock` and `unlock` make a single-flight lock across instances: on a miss, one instance takes the lock of
+    the key and refreshes it, while the others wait for the value it stores.
+
+    Args:
+        client (Redis, optional): The client of the server, see `build_client`. None disables the cache.
+        prefix (str): The prefix of every key, to share a server with other applications.
+        lock_ttl (float): How long a lock is held at most, in seconds, if its owner never releases it.
+        lock_wait (float): How long to wait for another instance to store a value, in seconds.
+        max_waiters (int, optional): How many threads may wait for other instances at once. Waiting blocks a thread
+            of the shared threadpool, so the lookups beyond it do not wait. Default is 8.
+        poll (float, optional): How often to look for the value while waiting, in seconds.
+        clock (Callable, optional): The clock timing waits and retries, in seconds.
+
+    Attributes:
+        hits (int): The number of values read from the server.
+        misses (int): The number of lookups that found nothing.
+        locks (int): The number of locks taken, that is refreshes this instance was elected to make.
+        waits (int): The number of lookups that waited for another instance.
+        errors (int): The number of commands that failed.
+    """
+
+    RETRY_AFTER = 5.0
+
+    def __init__(
+        self,
+        client: Optional[Redis],
+        prefix: str,
+        lock_ttl: float,
+        lock_wait: float,
+        max_waiters: int = 8,
+        poll: float = 0.05,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+        self.max_waiters = max_waiters
+        self.poll = poll
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._down_until = 0.0
+        self._waiters = 0
+        self.hits = 0
+        self.misses = 0
+        self.locks = 0
+        self.waits = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache has a server."""
+        return self.client is not None
+
+    def execute(self, command: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Send a command to the server, unless it failed to connect shortly before.
+
+        Args:
+            command (str): The name of the client method sending the command, e.g. `get`.
+            *args: The arguments of the command.
+            **kwargs: The options of the command, e.g. `px=1000`.
+
+        Returns:
+            Any: The reply, or None if the cache is disabled or the command failed.
+        """
+        if self.client is None or self.clock() < self._down_until:
+            return None
+        try:
+            return getattr(self.client, command)(*args, **kwargs)
+        except (exceptions.ConnectionError, exceptions.TimeoutError):
+            with self._lock:
+                self.errors += 1
+                self._down_until = self.clock() + self.RETRY_AFTER
+        except exceptions.RedisError:
+            with self._lock:
+                self.errors += 1
+        return None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the value of a key.
+
+        Args:
+            key (str): The key, without the prefix, e.g. `page:<url>`.
+
+        Returns:
+            Optional[bytes]: The value, or None if there is none.
+        """
+        if not self.enabled:
+            return None
+        value = self.execute("get", self.prefix + key)
+        if value is not None:
+            try:
+                value = zlib.decompress(value)
+            except zlib.error:
+                value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """
+        Store the value of a key.
+
+        Args:
+            key (str): The key, without the prefix.
+            value (bytes): The value.
+            ttl (float): How long the value is kept, in seconds. Zero or less stores nothing.
+        """
+        if self.enabled and ttl > 0:
+            self.execute("set", self.prefix + key, zlib.compress(value, 1), px=int(ttl * 1000))
+
+    def get_or_lock(self, key: str) -> tuple[Optional[bytes], Optional[str]]:
+        """
+        Return the value of a key, or the lock to refresh it if it has none.
+
+        While another instance holds the lock, wait up to `lock_wait` for the value it stores, unless `max_waiters`
+        threads are waiting already. If the lock is released without a value, the next waiter takes it over. Callers
+        coalesce the lookups of a key within the instance, see `TransfermarktBase.send_request`.
+
+        Args:
+            key (str): The key, without the prefix.
+
+        Returns:
+            tuple[Optional[bytes], Optional[str]]: The value, or None and the token of the lock taken, to pass to
+                `unlock` once the value is stored. Both are None if the cache is disabled, failed, the wait timed
+                out or too many threads are waiting, in which case the caller refreshes the value without the lock.
+        """
+        if not self.enabled:
+            return None, None
+        token = secrets.token_hex(16)
+        deadline = self.clock() + self.lock_wait
+        waited = False
+        try:
+            while True:
+                value = self.get(key)
+                if value is not None:
+                    return value, None
+                locked = self.execute("set", f"{self.prefix}lock:{key}", token, nx=True, px=int(self.lock_ttl * 1000))
+                if locked is not None:
+                    # The value may have been stored between the lookup and the lock
+                    value = self.get(key)
+                    if value is not None:
+                        self.unlock(key, token)
+                        return value, None
+                    with self._lock:
+                        self.locks += 1
+                    return None, token
+                if self.clock() >= deadline or self.clock() < self._down_until:
+                    return None, None
+                if not waited:
+                    with self._lock:
+                        if self._waiters >= self.max_waiters:
+                            return None, None
+                        self._waiters += 1
+                        self.waits += 1
+                    waited = True
+                time.sleep(self.poll)
+        finally:
+            if waited:
+                with self._lock:
+                    self._waiters -= 1
+
+    def unlock(self, key: str, token: Optional[str]) -> None:
+        """
+        Release the lock of a key, if it is still held with the given token.
+
+        Args:
+            key (str): The key, without the prefix.
+            token (str, optional): The token `get_or_lock` returned. Nothing is done if it is None.
+        """
+        if token is not None:
+            self.execute("eval", UNLOCK_SCRIPT, 1, f"{self.prefix}lock:{key}", token)
+
+    def stats(self) -> dict:
+        """
+        Summarize the cache counters of this instance.
+
+        Returns:
+            dict: Whether the cache is enabled, hits, misses, locks taken, waits and errors.
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "locks": self.locks,
+                "waits": self.waits,
+                "errors": self.errors,
+            }
+
+
+remote_cache = RemoteCache(
+    client=(
+        build_client(settings.REMOTE_CACHE_URL, settings.REMOTE_CACHE_TIMEOUT) if settings.REMOTE_CACHE_URL else None
+    ),
+    prefix=settings.REMOTE_CACHE_PREFIX,
+    lock_ttl=settings.REMOTE_CACHE_LOCK_TTL,
+    lock_wait=settings.REMOTE_CACHE_LOCK_WAIT,
+    max_waiters=settings.REMOTE_CACHE_MAX_WAITERS,
+)
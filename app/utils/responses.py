@@ -0,0 +1,269 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter
+from starlette.responses import Response
+
+from app.services.base import UpstreamNotFoundError
+from app.settings import settings
+from app.utils.cache import CachedResult, invalid_ids, not_found_cache, result_cache, result_key
+from app.utils.pagecache import HEADER, pages_fetched_after
+from app.utils.remotecache import remote_cache
+
+logger = logging.getLogger(__name__)
+# The background refreshes in progress, referenced until they finish, see `service_response`
+refresh_tasks: set[asyncio.Task] = set()
+
+
+@lru_cache(maxsize=None)
+def get_adapter(schema: Any) -> TypeAdapter:
+    """
+    Return the type adapter of a response model, built once per model.
+
+    Args:
+        schema (Any): The response model, e.g. `ClubPlayers`.
+
+    Returns:
+        TypeAdapter: The adapter validating data into the model and dumping it to JSON.
+    """
+    return TypeAdapter(schema)
+
+
+def validate_model(schema: Any, data: Any) -> Any:
+    """
+    Validate the data of a response into its model with the cached type adapter.
+
+    Args:
+        schema (Any): The response model, e.g. `ClubPlayers`.
+        data (Any): The data, e.g. the dictionary built by a service.
+
+    Returns:
+        Any: The model.
+
+    Raises:
+        pydantic.ValidationError: If the data does not validate.
+    """
+    return get_adapter(schema).validate_python(data)
+
+
+def model_response(
+    schema: Any,
+    data: Any,
+    exclude_none: bool = False,
+    exclude_defaults: bool = False,
+) -> Response:
+    """
+    Validate the data of a response once and serialize it straight to JSON bytes.
+
+    FastAPI validates whatever an endpoint returns into its `response_model`, dumps it to Python objects and encodes
+    them again. A response built here goes out as it is, so the endpoints keep `response_model` for the docs only.
+    The bytes are the same as FastAPI would send.
+
+    Args:
+        schema (Any): The response model, e.g. `ClubPlayers`.
+        data (Any): The data, e.g. the dictionary built by a service, or the model already validated.
+        exclude_none (bool, optional): Whether to leave out the fields set to None. Default is False.
+        exclude_defaults (bool, optional): Whether to leave out the fields left to their default. Default is False.
+
+    Returns:
+        Response: The JSON response.
+
+    Raises:
+        pydantic.ValidationError: If the data does not validate.
+    """
+    adapter = get_adapter(schema)
+    model = data if isinstance(data, BaseModel) else validate_model(schema, data)
+    content = adapter.dump_json(
+        model,
+        by_alias=True,
+        exclude_none=exclude_none,
+        exclude_defaults=exclude_defaults,
+    )
+    return Response(content=content, media_type="application/json")
+
+
+async def build_result(
+    service: Any,
+    method: str,
+    schema: Any,
+    kwargs: dict,
+    options: dict,
+) -> Response:
+    """
+    Run a service, serialize its result and keep it in the result caches.
+
+    The `updatedAt` of the result is set to the time its pages were fetched, the oldest one's if some were read from
+    the page caches (see `TransfermarktBase.fetched_at`), and the result is cached for what is left of its TTL from
+    then. The time the whole build took is kept with it to weigh its early refresh, see `ResultCache.needs_refresh`.
+
+    A not found (404) outcome is kept for a short TTL instead. When upstream answers 404 for the main page of the
+    service (`UpstreamNotFoundError`), the id this proves invalid, if any (see `TransfermarktBase.invalid_id`), is
+    also added to the known-invalid ids. Other 404 errors, e.g. for a secondary URL or a page lacking the data the
+    service reads (`InvalidRequestError`), do not condemn the id.
+
+    Args:
+        service (Any): The service class, e.g. `TransfermarktPlayerProfile`.
+        method (str): The name of the service method building the result, e.g. `get_player_profile`.
+        schema (Any): The response model, e.g. `PlayerProfile`.
+        kwargs (dict): The arguments the service is instantiated with.
+        options (dict): The serialization options of the endpoint, see `model_response`.
+
+    Returns:
+        Response: The JSON response, its `Age` header telling how many seconds ago its pages were fetched.
+
+    Raises:
+        HTTPException: If the service fails to fetch its pages, see `TransfermarktBase.create`.
+    """
+    started = time.perf_counter()
+    try:
+        tfmkt = await service.create(**kwargs)
+    except HTTPException as e:
+        if e.status_code == 404:
+            not_found_cache.set(result_key(service.__name__, **kwargs), e.detail, settings.CACHE_NOT_FOUND_TTL)
+        invalid_id = service.invalid_id(**kwargs)
+        if isinstance(e, UpstreamNotFoundError) and e.url == service.upstream_urls(**kwargs)[0] and invalid_id:
+            invalid_ids.add(invalid_id)
+        raise
+    now = datetime.now()
+    fetched_at = now if tfmkt.fetched_at is None else min(now, datetime.fromtimestamp(tfmkt.fetched_at))
+    data = await run_in_threadpool(getattr(tfmkt, method))
+    data["updatedAt"] = fetched_at
+    response = model_response(schema, data, **options)
+    age = (now - fetched_at).total_seconds()
+    response.headers["Age"] = str(int(age))
+    ttl, grace = service.get_cache_ttl() - age, max(service.get_cache_grace(), 0.0)
+    delta = time.perf_counter() - started
+    result_cache.set(result_key(service.__name__, **kwargs), response.body, ttl, fetched_at, grace, delta)
+    if remote_cache.enabled:
+        value = HEADER.pack(fetched_at.timestamp()) + response.body
+        await run_in_threadpool(remote_cache.set, remote_result_key(service, kwargs), value, ttl + grace)
+    return response
+
+
+async def refresh_result(entry: CachedResult, *args: Any) -> None:
+    """
+    Rebuild a cached result in the background, see `build_result`.
+
+    The page caches only serve the refresh pages fetched after the result (see `pages_fetched_after`), as an early
+    refresh would otherwise rebuild it from the very pages it was built from. A failed refresh is logged and leaves
+    the result as it was, to be served until its grace window ends.
+
+    Args:
+        entry (CachedResult): The cached result, whose refresh was claimed.
+        *args: The arguments of `build_result`.
+    """
+    # A millisecond past it, as the time of the result is rounded to the microsecond
+    pages_fetched_after.set(entry.fetched_at.timestamp() + 0.001)
+    try:
+        await build_result(*args)
+    except Exception as e:
+        result_cache.release_refresh(entry)
+        logger.warning("Could not refresh the cached result of %s: %s", args[0].__name__, e)
+
+
+def known_not_found(service: Any, kwargs: dict) -> Optional[str]:
+    """
+    Tell whether a service call is known to be not found, from a recent 404 of the same call or an id known invalid.
+
+    Args:
+        service (Any): The service class.
+        kwargs (dict): The arguments the service is instantiated with.
+
+    Returns:
+        Optional[str]: The detail of the 404 error to answer with, or None if the call is not known to be not found.
+    """
+    detail = not_found_cache.get(result_key(service.__name__, **kwargs))
+    if detail is None:
+        invalid_id = service.invalid_id(**kwargs)
+        if invalid_id is not None and invalid_id in invalid_ids:
+            detail = f"Invalid request (url: {service.upstream_urls(**kwargs)[0]})"
+    return detail
+
+
+def remote_result_key(service: Any, kwargs: dict) -> str:
+    """
+    Build the remote cache key of the result of a service called with some arguments.
+
+    Args:
+        service (Any): The service class.
+        kwargs (dict): The arguments the service is instantiated with.
+
+    Returns:
+        str: The key, e.g. `result:TransfermarktPlayerProfile?player_id=28003`.
+    """
+    return f"result:{service.__name__}?{urlencode(sorted(kwargs.items()))}"
+
+
+async def service_response(
+    service: Any,
+    method: str,
+    schema: Any,
+    kwargs: dict,
+    exclude_none: bool = False,
+    exclude_defaults: bool = False,
+) -> Response:
+    """
+    Answer an endpoint with the result of a service, from the result cache while it is fresh or within its grace.
+
+    On a miss the result is looked up in the remote cache shared by every instance of the API, if there is one.
+    Otherwise the service fetches and parses its pages, and its result is validated, serialized and kept for the
+    service's TTL (see `TransfermarktBase.get_cache_ttl`), in both caches. The `updatedAt` of the result is the time
+    its pages were fetched, so a cached result keeps telling how old it is.
+
+    A result past its TTL but within the service's grace window (see `TransfermarktBase.get_cache_grace`) is served
+    at once and refreshed in the background, as is a fresh result drawn for an early refresh. A single request per
+    result starts the refresh. The `X-Cache` header tells whether the result came from a cache (`HIT`), stale
+    (`STALE`) or not (`MISS`), and `Age` how many seconds ago it was fetched.
+
+    A call not found (404) within the last `CACHE_NOT_FOUND_TTL` seconds, or reading a player or club id known to be
+    invalid, is answered with a 404 error at once, without any upstream request, see `known_not_found`.
+
+    Args:
+        service (Any): The service class, e.g. `TransfermarktPlayerProfile`.
+        method (str): The name of the service method building the result, e.g. `get_player_profile`.
+        schema (Any): The response model, e.g. `PlayerProfile`.
+        kwargs (dict): The arguments the service is instantiated with.
+        exclude_none (bool, optional): Whether to leave out the fields set to None. Default is False.
+        exclude_defaults (bool, optional): Whether to leave out the fields left to their default. Default is False.
+
+    Returns:
+        Response: The JSON response.
+
+    Raises:
+        HTTPException: If the service fails to fetch its pages, see `TransfermarktBase.create`, or if the call is
+            known to be not found.
+    """
+    key = result_key(service.__name__, **kwargs)
+    options = {"exclude_none": exclude_none, "exclude_defaults": exclude_defaults}
+    cached = result_cache.get(key)
+    if cached is None:
+        detail = known_not_found(service, kwargs)
+        if detail is not None:
+            raise HTTPException(status_code=404, detail=detail)
+    if cached is None and remote_cache.enabled:
+        value = await run_in_threadpool(remote_cache.get, remote_result_key(service, kwargs))
+        if value is not None:
+            fetched_at = datetime.fromtimestamp(HEADER.unpack_from(value)[0])
+            age = (datetime.now() - fetched_at).total_seconds()
+            ttl, grace = service.get_cache_ttl(), service.get_cache_grace()
+            cached = result_cache.set(key, value[HEADER.size :], ttl - age, fetched_at, grace)
+
+    if cached is not None:
+        stale = result_cache.is_stale(cached)
+        if result_cache.needs_refresh(cached) and result_cache.claim_refresh(cached):
+            task = asyncio.create_task(refresh_result(cached, service, method, schema, kwargs, options))
+            refresh_tasks.add(task)
+            task.add_done_callback(refresh_tasks.discard)
+        headers = {"X-Cache": "STALE" if stale else "HIT", "Age": str(cached.age(datetime.now()))}
+        return Response(content=cached.content, media_type="application/json", headers=headers)
+
+    response = await build_result(service, method, schema, kwargs, options)
+    response.headers["X-Cache"] = "MISS"
+    return response
@@ -0,0 +1,167 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional
+
+from app.settings import settings
+
+
+@dataclass
+class ValidatedContent:
+    """
+    An upstream body stored together with the validators needed to revalidate it.
+
+    Attributes:
+        etag (str): The `ETag` header of the response, if any.
+        last_modified (str): The `Last-Modified` header of the response, if any.
+        content (bytes): The response body.
+        pages (dict[str, Any]): The pages parsed from the body by variant (parser backend and regions kept), once
+            a service has parsed it.
+        partial (bool): Whether the body was cut short once a service had parsed what it reads, see
+            `TransfermarktBase.stream_page`. It then only stands for the page of the services streaming it.
+    """
+
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content: bytes
+    pages: dict[str, Any] = field(default_factory=dict)
+    partial: bool = False
+
+
+class ValidatorStore:
+    """
+    A bounded LRU store of upstream bodies and validators, used to make conditional requests.
+
+    Args:
+        max_entries (int): The maximum number of URLs remembered. Zero disables revalidation.
+
+    Attributes:
+        downloaded (int): The number of full (200) responses received.
+        revalidated (int): The number of not modified (304) responses received.
+        bytes_saved (int): The number of body bytes that did not have to be downloaded thanks to a 304.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, ValidatedContent] = OrderedDict()
+        self.downloaded = 0
+        self.revalidated = 0
+        self.bytes_saved = 0
+
+    def get(self, url: str) -> Optional[ValidatedContent]:
+        """
+        Return the stored content for a URL, marking it as recently used.
+
+        Args:
+            url (str): The upstream URL.
+
+        Returns:
+            Optional[ValidatedContent]: The stored content, or None if the URL is not known.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def conditional_headers(self, url: str, partial: bool = False) -> dict:
+        """
+        Build the `If-None-Match`/`If-Modified-Since` headers for a request to a URL.
+
+        Args:
+            url (str): The upstream URL.
+            partial (bool, optional): Whether the caller can use a partial stored body. If not, a partial body is
+                not revalidated, so upstream sends the whole body. Default is False.
+
+        Returns:
+            dict: The conditional request headers, empty if nothing usable is stored for the URL.
+        """
+        entry = self.get(url)
+        if entry is None or (entry.partial and not partial):
+            return {}
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(self, url: str, headers: Mapping[str, str], content: bytes, partial: bool = False) -> None:
+        """
+        Record a full response, remembering its body if it carries validators.
+
+        Args:
+            url (str): The upstream URL.
+            headers (Mapping[str, str]): The response headers.
+            content (bytes): The response body.
+            partial (bool, optional): Whether the body may have been cut short, see `ValidatedContent.partial`.
+                Default is False.
+        """
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        with self._lock:
+            self.downloaded += 1
+            if not self.max_entries:
+                return
+            if not (etag or last_modified):
+                self._entries.pop(url, None)
+                return
+            self._entries[url] = ValidatedContent(
+                etag=etag,
+                last_modified=last_modified,
+                content=content,
+                partial=partial,
+            )
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def not_modified(self, url: str) -> Optional[ValidatedContent]:
+        """
+        Record a 304 response and return the stored content it refers to.
+
+        Args:
+            url (str): The upstream URL.
+
+        Returns:
+            Optional[ValidatedContent]: The stored content, or None if it was evicted in the meantime.
+        """
+        entry = self.get(url)
+        if entry is not None:
+            with self._lock:
+                self.revalidated += 1
+                self.bytes_saved += len(entry.content)
+        return entry
+
+    def set_page(self, url: str, content: bytes, page: Any, variant: str) -> None:
+        """
+        Attach the page parsed from the stored body of a URL, so a later 304 can skip parsing.
+
+        Args:
+            url (str): The upstream URL.
+            content (bytes): The body the page was parsed from. Nothing is attached if it is not the
+                stored one anymore.
+            page (Any): The parsed page.
+            variant (str): The variant of the page, see `TransfermarktBase.page_variant`.
+        """
+        entry = self.get(url)
+        if entry is not None and entry.content is content:
+            entry.pages[variant] = page
+
+    def stats(self) -> dict:
+        """
+        Summarize the revalidation counters.
+
+        Returns:
+            dict: The number of stored URLs, full and not modified responses, and bytes saved.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "downloaded": self.downloaded,
+                "revalidated": self.revalidated,
+                "bytesSaved": self.bytes_saved,
+            }
+
+
+validator_store = ValidatorStore(max_entries=settings.HTTP_REVALIDATION_MAX_ENTRIES)
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class Abandoned(Exception):
+    """Set on the future of a call whose caller was cancelled or interrupted, telling the waiting callers to retry."""
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls sharing a key into a single execution whose result every caller receives.
+
+    Calls are tracked with concurrent futures, so threads (`do`) and coroutines (`do_async`) waiting on the
+    same key share one in-flight execution. A caller cancelled or interrupted while running the call does not hand
+    its `CancelledError` to the others: one of them runs the call again.
+
+    Attributes:
+        calls (int): The number of calls made.
+        executions (int): The number of calls that actually ran, the others waited for a result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: dict[Hashable, Future] = {}
+        self.calls = 0
+        self.executions = 0
+
+    def _join(self, key: Hashable, retry: bool = False) -> tuple[Future, bool]:
+        """Return the future for the in-flight call on `key`, and whether the caller has to run it."""
+        with self._lock:
+            self.calls += not retry
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future, False
+            self.executions += 1
+            future = self._in_flight[key] = Future()
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None) -> None:
+        """Publish the outcome of the call on `key` to every waiting caller."""
+        with self._lock:
+            del self._in_flight[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Call `fn`, unless a call for the same key is already in flight, in which case wait for its result.
+
+        Args:
+            key (Hashable): The key identifying identical calls.
+            fn (Callable): The function to call.
+
+        Returns:
+            Any: The result of the call, shared by every concurrent caller.
+
+        Raises:
+            Exception: Whatever the call raised, re-raised to every concurrent caller.
+        """
+        future, leader = self._join(key)
+        while not leader:
+            try:
+                return future.result()
+            except Abandoned:
+                future, leader = self._join(key, retry=True)
+        try:
+            result = fn()
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        except BaseException:
+            self._finish(key, future, error=Abandoned())
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await `fn()`, unless a call for the same key is already in flight, in which case wait for its result.
+
+        Args:
+            key (Hashable): The key identifying identical calls.
+            fn (Callable): The coroutine function to call.
+
+        Returns:
+            Any: The result of the call, shared by every concurrent caller.
+
+        Raises:
+            Exception: Whatever the call raised, re-raised to every concurrent caller.
+        """
+        future, leader = self._join(key)
+        while not leader:
+            try:
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except Abandoned:
+                future, leader = self._join(key, retry=True)
+        try:
+            result = await fn()
+        except Exception as e:
+            self._finish(key, future, error=e)
+            raise
+        except BaseException:
+            self._finish(key, future, error=Abandoned())
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def stats(self) -> dict:
+        """
+        Summarize how many calls were coalesced.
+
+        Returns:
+            dict: The number of calls, executions and coalesced calls, and the coalescing ratio, which
+                is the share of calls that did not need their own execution.
+        """
+        with self._lock:
+            calls, executions = self.calls, self.executions
+        return {
+            "calls": calls,
+            "executions": executions,
+            "coalesced": calls - executions,
+            "coalescingRatio": (calls - executions) / calls if calls else 0.0,
+        }
+
+
+single_flight = SingleFlight()
@@ -1,6 +1,9 @@
 import re
+from functools import lru_cache
 from typing import Optional, Union
 
+from app.utils.regex import REGEX_TFMKT_URL
+
 
 def zip_lists_into_dict(list_keys: list, list_values: list) -> dict:
     """
@@ -16,9 +19,69 @@ def zip_lists_into_dict(list_keys: list, list_values: list) -> dict:
     return {k: v for k, v in zip(list_keys, list_values)}
 
 
+def is_slug(segments: str) -> bool:
+    """
+    Tell whether URL segments only hold word characters, hyphens and percent signs, as a `[\\w%-]+` pattern would.
+
+    Args:
+        segments (str): The segments, concatenated.
+
+    Returns:
+        bool: True if the segments are not empty and hold nothing else.
+    """
+    return segments.replace("-", "").replace("_", "").replace("%", "").isalnum()
+
+
+@lru_cache(maxsize=4096)
+def parse_url(tfmkt_url: str) -> Optional[dict]:
+    """
+    Split a Transfermarkt URL path into the groups of `REGEX_TFMKT_URL`.
+
+    The URL shapes Transfermarkt links to, an entity path optionally followed by its season and transfer, are split
+    on slashes, which is cheaper than matching the pattern. Anything else falls back to the pattern, so both give the
+    same groups. URLs repeat across rows and pages, so the groups are cached: the returned dictionary is shared and
+    must not be modified.
+
+    Args:
+        tfmkt_url (str): The trimmed URL path, e.g. `/bukayo-saka/profil/spieler/433177/saison_id/2023`.
+
+    Returns:
+        Optional[dict]: The `code`, `category`, `type`, `id`, `season_id` and `transfer_id` of the URL, or None if it
+            does not start with a Transfermarkt path.
+    """
+    parts = tfmkt_url.split("/")
+    if len(parts) in (5, 7, 9) and not parts[0]:
+        code, category, kind, ident = parts[1:5]
+        tail, season_id, transfer_id = parts[5:], None, None
+        if tail[:1] == ["saison_id"] and len(tail[1]) == 4 and tail[1].isdecimal():
+            tail, season_id = tail[2:], tail[1]
+        if tail[:1] == ["transfer_id"] and tail[1].isdecimal():
+            tail, transfer_id = tail[2:], tail[1]
+        if (
+            not tail
+            and code
+            and category
+            and kind
+            and ident.isalnum()
+            and is_slug(code + category + kind)
+            and "%" not in category + kind
+        ):
+            return {
+                "code": code,
+                "category": category,
+                "type": kind,
+                "id": ident,
+                "season_id": season_id,
+                "transfer_id": transfer_id,
+            }
+
+    match = REGEX_TFMKT_URL.match(tfmkt_url)
+    return None if match is None else match.groupdict()
+
+
 def extract_from_url(tfmkt_url: Optional[str], element: str = "id") -> Optional[str]:
     """
-    Extract a specific element from a Transfermarkt URL using regular expressions.
+    Extract a specific element from a Transfermarkt URL.
 
     Args:
         tfmkt_url (str): The Transfermarkt URL from which to extract the element.
@@ -30,20 +93,22 @@ def extract_from_url(tfmkt_url: Optional[str], element: str = "id") -> Optional[
     if not tfmkt_url:
         return None
 
-    regex: str = (
-        r"/(?P<code>[\w%-]+)"
-        r"/(?P<category>[\w-]+)"
-        r"/(?P<type>[\w-]+)"
-        r"/(?P<id>\w+)"
-        r"(/saison_id/(?P<season_id>\d{4}))?"
-        r"(/transfer_id/(?P<transfer_id>\d+))?"
-    )
-
-    try:
-        groups: dict = re.match(regex, trim(tfmkt_url)).groupdict()
-    except TypeError:
-        return None
-    return groups.get(element)
+    groups = parse_url(trim(tfmkt_url))
+    return None if groups is None else groups.get(element)
+
+
+def extract_from_urls(tfmkt_urls: list, element: str = "id") -> list:
+    """
+    Extract a specific element from each of a list of Transfermarkt URLs, e.g. the club URLs of a table.
+
+    Args:
+        tfmkt_urls (list): The Transfermarkt URLs.
+        element (str, optional): The element to extract (e.g., 'id', 'season_id', 'transfer_id').
+
+    Returns:
+        list: The extracted element value of each URL, None where it is not found.
+    """
+    return [extract_from_url(tfmkt_url, element) for tfmkt_url in tfmkt_urls]
 
 
 def trim(text: Union[list, str]) -> str:
@@ -62,13 +127,30 @@ def trim(text: Union[list, str]) -> str:
     return text.strip().replace("\xa0", "")
 
 
-def safe_regex(text: Optional[Union[str, list]], regex, group: str) -> Optional[str]:
+def trim_list(texts: list, remove_empty: bool = True) -> list:
+    """
+    Trim each text of a list, as `trim` does, trimming every text only once.
+
+    Args:
+        texts (list): The texts, e.g. the text nodes matched by an XPath expression.
+        remove_empty (bool, optional): If True, drop the texts that are empty once trimmed. Default is True.
+
+    Returns:
+        list: The trimmed texts.
+    """
+    trimmed = [text.strip().replace("\xa0", "") for text in texts]
+    if remove_empty:
+        return [text for text in trimmed if text]
+    return trimmed
+
+
+def safe_regex(text: Optional[Union[str, list]], regex: Union[re.Pattern, str], group: str) -> Optional[str]:
     """
     Safely apply a regular expression and extract a specific group from the matched text.
 
     Args:
         text (Optional[str]): The text to apply the regular expression to.
-        regex: The regular expression pattern.
+        regex (Union[re.Pattern, str]): The regular expression, preferably compiled as in `app.utils.regex`.
         group (str): The name of the group to extract.
 
     Returns:
@@ -77,11 +159,10 @@ def safe_regex(text: Optional[Union[str, list]], regex, group: str) -> Optional[
     if not isinstance(text, (str, list)) or not text:
         return None
 
-    try:
-        groups = re.search(regex, trim(text)).groupdict()
-        return groups.get(group)
-    except AttributeError:
+    match = (regex if isinstance(regex, re.Pattern) else re.compile(regex)).search(trim(text))
+    if match is None:
         return None
+    return match.groupdict().get(group)
 
 
 def remove_str(text: Optional[str], strings_to_remove: Union[str, list]) -> Optional[str]:
@@ -1,3 +1,8 @@
+import threading
+
+from lxml import etree
+
+
 class Players:
     class Injuries:
         RESULTS = "//div[@id='yw1']//tbody//tr"
@@ -10,44 +15,48 @@ class Players:
         GAMES_MISSED_CLUBS_URLS = ".//td[6]//a//@href"
 
     class JerseyNumbers:
-        HEADERS = "//table[@class='items']//thead//tr//@title"
-        SEASONS = "//table[@class='items']//td[@class='zentriert']//text()"
-        CLUBS_URLS = "//table[@class='items']//td[@class='hauptlink no-border-links']//a//@href"
-        DATA = "//table[@class='items']//td[@class='zentriert hauptlink']//text()"
+        ITEMS = "//table[@class='items']"
+        HEADERS = ".//thead//tr//@title"
+        SEASONS = ".//td[@class='zentriert']//text()"
+        CLUBS_URLS = ".//td[@class='hauptlink no-border-links']//a//@href"
+        DATA = ".//td[@class='zentriert hauptlink']//text()"
 
     class Profile:
+        HEADER = "//header[contains(@class, 'data-header')]"
+        INFO_TABLE = "//div[contains(concat(' ', normalize-space(@class), ' '), ' info-table ')]"
+        POSITIONS = "//div[contains(@class, 'detail-position')]"
         ID = "//tm-subnavigation[@controller='spieler']//@id"
         URL = "//link[@rel='canonical']//@href"
-        NAME = "//h1[@class='data-header__headline-wrapper']/descendant-or-self::*[not(self::span)]/text()"
+        NAME = ".//h1[@class='data-header__headline-wrapper']/descendant-or-self::*[not(self::span)]/text()"
         DESCRIPTION = "//meta[@name='description']//@content"
-        IMAGE_URL = "//div[@id='fotoauswahlOeffnen']//img//@src"
-        SHIRT_NUMBER = "//span[@class='data-header__shirt-number']//text()"
-        CURRENT_CLUB_NAME = "//span[@class='data-header__club']//text()"
-        CURRENT_CLUB_URL = "//span[@class='data-header__club']//a//@href"
+        IMAGE_URL = ".//div[@id='fotoauswahlOeffnen']//img//@src"
+        SHIRT_NUMBER = ".//span[@class='data-header__shirt-number']//text()"
+        CURRENT_CLUB_NAME = ".//span[@class='data-header__club']//text()"
+        CURRENT_CLUB_URL = ".//span[@class='data-header__club']//a//@href"
         CURRENT_CLUB_JOINED = "//span[contains(text(),'Joined')]//following::span[1]//text()"
-        LAST_CLUB_NAME = "//span[contains(text(),'Last club:')]//span//a//@title"
-        LAST_CLUB_URL = "//span[contains(text(),'Last club:')]//span//a//@href"
-        MOST_GAMES_FOR_CLUB_NAME = "//span[contains(text(),'Most games for:')]//span//a//text()"
-        RETIRED_SINCE_DATE = "//span[contains(text(),'Retired since:')]//span//text()"
+        LAST_CLUB_NAME = ".//span[contains(text(),'Last club:')]//span//a//@title"
+        LAST_CLUB_URL = ".//span[contains(text(),'Last club:')]//span//a//@href"
+        MOST_GAMES_FOR_CLUB_NAME = ".//span[contains(text(),'Most games for:')]//span//a//text()"
+        RETIRED_SINCE_DATE = ".//span[contains(text(),'Retired since:')]//span//text()"
         CURRENT_CLUB_CONTRACT_EXPIRES = "//span[contains(text(),'Contract expires')]//following::span[1]//text()"
         CURRENT_CLUB_CONTRACT_OPTION = "//span[contains(text(),'Contract option:')]//following::span[1]//text()"
-        NAME_IN_HOME_COUNTRY = "//span[text()='Name in home country:']//following::span[1]//text()"
-        FULL_NAME = "//span[text()='Full name:']//following::span[1]//text()"
-        DATE_OF_BIRTH_AGE = "//span[@itemprop='birthDate']//text()"
-        PLACE_OF_BIRTH_CITY = "//span[contains(text(),'Place of birth')]//following::span[1]//text()"
-        PLACE_OF_BIRTH_COUNTRY = "//span[contains(text(),'Place of birth')]//following::span[1]//img//@title"
-        HEIGHT = "//span[text()='Height:']//following::span[1]//text()"
-        CITIZENSHIP = "//span[text()='Citizenship:']//following::span[1]//text()"
-        POSITION = "//span[text()='Position:']//following::span[1]//text()"
-        POSITION_MAIN = "//dt[contains(text(),'Main position:')]//following::dd[1]//text()"
-        POSITION_OTHER = "//dt[contains(text(),'Other position:')]//following::dd//text()"
-        FOOT = "//span[text()='Foot:']//following::span[1]//text()"
-        MARKET_VALUE = "//a[@class='data-header__market-value-wrapper']//text()"
-        AGENT_NAME = "//span[text()='Player agent:']//following::span[1]//text()"
-        AGENT_URL = "//span[text()='Player agent:']//following::span[1]//a//@href"
-        OUTFITTER = "//span[contains(text(),'Outfitter:')]//following::span[1]//text()"
-        SOCIAL_MEDIA = "//div[@class='social-media-toolbar__icons']//@href"
-        TRAINER_PROFILE_URL = "//a[@class='data-header__box--link']//@href"
+        NAME_IN_HOME_COUNTRY = ".//span[text()='Name in home country:']//following::span[1]//text()"
+        FULL_NAME = ".//span[text()='Full name:']//following::span[1]//text()"
+        DATE_OF_BIRTH_AGE = ".//span[@itemprop='birthDate']//text()"
+        PLACE_OF_BIRTH_CITY = ".//span[contains(text(),'Place of birth')]//following::span[1]//text()"
+        PLACE_OF_BIRTH_COUNTRY = ".//span[contains(text(),'Place of birth')]//following::span[1]//img//@title"
+        HEIGHT = ".//span[text()='Height:']//following::span[1]//text()"
+        CITIZENSHIP = ".//span[text()='Citizenship:']//following::span[1]//text()"
+        POSITION = ".//span[text()='Position:']//following::span[1]//text()"
+        POSITION_MAIN = ".//dt[contains(text(),'Main position:')]//following::dd[1]//text()"
+        POSITION_OTHER = ".//dt[contains(text(),'Other position:')]//following::dd//text()"
+        FOOT = ".//span[text()='Foot:']//following::span[1]//text()"
+        MARKET_VALUE = ".//a[@class='data-header__market-value-wrapper']//text()"
+        AGENT_NAME = ".//span[text()='Player agent:']//following::span[1]//text()"
+        AGENT_URL = ".//span[text()='Player agent:']//following::span[1]//a//@href"
+        OUTFITTER = ".//span[contains(text(),'Outfitter:')]//following::span[1]//text()"
+        SOCIAL_MEDIA = ".//div[@class='social-media-toolbar__icons']//@href"
+        TRAINER_PROFILE_URL = ".//a[@class='data-header__box--link']//@href"
         TRAINER_PROFILE_POSITION = "//div[@class='dataProfileDaten']//span[1]//text()"
         RELATIVES = (
             "//div[@class='box tm-player-additional-data']"
@@ -59,7 +68,7 @@ class Players:
     class Search:
         FOUND = "//text()"
         BASE = "//div[@class='box'][h2[contains(text(), 'players')]]"
-        RESULTS = BASE + "//tbody//tr[@class='odd' or @class='even']"
+        RESULTS = ".//tbody//tr[@class='odd' or @class='even']"
         ID = ".//td[@class='hauptlink']//a/@href"
         NAME = ".//td[@class='hauptlink']//a//@title"
         POSITION = ".//td[@class='zentriert'][1]//text()"
@@ -85,10 +94,11 @@ class Players:
         )
 
     class Stats:
-        ROWS = "//table[@class='items']//tbody//tr"
-        HEADERS = "//table[@class='items']//thead//tr//@title"
-        COMPETITIONS_URLS = "//table[@class='items']//td[@class='hauptlink no-border-links']//a//@href"
-        CLUBS_URLS = "//table[@class='items']//td[@class='hauptlink no-border-rechts zentriert']//a//@href"
+        ITEMS = "//table[@class='items']"
+        ROWS = ".//tbody//tr"
+        HEADERS = ".//thead//tr//@title"
+        COMPETITIONS_URLS = ".//td[@class='hauptlink no-border-links']//a//@href"
+        CLUBS_URLS = ".//td[@class='hauptlink no-border-rechts zentriert']//a//@href"
         DATA = ".//text()"
 
     class Achievements:
@@ -104,8 +114,9 @@ class Players:
 
 class Clubs:
     class Profile:
+        HEADER = "//header[contains(@class, 'data-header')]"
         URL = "//div[@class='datenfakten-wappen']//@href"
-        NAME = "//header//h1//text()"
+        NAME = ".//h1//text()"
         NAME_OFFICIAL = "//th[text()='Official club name:']//following::td[1]//text()"
         IMAGE = "//div[@class='datenfakten-wappen']//@src"
         LEGAL_FORM = "//th[text()='Legal form:']//following::td[1]//text()"
@@ -120,61 +131,73 @@ class Clubs:
         MEMBERS_DATE = "//th[text()='Members:']//following::td[1]//span//text()"
         OTHER_SPORTS = "//th[text()='Other sports:']//following::td[1]//text()"
         COLORS = "//p[@class='vereinsfarbe']//@style"
-        STADIUM_NAME = "//li[contains(text(), 'Stadium:')]//span//a//text()"
-        STADIUM_SEATS = "//li[contains(text(), 'Stadium:')]//span//span//text()"
-        TRANSFER_RECORD = "//li[contains(text(), 'Current transfer record:')]//a//text()"
-        MARKET_VALUE = "//a[@class='data-header__market-value-wrapper']//text()"
-        CONFEDERATION = "//li[contains(text(), 'Konföderation:')]//span//text()"
-        RANKING = "//li[contains(text(), 'FIFA World Ranking:')]//span//a//text()"
-        SQUAD_SIZE = "//li[contains(text(), 'Squad size:')]//span//text()"
-        SQUAD_AVG_AGE = "//li[contains(text(), 'Average age:')]//span//text()"
-        SQUAD_FOREIGNERS = "//li[contains(text(), 'Foreigners:')]//span[1]//a//text()"
-        SQUAD_NATIONAL_PLAYERS = "//li[contains(text(), 'National team players:')]//span//a//text()"
-        LEAGUE_ID = "//span[@itemprop='affiliation']//a//@href"
-        LEAGUE_NAME = "//span[@itemprop='affiliation']//a//text()"
-        LEAGUE_COUNTRY_ID = "//div[@class='data-header__club-info']//img[contains(@class, 'flaggenrahmen')]//@data-src"
-        LEAGUE_COUNTRY_NAME = "//div[@class='data-header__club-info']//img[contains(@class, 'flaggenrahmen')]//@title"
-        LEAGUE_TIER = "//div[@class='data-header__club-info']//strong//text()//following::span[1]/a/text()[2]"
+        STADIUM_NAME = ".//li[contains(text(), 'Stadium:')]//span//a//text()"
+        STADIUM_SEATS = ".//li[contains(text(), 'Stadium:')]//span//span//text()"
+        TRANSFER_RECORD = ".//li[contains(text(), 'Current transfer record:')]//a//text()"
+        MARKET_VALUE = ".//a[@class='data-header__market-value-wrapper']//text()"
+        CONFEDERATION = ".//li[contains(text(), 'Konföderation:')]//span//text()"
+        RANKING = ".//li[contains(text(), 'FIFA World Ranking:')]//span//a//text()"
+        SQUAD_SIZE = ".//li[contains(text(), 'Squad size:')]//span//text()"
+        SQUAD_AVG_AGE = ".//li[contains(text(), 'Average age:')]//span//text()"
+        SQUAD_FOREIGNERS = ".//li[contains(text(), 'Foreigners:')]//span[1]//a//text()"
+        SQUAD_NATIONAL_PLAYERS = ".//li[contains(text(), 'National team players:')]//span//a//text()"
+        LEAGUE_ID = ".//span[@itemprop='affiliation']//a//@href"
+        LEAGUE_NAME = ".//span[@itemprop='affiliation']//a//text()"
+        LEAGUE_COUNTRY_ID = ".//div[@class='data-header__club-info']//img[contains(@class, 'flaggenrahmen')]//@data-src"
+        LEAGUE_COUNTRY_NAME = ".//div[@class='data-header__club-info']//img[contains(@class, 'flaggenrahmen')]//@title"
+        LEAGUE_TIER = ".//div[@class='data-header__club-info']//strong//text()//following::span[1]/a/text()[2]"
         CRESTS_HISTORICAL = "//div[@class='wappen-datenfakten-wappen']//@src"
 
     class Search:
         BASE = "//div[@class='box'][h2[contains(text(), 'Clubs')]]"
-        NAMES = BASE + "//td[@class='hauptlink']//a//@title"
-        URLS = BASE + "//td[@class='hauptlink']//a//@href"
-        COUNTRIES = BASE + "//td[@class='zentriert']//img[@class='flaggenrahmen']//@title"
-        MARKET_VALUES = BASE + "//td[@class='rechts']//text()"
-        SQUADS = BASE + "//td[@class='zentriert']//text()"
+        NAMES = ".//td[@class='hauptlink']//a//@title"
+        URLS = ".//td[@class='hauptlink']//a//@href"
+        COUNTRIES = ".//td[@class='zentriert']//img[@class='flaggenrahmen']//@title"
+        MARKET_VALUES = ".//td[@class='rechts']//text()"
+        SQUADS = ".//td[@class='zentriert']//text()"
 
     class Players:
-        PAST_FLAG = "//div[@id='yw1']//thead//text()"
+        GRID = "//div[@id='yw1']"
+        PAST_FLAG = ".//thead//text()"
         CLUB_NAME = "//header//h1//text()"
         CLUB_URL = "//li[@id='overview']//@href"
-        PAGE_NATIONALITIES = "//td[img[@class='flaggenrahmen']]"
-        PAGE_INFOS = "//td[@class='posrela']"
-        NAMES = "//td[@class='posrela']//a//text()"
-        URLS = "//td[@class='hauptlink']//@href"
-        POSITIONS = "//td[@class='posrela']//tr[2]//text()"
-        DOB_AGE = "//div[@id='yw1']//td[3]//text()"
-        NATIONALITIES = ".//img//@title"
+        ROWS = ".//table[@class='items']/tbody/tr"
+        URL = ".//td[@class='hauptlink']//@href"
+        NAME = ".//a//text()"
+        POSITION = ".//tr[2]//text()"
         JOINED = ".//span/node()/@title"
-        SIGNED_FROM = ".//a//img//@title"
-        MARKET_VALUES = "//td[@class='rechts hauptlink']//text()"
         STATUSES = ".//td[@class='hauptlink']//span//@title"
-        JOINED_ON = ".//text()"
+        NATIONALITIES = ".//img//@title"
+        CURRENT_CLUB = ".//img//@title"
+        SIGNED_FROM = ".//a//img//@title"
 
         class Present:
-            PAGE_SIGNED_FROM = "//div[@id='yw1']//td[8]"
-            PAGE_JOINED_ON = "//div[@id='yw1']//td[7]"
-            HEIGHTS = "//div[@id='yw1']//td[5]//text()"
-            FOOTS = "//div[@id='yw1']//td[6]//text()"
-            CONTRACTS = "//div[@id='yw1']//td[9]//text()"
+            COLUMNS = (
+                "number",
+                "player",
+                "dob_age",
+                "nationality",
+                "height",
+                "foot",
+                "joined_on",
+                "signed_from",
+                "contract",
+                "market_value",
+            )
 
         class Past:
-            PAGE_SIGNED_FROM = "//div[@id='yw1']//td[9]"
-            PAGE_JOINED_ON = "//div[@id='yw1']//td[8]"
-            CURRENT_CLUB = "//div[@id='yw1']//td[5]//img//@title"
-            HEIGHTS = "//div[@id='yw1']//td[6]/text()"
-            FOOTS = "//div[@id='yw1']//td[7]//text()"
+            COLUMNS = (
+                "number",
+                "player",
+                "dob_age",
+                "nationality",
+                "current_club",
+                "height",
+                "foot",
+                "joined_on",
+                "signed_from",
+                "market_value",
+            )
 
 
 class Competitions:
@@ -184,20 +207,99 @@ class Competitions:
 
     class Search:
         BASE = "//div[@class='box'][h2[contains(text(), 'competitions')]]"
-        URLS = BASE + "//td//a//@href"
-        NAMES = BASE + "//td//a//@title"
-        COUNTRIES = BASE + "//td[@class='zentriert'][1]//@title"
-        CLUBS = BASE + "//td[@class='zentriert'][2]//text()"
-        PLAYERS = BASE + "//td[@class='rechts']//text()"
-        TOTAL_MARKET_VALUES = BASE + "//td[@class='zentriert'][3]//text()"
-        MEAN_MARKET_VALUES = BASE + "//td[@class='zentriert'][4]//text()"
-        CONTINENTS = BASE + "//td[@class='zentriert'][5]//text()"
+        URLS = ".//td//a//@href"
+        NAMES = ".//td//a//@title"
+        COUNTRIES = ".//td[@class='zentriert'][1]//@title"
+        CLUBS = ".//td[@class='zentriert'][2]//text()"
+        PLAYERS = ".//td[@class='rechts']//text()"
+        TOTAL_MARKET_VALUES = ".//td[@class='zentriert'][3]//text()"
+        MEAN_MARKET_VALUES = ".//td[@class='zentriert'][4]//text()"
+        CONTINENTS = ".//td[@class='zentriert'][5]//text()"
 
     class Clubs:
-        URLS = "//td[@class='hauptlink no-border-links']//a[1]//@href"
-        NAMES = "//td[@class='hauptlink no-border-links']//a//text()"
+        GRID = "//div[@id='yw1']"
+        URLS = ".//td[@class='hauptlink no-border-links']//a[1]//@href"
+        NAMES = ".//td[@class='hauptlink no-border-links']//a//text()"
 
 
 class Pagination:
     PAGE_NUMBER_LAST = "//li[contains(@class, 'list-item--icon-last-page')]//@href"
     PAGE_NUMBER_ACTIVE = "//li[contains(@class, 'list-item--active')]//@href"
+
+
+class Regions:
+    HEADER = "//header[contains(@class, 'data-header')]"
+    MAIN = "//main"
+    SUBNAVIGATION = "//tm-subnavigation"
+    SUBNAVIGATION_MENU = "//div[@id='subnavi']"
+    TABS = "//div[contains(@class, 'tm-tabs')]"
+
+
+# lxml evaluates a compiled XPath under a lock held for the whole evaluation, so threads sharing one serialize on it;
+# every thread of the threadpool compiles its own instead
+compiled_xpaths = threading.local()
+COMPILED_XPATHS_MAX = 1024
+
+
+def compile_xpath(xpath: str) -> etree.XPath:
+    """
+    Compile an XPath expression once per thread and reuse it for every later evaluation in that thread.
+
+    Args:
+        xpath (str): The XPath expression to compile.
+
+    Returns:
+        etree.XPath: The compiled expression, callable with the element to evaluate it against.
+    """
+    cache = getattr(compiled_xpaths, "cache", None)
+    if cache is None:
+        cache = compiled_xpaths.cache = {}
+    compiled = cache.get(xpath)
+    if compiled is None:
+        if len(cache) >= COMPILED_XPATHS_MAX:
+            cache.clear()
+        compiled = cache[xpath] = etree.XPath(xpath)
+    return compiled
+
+
+def evaluate(element: etree.ElementBase, xpath: str) -> list:
+    """
+    Evaluate an XPath expression against an element through its compiled form.
+
+    Args:
+        element (etree.ElementBase): The element (or page root) the expression is relative to.
+        xpath (str): The XPath expression to evaluate.
+
+    Returns:
+        list: The matching elements, strings or attribute values.
+    """
+    return compile_xpath(xpath)(element)
+
+
+def compile_selectors(*namespaces: type) -> dict[str, etree.XPath]:
+    """
+    Compile every selector declared in the given classes and their nested classes.
+
+    Args:
+        *namespaces (type): Classes holding the XPath expressions as string attributes.
+
+    Returns:
+        dict[str, etree.XPath]: The compiled expressions by qualified name, e.g. "Players.Profile.NAME".
+
+    Raises:
+        ValueError: If a selector is not a valid XPath expression.
+    """
+    compiled = {}
+    for namespace in namespaces:
+        for name, value in vars(namespace).items():
+            if isinstance(value, type):
+                compiled.update(compile_selectors(value))
+            elif isinstance(value, str) and not name.startswith("_"):
+                try:
+                    compiled[f"{namespace.__qualname__}.{name}"] = compile_xpath(value)
+                except etree.XPathSyntaxError as error:
+                    raise ValueError(f"Malformed XPath {namespace.__qualname__}.{name}: {value!r}") from error
+    return compiled
+
+
+SELECTORS = compile_selectors(Players, Clubs, Competitions, Pagination, Regions)
@@ -0,0 +1,124 @@
+"""
+Compare the time the club squad service takes to extract its saved Transfermarkt pages, for the present and the past
+season layouts, walking the squad table row by row and with one XPath query per column zipped together afterwards.
+
+The page is parsed once per layout; only the extraction is timed. --rows repeats the saved rows up to that many
+players to get closer to the size of the live squads.
+
+Usage:
+    python benchmarks/club_players.py [--repeat N] [--rows N]
+"""
+
+import argparse
+import re
+import timeit
+from pathlib import Path
+
+from requests import Response
+
+from app.services.clubs.players import TransfermarktClubPlayers
+from app.utils.regex import REGEX_DOB
+from app.utils.utils import extract_from_url, safe_regex
+from app.utils.xpath import evaluate
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+LAYOUTS = [("present", "2024", "clubs_players.html"), ("past", "2019", "clubs_players_past.html")]
+ROWS = re.compile(rb"<tbody>(.*)</tbody>", re.DOTALL)
+
+# The column selectors the service used before reading the table row by row
+COLUMNS = {
+    "PAGE_NATIONALITIES": ".//td[img[@class='flaggenrahmen']]",
+    "PAGE_INFOS": ".//td[@class='posrela']",
+    "NAMES": ".//td[@class='posrela']//a//text()",
+    "URLS": ".//td[@class='hauptlink']//@href",
+    "POSITIONS": ".//td[@class='posrela']//tr[2]//text()",
+    "DOB_AGE": ".//td[3]//text()",
+    "NATIONALITIES": ".//img//@title",
+    "JOINED": ".//span/node()/@title",
+    "SIGNED_FROM": ".//a//img//@title",
+    "MARKET_VALUES": ".//td[@class='rechts hauptlink']//text()",
+    "STATUSES": ".//td[@class='hauptlink']//span//@title",
+    "JOINED_ON": ".//text()",
+}
+LAYOUT_COLUMNS = {
+    False: {
+        "PAGE_SIGNED_FROM": ".//td[8]",
+        "PAGE_JOINED_ON": ".//td[7]",
+        "HEIGHTS": ".//td[5]//text()",
+        "FOOTS": ".//td[6]//text()",
+        "CONTRACTS": ".//td[9]//text()",
+    },
+    True: {
+        "PAGE_SIGNED_FROM": ".//td[9]",
+        "PAGE_JOINED_ON": ".//td[8]",
+        "CURRENT_CLUB": ".//td[5]//img//@title",
+        "HEIGHTS": ".//td[6]/text()",
+        "FOOTS": ".//td[7]//text()",
+    },
+}
+
+
+def build(season_id: str, page_name: str, rows: int) -> TransfermarktClubPlayers:
+    url = TransfermarktClubPlayers.upstream_urls(club_id="11", season_id=season_id)[0]
+    content = (PAGES / page_name).read_bytes()
+    body = ROWS.search(content).group(1)
+    copies = max(1, -(-rows // body.count(b"<tr class=")))
+    content = ROWS.sub(lambda match: b"<tbody>" + body * copies + b"</tbody>", content)
+    response = Response()
+    response.status_code, response.url, response._content = 200, url, content
+    return TransfermarktClubPlayers(club_id="11", season_id=season_id, prefetched={url: response})
+
+
+def by_column(tfmkt: TransfermarktClubPlayers) -> list[dict]:
+    columns = {**COLUMNS, **LAYOUT_COLUMNS[tfmkt.past]}
+    squad = tfmkt.squad
+
+    def texts(name: str, remove_empty: bool = True) -> list:
+        return tfmkt.get_list_by_xpath(columns[name], remove_empty=remove_empty, section=squad)
+
+    def joined(name: str, page: str) -> list:
+        return ["; ".join(evaluate(e, columns[name])) for e in evaluate(squad, columns[page])]
+
+    ids = [extract_from_url(url) for url in texts("URLS")]
+    dob_ages = texts("DOB_AGE")
+    fields = {
+        "id": ids,
+        "name": texts("NAMES"),
+        "position": texts("POSITIONS"),
+        "dateOfBirth": [safe_regex(dob_age, REGEX_DOB, "dob") for dob_age in dob_ages],
+        "age": [safe_regex(dob_age, REGEX_DOB, "age") for dob_age in dob_ages],
+        "nationality": [evaluate(e, columns["NATIONALITIES"]) for e in evaluate(squad, columns["PAGE_NATIONALITIES"])],
+        "currentClub": texts("CURRENT_CLUB") if tfmkt.past else [None] * len(ids),
+        "height": texts("HEIGHTS"),
+        "foot": texts("FOOTS", remove_empty=False),
+        "joinedOn": joined("JOINED_ON", "PAGE_JOINED_ON"),
+        "joined": joined("JOINED", "PAGE_INFOS"),
+        "signedFrom": joined("SIGNED_FROM", "PAGE_SIGNED_FROM"),
+        "contract": [None] * len(ids) if tfmkt.past else texts("CONTRACTS"),
+        "marketValue": texts("MARKET_VALUES"),
+        "status": joined("STATUSES", "PAGE_INFOS"),
+    }
+    return [dict(zip(fields, values)) for values in zip(*fields.values())]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="extractions per layout and mode")
+    parser.add_argument("--rows", type=int, default=0, help="players in the squad table, repeating the saved rows")
+    args = parser.parse_args()
+
+    print(f"{'layout':<10}{'players':>9}{'by column (ms)':>16}{'by row (ms)':>13}")
+    for layout, season_id, page_name in LAYOUTS:
+        tfmkt = build(season_id, page_name, args.rows)
+        by_row = tfmkt.get_club_players
+        players = by_row()["players"]
+        assert by_column(tfmkt) == players, f"{layout}: the row and column extractions differ"
+        timings = [
+            min(timeit.repeat(extract, number=args.repeat, repeat=3)) / args.repeat * 1e3
+            for extract in [lambda: by_column(tfmkt), by_row]
+        ]
+        print(f"{layout:<10}{len(players):>9}{timings[0]:>16.3f}{timings[1]:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
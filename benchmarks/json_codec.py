@@ -0,0 +1,95 @@
+"""
+Compare the stdlib JSON codec with orjson on the payloads of the API: decoding the `ceapi` market value history and
+encoding the market value and club squad responses, as FastAPI hands them to the response class.
+
+The saved payloads are small, so --entries repeats the market value history and --players the club squad up to that
+size. Allocations are the peak traced by tracemalloc during one call. orjson is left out if it is not installed.
+
+Usage:
+    python benchmarks/json_codec.py [--repeat N] [--entries N] [--players N]
+"""
+
+import argparse
+import json
+import timeit
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+from requests import Response
+
+from app.schemas.clubs.players import ClubPlayers
+from app.schemas.players.market_value import PlayerMarketValue
+from app.services.clubs.players import TransfermarktClubPlayers
+from app.services.players.market_value import TransfermarktPlayerMarketValue
+from app.utils import codec
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+
+
+def prefetched(urls: list[str], contents: list[bytes]) -> dict:
+    responses = {}
+    for url, content in zip(urls, contents):
+        response = Response()
+        response.status_code, response.url, response._content = 200, url, content
+        responses[url] = response
+    return responses
+
+
+def market_value(entries: int) -> tuple[bytes, dict]:
+    chart = json.loads((PAGES / "players_market_value.json").read_bytes())
+    chart["list"] = (chart["list"] * (entries // len(chart["list"]) + 1))[:entries]
+    payload = json.dumps(chart).encode("utf-8")
+    kwargs = {"player_id": "316264"}
+    urls = TransfermarktPlayerMarketValue.upstream_urls(**kwargs)
+    contents = [(PAGES / "players_market_value.html").read_bytes(), payload]
+    result = TransfermarktPlayerMarketValue(prefetched=prefetched(urls, contents), **kwargs).get_player_market_value()
+    return payload, PlayerMarketValue.model_validate(result).model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+def club_squad(players: int) -> dict:
+    kwargs = {"club_id": "11", "season_id": "2024"}
+    urls = TransfermarktClubPlayers.upstream_urls(**kwargs)
+    contents = [(PAGES / "clubs_players.html").read_bytes()]
+    result = TransfermarktClubPlayers(prefetched=prefetched(urls, contents), **kwargs).get_club_players()
+    result["players"] = (result["players"] * (players // len(result["players"]) + 1))[:players]
+    return ClubPlayers.model_validate(result).model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+def measure(call, repeat: int) -> tuple[float, float]:
+    elapsed = min(timeit.repeat(call, number=repeat, repeat=3)) / repeat * 1e3
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=100, help="calls per payload and codec")
+    parser.add_argument("--entries", type=int, default=2000, help="entries of the market value history")
+    parser.add_argument("--players", type=int, default=500, help="players of the club squad")
+    args = parser.parse_args()
+
+    payload, market_value_response = market_value(args.entries)
+    squad_response = club_squad(args.players)
+    cases = [
+        (f"decode market value chart ({len(payload) / 1024:.0f} KB)", lambda: codec.loads(payload)),
+        ("encode market value response", lambda: codec.FastJSONResponse(market_value_response)),
+        ("encode club squad response", lambda: codec.FastJSONResponse(squad_response)),
+    ]
+    codecs = [("stdlib", None)] + ([("orjson", codec.orjson)] if codec.orjson is not None else [])
+
+    print(f"{'payload':<40}" + "".join(f"{name + ' (ms)':>14}{name + ' (KB)':>14}" for name, _ in codecs))
+    for name, call in cases:
+        row = ""
+        for _, module in codecs:
+            with mock.patch.object(codec, "orjson", module):
+                elapsed, peak = measure(call, args.repeat)
+            row += f"{elapsed:>14.3f}{peak:>14.0f}"
+        print(f"{name:<40}{row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Count the upstream fetches and time taken by repeated requests for invalid player ids, answered by every player
+endpoint, without negative caching, with the not found cache, and with the not found cache and the known-invalid ids.
+
+--requests requests are spread over --ids invalid ids and the player services, each upstream fetch taking --latency
+seconds and ending in a 404 for a page lacking the player. The not found cache only answers a service called again
+with the same id; the known-invalid ids also answer the other services reading it.
+
+A second table shows the size of the known-invalid ids filter against an exact set of the same ids, and its false
+positive rate measured on as many ids never added.
+
+Usage:
+    python benchmarks/not_found.py [--ids N] [--requests N] [--latency S] [--capacity N]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import Optional
+from unittest import mock
+
+from fastapi import HTTPException
+
+from app.schemas import players
+from app.services.base import UpstreamNotFoundError
+from app.services.players.achievements import TransfermarktPlayerAchievements
+from app.services.players.injuries import TransfermarktPlayerInjuries
+from app.services.players.jersey_numbers import TransfermarktPlayerJerseyNumbers
+from app.services.players.market_value import TransfermarktPlayerMarketValue
+from app.services.players.profile import TransfermarktPlayerProfile
+from app.services.players.stats import TransfermarktPlayerStats
+from app.services.players.transfers import TransfermarktPlayerTransfers
+from app.utils.bloom import RotatingBloomFilter
+from app.utils.cache import NotFoundCache, result_cache
+from app.utils.responses import service_response
+
+ENDPOINTS = [
+    (TransfermarktPlayerProfile, "get_player_profile", players.PlayerProfile),
+    (TransfermarktPlayerMarketValue, "get_player_market_value", players.PlayerMarketValue),
+    (TransfermarktPlayerTransfers, "get_player_transfers", players.PlayerTransfers),
+    (TransfermarktPlayerJerseyNumbers, "get_player_jersey_numbers", players.PlayerJerseyNumbers),
+    (TransfermarktPlayerStats, "get_player_stats", players.PlayerStats),
+    (TransfermarktPlayerInjuries, "get_player_injuries", players.PlayerInjuries),
+    (TransfermarktPlayerAchievements, "get_player_achievements", players.PlayerAchievements),
+]
+
+
+class NoIds:
+    """Known-invalid ids that never hold any."""
+
+    def add(self, item: str) -> None:
+        pass
+
+    def __contains__(self, item: str) -> bool:
+        return False
+
+
+def run(args: argparse.Namespace, max_entries: int, ids: Optional[RotatingBloomFilter]) -> tuple[int, float]:
+    fetches = []
+
+    async def create(cls, **kwargs):
+        await asyncio.sleep(args.latency)
+        fetches.append(kwargs)
+        raise UpstreamNotFoundError(cls.upstream_urls(**kwargs)[0], detail="Client Error. Not Found")
+
+    async def serve(requests: list) -> None:
+        for (service, method, schema), player_id in requests:
+            try:
+                await service_response(service, method, schema, {"player_id": player_id})
+            except HTTPException:
+                pass
+
+    rng = random.Random(0)
+    requests = [(rng.choice(ENDPOINTS), str(rng.randrange(args.ids) + 10**7)) for _ in range(args.requests)]
+    patches = [mock.patch.object(service, "create", classmethod(create)) for service, _, _ in ENDPOINTS] + [
+        mock.patch("app.utils.responses.not_found_cache", NotFoundCache(max_entries=max_entries)),
+        mock.patch("app.utils.responses.invalid_ids", NoIds() if ids is None else ids),
+    ]
+    for patch in patches:
+        patch.start()
+    try:
+        result_cache.clear()
+        start = time.perf_counter()
+        asyncio.run(serve(requests))
+        return len(fetches), time.perf_counter() - start
+    finally:
+        for patch in patches:
+            patch.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ids", type=int, default=50, help="distinct invalid player ids requested")
+    parser.add_argument("--requests", type=int, default=1000, help="requests served")
+    parser.add_argument("--latency", type=float, default=0.002, help="upstream fetch time, in seconds")
+    parser.add_argument("--capacity", type=int, default=100000, help="ids the known-invalid ids filter is sized for")
+    args = parser.parse_args()
+
+    print(f"{'policy':<36}{'fetches':>9}{'time (s)':>10}")
+    for name, max_entries, ids in [
+        ("none", 0, None),
+        ("not found cache", 10000, None),
+        ("not found cache + invalid ids", 10000, RotatingBloomFilter(args.capacity, 1e-6, lifetime=86400.0)),
+    ]:
+        fetches, elapsed = run(args, max_entries, ids)
+        print(f"{name:<36}{fetches:>9}{elapsed:>10.2f}")
+
+    print()
+    print(f"{'error rate':<12}{'filter (KiB)':>14}{'set (KiB)':>11}{'false positives':>17}")
+    added = [f"player_id:{index}" for index in range(args.capacity)]
+    exact = sys.getsizeof(set(added)) + sum(sys.getsizeof(item) for item in added)
+    for error_rate in (1e-2, 1e-4, 1e-6):
+        bloom = RotatingBloomFilter(args.capacity, error_rate, lifetime=86400.0)
+        for item in added:
+            bloom.add(item)
+        false_positives = sum(f"club_id:{index}" in bloom for index in range(args.capacity)) / args.capacity
+        size = bloom.stats()["bytes"] / 1024
+        print(f"{error_rate:<12g}{size:>14.0f}{exact / 1024:>11.0f}{false_positives:>17.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Measure the on-disk page cache over the saved Transfermarkt pages: the size of every page as downloaded and as
+stored (scripts emptied, then compressed), and the time to write it and to read it back through the memory map.
+
+Usage:
+    python benchmarks/page_cache.py [--repeat N] [--level N]
+"""
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+
+from app.utils.pagecache import DiskPageCache
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50, help="writes and reads per page")
+    parser.add_argument("--level", type=int, default=6, help="zlib compression level")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DiskPageCache(directory=directory, max_bytes=1 << 30, level=args.level)
+        print(f"{'page':<32}{'page (kB)':>11}{'stored (kB)':>13}{'write (ms)':>12}{'read (ms)':>11}")
+        for path in sorted(PAGES.iterdir()):
+            content = path.read_bytes()
+            url = f"https://www.transfermarkt.com/{path.name}"
+            cache.set(url, content)
+            assert cache.get(url, max_age=60) is not None
+            stored = Path(cache.path(url)).stat().st_size
+            timings = [
+                min(timeit.repeat(call, number=args.repeat, repeat=3)) / args.repeat * 1e3
+                for call in (lambda: cache.set(url, content), lambda: cache.get(url, max_age=60))
+            ]
+            row = f"{path.name:<32}{len(content) / 1024:>11.1f}{stored / 1024:>13.1f}"
+            print(row + f"{timings[0]:>12.3f}{timings[1]:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
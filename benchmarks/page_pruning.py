@@ -0,0 +1,88 @@
+"""
+Compare the time each service takes to parse and extract its saved Transfermarkt page, and the size of the page it
+keeps, with the whole page and with scripts, styles and inline SVGs emptied as they are parsed and the body pruned to
+the service's regions once parsed. Pruning makes the page kept and the selectors walking it smaller, not the parse.
+
+Live pages are much larger than the saved ones, mostly in inline scripts, navigation, ads and footers: --padding
+adds that much of such markup, in kilobytes, to each page to get closer to them.
+
+Usage:
+    python benchmarks/page_pruning.py [--repeat N] [--padding KB]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from unittest import mock
+
+from requests import Response
+
+from app.utils import parsers
+from app.utils.xpath import evaluate
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests" / "services"))
+from test_services_parsing import SERVICES  # noqa: E402
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+NAVIGATION = b'<li><a href="/wettbewerbe/europa" title="Competitions"><span>Competitions</span></a></li>\n'
+SCRIPT = b'<script type="text/javascript">window.dataLayer.push({"event": "pageview", "ids": [%s]});</script>\n' % (
+    b", ".join(b"%d" % i for i in range(200))
+)
+AD = b'<div id="div-gpt-ad-%d" class="werbung"><iframe src="/ads"></iframe><!-- ad slot --></div>\n'
+
+
+def pad(content: bytes, padding: int) -> bytes:
+    # A third of the padding in navigation, ads and footer links each, and the rest in inline scripts
+    links = NAVIGATION * (padding * 1024 // 6 // len(NAVIGATION))
+    ads = b"".join(AD % i for i in range(padding * 1024 // 6 // len(AD)))
+    scripts = SCRIPT * (padding * 1024 // 2 // len(SCRIPT))
+    content = content.replace(b"<body>", b"<body><nav><ul>" + links + b"</ul></nav>" + ads, 1)
+    return content.replace(b"</body>", b"<footer><ul>" + links + b"</ul></footer>" + scripts + b"</body>")
+
+
+def extraction(service, kwargs: dict, method: str, fixtures: list[str], padding: int):
+    responses = {}
+    for url, name in zip(service.upstream_urls(**kwargs), fixtures):
+        content = (PAGES / name).read_bytes()
+        response = Response()
+        response.status_code, response.url = 200, url
+        response._content = pad(content, padding) if name.endswith(".html") else content
+        responses[url] = response
+
+    def extract():
+        tfmkt = service(prefetched=dict(responses), **kwargs)
+        return tfmkt, getattr(tfmkt, method)()
+
+    return extract
+
+
+def size(page) -> tuple[int, int]:
+    nodes = evaluate(page, "//node()")
+    return len(nodes), sum(len(node) for node in nodes if isinstance(node, str))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=100, help="parses and extractions per service and mode")
+    parser.add_argument("--padding", type=int, default=0, help="kilobytes of boilerplate added to each page")
+    args = parser.parse_args()
+
+    print(
+        f"{'service':<36}{'whole (ms)':>12}{'pruned (ms)':>13}{'whole nodes/text KB':>21}{'pruned nodes/text KB':>22}",
+    )
+    for service, kwargs, method, fixtures in SERVICES:
+        with mock.patch.object(service, "STREAM_UNTIL", ()):
+            extract = extraction(service, kwargs, method, fixtures, args.padding)
+            with mock.patch.object(service, "REGIONS", ()), mock.patch.object(parsers, "empty_boilerplate", id):
+                whole_page, expected = extract()
+                whole = min(timeit.repeat(extract, number=args.repeat, repeat=3)) / args.repeat * 1e3
+            pruned_page, actual = extract()
+            assert actual == expected, f"{service.__name__}: the pruned and whole page extractions differ"
+            pruned = min(timeit.repeat(extract, number=args.repeat, repeat=3)) / args.repeat * 1e3
+        sizes = [f"{nodes}/{text / 1024:.0f}" for nodes, text in (size(whole_page.page), size(pruned_page.page))]
+        print(f"{service.__name__:<36}{whole:>12.3f}{pruned:>13.3f}{sizes[0]:>21}{sizes[1]:>22}")
+
+
+if __name__ == "__main__":
+    main()
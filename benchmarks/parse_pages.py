@@ -0,0 +1,50 @@
+"""
+Compare the time it takes to parse the saved Transfermarkt pages with lxml directly and through BeautifulSoup.
+
+The saved pages are synthetic: hand-written reductions of live pages, a few kilobytes each, keeping only the markup
+the services read. Their timings and speedups show the trend, not what a live page costs. --padding adds navigation,
+ads, footers and inline scripts, in kilobytes, to each page to get closer to live pages, see `page_pruning.py`.
+
+Usage:
+    python benchmarks/parse_pages.py [--repeat N] [--padding KB]
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from lxml import etree
+from page_pruning import pad
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+
+
+def parse_bsoup(content: bytes):
+    return etree.HTML(str(BeautifulSoup(markup=content, features="html.parser")))
+
+
+def parse_lxml(content: bytes):
+    return etree.HTML(content, parser=etree.HTMLParser(encoding="utf-8"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="parses per page and parser")
+    parser.add_argument("--padding", type=int, default=0, help="kilobytes of boilerplate added to each page")
+    args = parser.parse_args()
+
+    print(f"{'page':<32}{'bytes':>8}{'bsoup (ms)':>12}{'lxml (ms)':>12}{'speedup':>10}")
+    totals = [0.0, 0.0]
+    for path in sorted(PAGES.glob("*.html")):
+        content = pad(path.read_bytes(), args.padding)
+        bsoup = min(timeit.repeat(lambda: parse_bsoup(content), number=args.repeat, repeat=3)) / args.repeat
+        lxml = min(timeit.repeat(lambda: parse_lxml(content), number=args.repeat, repeat=3)) / args.repeat
+        totals[0] += bsoup
+        totals[1] += lxml
+        print(f"{path.name:<32}{len(content):>8}{bsoup * 1e3:>12.3f}{lxml * 1e3:>12.3f}{bsoup / lxml:>9.1f}x")
+    print(f"{'total':<40}{totals[0] * 1e3:>12.3f}{totals[1] * 1e3:>12.3f}{totals[0] / totals[1]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare the parser backends: their throughput over the saved Transfermarkt pages, and the time the services able to
+use every backend take to parse and extract their page with each of them.
+
+Backends whose library is not installed are left out; install selectolax to include lexbor.
+
+Usage:
+    python benchmarks/parser_backends.py [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+from requests import Response
+
+from app.settings import settings
+from app.utils.parsers import PARSERS
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests" / "services"))
+from test_services_parsing import LEXBOR_SERVICES  # noqa: E402
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+
+
+def extraction(service, kwargs: dict, method: str, page_names: list):
+    responses = {}
+    for url, page_name in zip(service.upstream_urls(**kwargs), page_names):
+        response = Response()
+        response.status_code, response.url, response._content = 200, url, (PAGES / page_name).read_bytes()
+        responses[url] = response
+    return lambda: getattr(service(prefetched=dict(responses), **kwargs), method)()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=100, help="parses or extractions per page and backend")
+    args = parser.parse_args()
+    backends = [backend for backend in PARSERS.values() if backend.available]
+
+    pages = [path.read_bytes() for path in sorted(PAGES.glob("*.html"))]
+    size = sum(map(len, pages)) / 1e6
+    print(f"{'backend':<10}{'pages/s':>10}{'MB/s':>8}")
+    for backend in backends:
+        elapsed = min(
+            timeit.repeat(lambda: [backend.parse(page, "utf-8") for page in pages], number=args.repeat, repeat=3),
+        )
+        print(f"{backend.NAME:<10}{len(pages) * args.repeat / elapsed:>10.0f}{size * args.repeat / elapsed:>8.1f}")
+
+    print()
+    print(f"{'service':<36}" + "".join(f"{backend.NAME + ' (ms)':>13}" for backend in backends))
+    for service, kwargs, method, page_names in LEXBOR_SERVICES:
+        extract = extraction(service, kwargs, method, page_names)
+        timings = []
+        for backend in backends:
+            settings.PARSER_BACKENDS = {service.__name__: backend.NAME}
+            timings.append(min(timeit.repeat(extract, number=args.repeat, repeat=3)) / args.repeat * 1e3)
+        settings.PARSER_BACKENDS = {}
+        print(f"{service.__name__:<36}" + "".join(f"{timing:>13.3f}" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the time the player and club profile services take to extract their saved Transfermarkt pages with the
+single-pass label index and with one XPath lookup per field, over the whole page or over the page sections.
+
+The page is parsed once per service; only the extraction is timed. --padding appends that much markup, in kilobytes,
+to each page to get closer to the size of the live pages.
+
+Usage:
+    python benchmarks/profile_labels.py [--repeat N] [--padding KB]
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+from unittest import mock
+
+from requests import Response
+
+from app.services.base import TransfermarktBase
+from app.services.clubs.profile import TransfermarktClubProfile
+from app.services.players.profile import TransfermarktPlayerProfile
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+FILLER = (
+    b'<div class="row"><ul><li><a href="/wettbewerbe/europa" title="Competitions">'
+    b"<span>Competitions</span></a></li></ul></div>\n"
+)
+SERVICES = [
+    (TransfermarktPlayerProfile, {"player_id": "316264"}, "get_player_profile", "players_profile.html"),
+    (TransfermarktClubProfile, {"club_id": "11"}, "get_club_profile", "clubs_profile.html"),
+]
+
+
+def build(service, kwargs: dict, page_name: str, padding: int) -> TransfermarktBase:
+    url = service.upstream_urls(**kwargs)[0]
+    content = (PAGES / page_name).read_bytes()
+    content = content.replace(b"</body>", FILLER * (padding * 1024 // len(FILLER)) + b"</body>")
+    response = Response()
+    response.status_code, response.url, response._content = 200, url, content
+    return service(prefetched={url: response}, **kwargs)
+
+
+def whole_page(self: TransfermarktBase, tags: tuple[str, ...], xpath: str = None):
+    return self.page
+
+
+def sections(self: TransfermarktBase, tags: tuple[str, ...], xpath: str = None):
+    return self.page if xpath is None else self.get_section(xpath)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500, help="extractions per service and mode")
+    parser.add_argument("--padding", type=int, default=0, help="kilobytes of markup appended to each page")
+    args = parser.parse_args()
+
+    print(f"{'service':<32}{'whole page (ms)':>17}{'sections (ms)':>15}{'label index (ms)':>18}")
+    for service, kwargs, method, page_name in SERVICES:
+        extract = getattr(build(service, kwargs, page_name, args.padding), method)
+        timings = []
+        for get_labels in [whole_page, sections, TransfermarktBase.get_labels]:
+            with mock.patch.object(TransfermarktBase, "get_labels", get_labels):
+                timings.append(min(timeit.repeat(extract, number=args.repeat, repeat=3)) / args.repeat * 1e3)
+        print(f"{service.__name__:<32}{timings[0]:>17.3f}{timings[1]:>15.3f}{timings[2]:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
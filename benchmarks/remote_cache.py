@@ -0,0 +1,113 @@
+"""
+Count the upstream fetches a fleet of API machines makes for the same popular pages, each machine with only its own
+cache against machines sharing the remote cache and its cross-machine single-flight lock.
+
+Every machine serves --requests requests spread over --pages pages, with --threads requests in flight at a time and
+every upstream fetch taking --latency seconds. "pages" counts the distinct pages the fleet requested, the fewest
+fetches possible. The remote cache runs on an in-memory server speaking the Redis protocol, the one the tests use.
+
+Usage:
+    python benchmarks/remote_cache.py [--machines 1,2,4,8] [--pages N] [--requests N] [--threads N] [--latency S]
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from app.utils.remotecache import RemoteCache, build_client
+from app.utils.singleflight import SingleFlight
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+from conftest import FakeRESPServer  # noqa: E402
+
+
+class Upstream:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.fetches = 0
+        self.lock = threading.Lock()
+
+    def fetch(self, url: str) -> bytes:
+        time.sleep(self.latency)
+        with self.lock:
+            self.fetches += 1
+        return url.encode()
+
+
+class Machine:
+    """One API machine: its own cache and single flight, and optionally the remote cache."""
+
+    def __init__(self, upstream: Upstream, remote: Optional[RemoteCache]):
+        self.upstream = upstream
+        self.remote = remote
+        self.local = {}
+        self.flight = SingleFlight()
+
+    def get(self, url: str) -> bytes:
+        if url in self.local:
+            return self.local[url]
+        return self.flight.do(url, lambda: self.load(url))
+
+    def load(self, url: str) -> bytes:
+        value, token = self.remote.get_or_lock(f"page:{url}") if self.remote else (None, None)
+        if value is None:
+            try:
+                value = self.upstream.fetch(url)
+                if self.remote:
+                    self.remote.set(f"page:{url}", value, ttl=60)
+            finally:
+                if self.remote:
+                    self.remote.unlock(f"page:{url}", token)
+        self.local[url] = value
+        return value
+
+
+def run(machines: int, shared: bool, args: argparse.Namespace) -> tuple[int, int, float]:
+    server = FakeRESPServer() if shared else None
+    upstream = Upstream(args.latency)
+    fleet = [
+        Machine(upstream, RemoteCache(build_client(server.url, 1.0), "bench:", 5.0, 5.0, poll=0.01) if shared else None)
+        for _ in range(machines)
+    ]
+    rng = random.Random(0)
+    # Popular pages first: page n is requested about 1/n as often as the first one
+    weights = [1 / (rank + 1) for rank in range(args.pages)]
+    requests = [
+        (machine, f"https://www.transfermarkt.com/-/profil/spieler/{rng.choices(range(args.pages), weights)[0]}")
+        for _ in range(args.requests)
+        for machine in fleet
+    ]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads * machines) as executor:
+        list(executor.map(lambda request: request[0].get(request[1]), requests))
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+    return len({url for _, url in requests}), upstream.fetches, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--machines", default="1,2,4,8", help="comma-separated fleet sizes")
+    parser.add_argument("--pages", type=int, default=50, help="distinct pages requested")
+    parser.add_argument("--requests", type=int, default=200, help="requests served per machine")
+    parser.add_argument("--threads", type=int, default=8, help="requests in flight per machine")
+    parser.add_argument("--latency", type=float, default=0.05, help="upstream fetch time, in seconds")
+    args = parser.parse_args()
+
+    header = f"{'machines':<10}{'pages':>7}{'fetches alone':>15}{'fetches shared':>16}"
+    print(header + f"{'time alone (s)':>16}{'time shared (s)':>17}")
+    for machines in map(int, args.machines.split(",")):
+        pages, alone, alone_time = run(machines, shared=False, args=args)
+        _, shared, shared_time = run(machines, shared=True, args=args)
+        print(f"{machines:<10}{pages:>7}{alone:>15}{shared:>16}{alone_time:>16.2f}{shared_time:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare the time the API takes to turn a service response into JSON bytes: FastAPI validating the returned dictionary
+into the `response_model`, dumping it and encoding it again, against `model_response` validating it once through the
+cached type adapter and dumping it straight to JSON.
+
+The saved responses are small, so --rows repeats the squad players and the market value history up to that many.
+
+Usage:
+    python benchmarks/response_validation.py [--repeat N] [--rows N]
+"""
+
+import argparse
+import asyncio
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from requests import Response
+
+from app.schemas.clubs.players import ClubPlayers
+from app.schemas.players.market_value import PlayerMarketValue
+from app.services.clubs.players import TransfermarktClubPlayers
+from app.services.players.market_value import TransfermarktPlayerMarketValue
+from app.utils.codec import FastJSONResponse
+from app.utils.responses import model_response
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+RESPONSES = [
+    (
+        TransfermarktClubPlayers,
+        {"club_id": "11", "season_id": "2024"},
+        "get_club_players",
+        ["clubs_players.html"],
+        "players",
+        ClubPlayers,
+        {"exclude_defaults": True},
+    ),
+    (
+        TransfermarktPlayerMarketValue,
+        {"player_id": "316264"},
+        "get_player_market_value",
+        ["players_market_value.html", "players_market_value.json"],
+        "marketValueHistory",
+        PlayerMarketValue,
+        {"exclude_none": True},
+    ),
+]
+
+
+def service_response(service, kwargs: dict, method: str, fixtures: list[str], rows_key: str, rows: int) -> dict:
+    responses = {}
+    for url, name in zip(service.upstream_urls(**kwargs), fixtures):
+        response = Response()
+        response.status_code, response.url, response._content = 200, url, (PAGES / name).read_bytes()
+        responses[url] = response
+    data = getattr(service(prefetched=responses, **kwargs), method)()
+    data[rows_key] = (data[rows_key] * (rows // len(data[rows_key]) + 1))[:rows]
+    # Set once, so that every path serializes the same timestamp
+    data["updatedAt"] = datetime.now()
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="responses per service and path")
+    parser.add_argument("--rows", type=int, default=500, help="squad players or market value history entries")
+    args = parser.parse_args()
+    loop = asyncio.new_event_loop()
+
+    print(f"{'response':<36}{'fastapi (ms)':>14}{'validated once (ms)':>21}")
+    for service, kwargs, method, fixtures, rows_key, schema, options in RESPONSES:
+        data = service_response(service, kwargs, method, fixtures, rows_key, args.rows)
+        field = create_model_field(name="response", type_=schema, mode="serialization")
+
+        def fastapi():
+            content = loop.run_until_complete(serialize_response(field=field, response_content=data, **options))
+            return FastJSONResponse(content).body
+
+        body = model_response(schema, data, **options).body
+        assert fastapi() == body, f"{service.__name__}: the response bytes differ"
+        timings = [
+            min(timeit.repeat(call, number=args.repeat, repeat=3)) / args.repeat * 1e3
+            for call in (
+                fastapi,
+                lambda: model_response(schema, data, **options),
+            )
+        ]
+        print(f"{service.__name__:<36}{timings[0]:>14.3f}{timings[1]:>21.3f}")
+
+
+if __name__ == "__main__":
+    main()
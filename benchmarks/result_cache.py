@@ -0,0 +1,83 @@
+"""
+Compare the time an endpoint takes to answer from the saved Transfermarkt pages on a result cache miss, parsing the
+pages, validating the result and serializing it, against a hit serving the bytes kept by the result cache.
+
+The pages are prefetched, so the miss does not include fetching them.
+
+Usage:
+    python benchmarks/result_cache.py [--repeat N]
+"""
+
+import argparse
+import asyncio
+import sys
+import timeit
+from pathlib import Path
+from unittest import mock
+
+from requests import Response
+
+from app.schemas import clubs, competitions, players
+from app.utils.cache import result_cache
+from app.utils.responses import service_response
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests" / "services"))
+from test_services_parsing import SERVICES  # noqa: E402
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+# The response model and the serialization options of the endpoint of each service
+ENDPOINTS = {
+    "TransfermarktClubPlayers": (clubs.ClubPlayers, {"exclude_defaults": True}),
+    "TransfermarktClubProfile": (clubs.ClubProfile, {"exclude_defaults": True}),
+    "TransfermarktCompetitionClubs": (competitions.CompetitionClubs, {}),
+    "TransfermarktPlayerAchievements": (players.PlayerAchievements, {"exclude_none": True}),
+    "TransfermarktPlayerMarketValue": (players.PlayerMarketValue, {"exclude_none": True}),
+    "TransfermarktPlayerProfile": (players.PlayerProfile, {"exclude_none": True}),
+    "TransfermarktPlayerTransfers": (players.PlayerTransfers, {"exclude_none": True}),
+}
+
+
+def prefetched(service, kwargs: dict, fixtures: list[str]) -> dict:
+    responses = {}
+    for url, name in zip(service.upstream_urls(**kwargs), fixtures):
+        response = Response()
+        response.status_code, response.url, response._content = 200, url, (PAGES / name).read_bytes()
+        responses[url] = response
+    return responses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="responses per service and path")
+    args = parser.parse_args()
+    loop = asyncio.new_event_loop()
+
+    print(f"{'service':<48}{'miss (ms)':>11}{'hit (ms)':>11}")
+    for service, kwargs, method, fixtures in SERVICES:
+        if service.__name__ not in ENDPOINTS:
+            continue
+        schema, options = ENDPOINTS[service.__name__]
+        responses = prefetched(service, kwargs, fixtures)
+
+        async def create(**kwargs):
+            return service(prefetched=dict(responses), **kwargs)
+
+        def respond():
+            return loop.run_until_complete(service_response(service, method, schema, kwargs, **options))
+
+        def miss():
+            result_cache.clear()
+            return respond()
+
+        with mock.patch.object(service, "create", create), mock.patch.object(service, "STREAM_UNTIL", ()):
+            assert miss().headers["X-Cache"] == "MISS"
+            assert respond().headers["X-Cache"] == "HIT"
+            timings = [
+                min(timeit.repeat(call, number=args.repeat, repeat=3)) / args.repeat * 1e3 for call in (miss, respond)
+            ]
+        label = f"{service.__name__} {'/'.join(map(str, kwargs.values()))}"
+        print(f"{label:<48}{timings[0]:>11.3f}{timings[1]:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
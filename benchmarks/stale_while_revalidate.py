@@ -0,0 +1,93 @@
+"""
+Simulate hot cached results expiring under steady traffic, with plain expiry, stale-while-revalidate, and
+stale-while-revalidate with early (XFetch) refreshes, on the result cache with a simulated clock.
+
+--keys results are built at once when the API starts, then requested --rate times per second each for --duration
+seconds. Every rebuild takes --delta seconds. Plain expiry rebuilds concurrent misses of a key once each, as the API
+did without grace; stale-while-revalidate serves the stale result while one background refresh runs.
+
+The table shows the rebuilds, the requests that had to wait for one, the stale responses, and the most rebuilds
+started within one second, the size of the upstream burst when the results built together expire together.
+
+Usage:
+    python benchmarks/stale_while_revalidate.py [--keys N] [--rate R] [--ttl S] [--delta S] [--duration S]
+"""
+
+import argparse
+import heapq
+import random
+from collections import Counter
+from datetime import datetime
+
+from app.utils.cache import ResultCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def simulate(args: argparse.Namespace, grace: float, beta: float) -> dict:
+    clock, rng = Clock(), random.Random(0)
+    cache = ResultCache(max_bytes=1 << 30, beta=beta, clock=clock, random=rng.random)
+    rebuilding, finishes, started = set(), [], Counter()
+    counts = Counter()
+
+    def rebuild(key: int) -> None:
+        rebuilding.add(key)
+        started[int(clock.now)] += 1
+        counts["rebuilds"] += 1
+        heapq.heappush(finishes, (clock.now + args.delta, key))
+
+    for key in range(args.keys):
+        rebuild(key)
+    arrivals = [(rng.expovariate(args.rate), key) for key in range(args.keys)]
+    heapq.heapify(arrivals)
+    while arrivals[0][0] < args.duration:
+        now, key = heapq.heappop(arrivals)
+        heapq.heappush(arrivals, (now + rng.expovariate(args.rate), key))
+        while finishes and finishes[0][0] <= now:
+            clock.now, finished = heapq.heappop(finishes)
+            rebuilding.discard(finished)
+            cache.set(finished, b"{}", args.ttl, datetime.now(), grace=grace, delta=args.delta)
+        clock.now = now
+        cached = cache.get(key)
+        if cached is None:
+            counts["waited"] += 1
+            # Without grace, concurrent misses of a key rebuild it each
+            if not grace or key not in rebuilding:
+                rebuild(key)
+            continue
+        if cache.is_stale(cached):
+            counts["stale"] += 1
+        if cache.needs_refresh(cached) and cache.claim_refresh(cached):
+            rebuild(key)
+    # Past the start, when every result is built at once
+    counts["burst"] = max((count for second, count in started.items() if second > args.delta), default=0)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=200, help="hot results")
+    parser.add_argument("--rate", type=float, default=2.0, help="requests per second per result")
+    parser.add_argument("--ttl", type=float, default=600.0, help="TTL of the results, in seconds")
+    parser.add_argument("--delta", type=float, default=2.0, help="rebuild time of a result, in seconds")
+    parser.add_argument("--duration", type=float, default=1800.0, help="simulated time, in seconds")
+    args = parser.parse_args()
+
+    print(f"{'policy':<34}{'rebuilds':>10}{'waited':>9}{'stale':>9}{'burst (/s)':>12}")
+    for name, grace, beta in [
+        ("expire", 0.0, 0.0),
+        ("stale-while-revalidate", args.ttl, 0.0),
+        ("stale-while-revalidate + early", args.ttl, 1.0),
+    ]:
+        counts = simulate(args, grace, beta)
+        print(f"{name:<34}{counts['rebuilds']:>10}{counts['waited']:>9}{counts['stale']:>9}{counts['burst']:>12}")
+
+
+if __name__ == "__main__":
+    main()
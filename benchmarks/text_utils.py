@@ -0,0 +1,112 @@
+"""
+Compare the per-row cost of the text and URL utilities on the rows of the saved squad and stats pages: trimming the
+text nodes of each row, extracting the ids of the URLs of each row and reading the squad dates of birth, with the
+utilities the services used before and with the compiled and batch ones.
+
+The saved pages only hold a few rows, so --rows repeats them up to that many, giving each copy its own ids. The URL
+parts are cached across calls: "cold" clears the cache before every call, "warm" does not.
+
+Usage:
+    python benchmarks/text_utils.py [--repeat N] [--rows N]
+"""
+
+import argparse
+import re
+import timeit
+from pathlib import Path
+
+from lxml import etree
+
+from app.utils.regex import REGEX_DOB
+from app.utils.utils import extract_from_urls, parse_url, safe_regex, trim_list
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+PAGES_ROWS = [("squad", "clubs_players.html"), ("stats", "players_stats.html")]
+ROWS = "//table[@class='items']/tbody/tr"
+
+# The utilities as the services used them before: string patterns and every text trimmed twice
+URL_PATTERN = (
+    r"/(?P<code>[\w%-]+)"
+    r"/(?P<category>[\w-]+)"
+    r"/(?P<type>[\w-]+)"
+    r"/(?P<id>\w+)"
+    r"(/saison_id/(?P<season_id>\d{4}))?"
+    r"(/transfer_id/(?P<transfer_id>\d+))?"
+)
+
+
+def trim(text) -> str:
+    if isinstance(text, list):
+        text = "".join(text)
+    return text.strip().replace("\xa0", "")
+
+
+def extract_from_url(tfmkt_url, element: str = "id"):
+    if not tfmkt_url:
+        return None
+    try:
+        groups: dict = re.match(URL_PATTERN, trim(tfmkt_url)).groupdict()
+    except (AttributeError, TypeError):
+        return None
+    return groups.get(element)
+
+
+def search_group(text, regex: str, group: str):
+    if not isinstance(text, (str, list)) or not text:
+        return None
+    try:
+        return re.search(regex, trim(text)).groupdict().get(group)
+    except AttributeError:
+        return None
+
+
+def row_inputs(page_name: str, rows: int) -> tuple[list, list, list]:
+    page = etree.HTML((PAGES / page_name).read_bytes())
+    saved = page.xpath(ROWS)
+    texts, urls, dates = [], [], []
+    for copy in range(rows // len(saved) + 1):
+        for row in saved[: rows - copy * len(saved)]:
+            texts.extend(str(text) for text in row.xpath(".//text()"))
+            for url in row.xpath(".//@href"):
+                parts = url.split("/")
+                if len(parts) > 4:
+                    parts[4] += str(copy or "")
+                urls.append("/".join(parts))
+            dates.extend(str(text) for text in row.xpath("./td[3]/text()"))
+    return texts, urls, dates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=100, help="calls per page and implementation")
+    parser.add_argument("--rows", type=int, default=30, help="rows per page")
+    args = parser.parse_args()
+
+    def before(texts: list, urls: list, dates: list) -> list:
+        return [
+            [trim(text) for text in texts if trim(text)],
+            [extract_from_url(url) for url in urls],
+            [search_group(date, REGEX_DOB.pattern, "age") for date in dates],
+        ]
+
+    def after(texts: list, urls: list, dates: list) -> list:
+        return [trim_list(texts), extract_from_urls(urls), [safe_regex(date, REGEX_DOB, "age") for date in dates]]
+
+    def cold(texts: list, urls: list, dates: list) -> list:
+        parse_url.cache_clear()
+        return after(texts, urls, dates)
+
+    print(f"{'page':<8}{'texts':>7}{'urls':>6}{'before (us/row)':>17}{'cold (us/row)':>15}{'warm (us/row)':>15}")
+    for name, page_name in PAGES_ROWS:
+        inputs = row_inputs(page_name, args.rows)
+        assert before(*inputs) == after(*inputs), f"{name}: the utilities disagree"
+        timings = [
+            min(timeit.repeat(lambda: implementation(*inputs), number=args.repeat, repeat=3)) / args.repeat
+            for implementation in (before, cold, after)
+        ]
+        per_row = "".join(f"{timing / args.rows * 1e6:>{width}.2f}" for timing, width in zip(timings, (17, 15, 15)))
+        print(f"{name:<8}{len(inputs[0]):>7}{len(inputs[1]):>6}{per_row}")
+
+
+if __name__ == "__main__":
+    main()
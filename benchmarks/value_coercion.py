@@ -0,0 +1,150 @@
+"""
+Compare the per-value cost of coercing the date and number fields of the responses, with the validators
+`TransfermarktBaseModel` used before (dateutil for every date, chained replaces for every number) and with the
+coercion module.
+
+The samples are the date and number fields of every service response over the saved Transfermarkt pages. The
+coercion module memoizes the values it parses: "cold" clears the memo before every call, "warm" does not.
+
+Usage:
+    python benchmarks/value_coercion.py [--repeat N]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from unittest import mock
+
+from dateutil import parser
+from requests import Response
+
+from app.utils.coercion import parse_date, parse_known_date, parse_money, parse_number
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests" / "services"))
+from test_services_parsing import SERVICES  # noqa: E402
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+DATE_FIELDS = {
+    "dateOfBirth",
+    "joinedOn",
+    "contract",
+    "foundedOn",
+    "membersDate",
+    "fromDate",
+    "untilDate",
+    "date",
+    "contractExpires",
+    "joined",
+    "retiredSince",
+}
+NUMBER_FIELDS = {
+    "currentMarketValue",
+    "currentTransferRecord",
+    "marketValue",
+    "meanMarketValue",
+    "members",
+    "totalMarketValue",
+    "age",
+    "goals",
+    "assists",
+    "yellowCards",
+    "redCards",
+    "minutesPlayed",
+    "fee",
+    "appearances",
+    "gamesMissed",
+}
+
+
+# The validators as `TransfermarktBaseModel` ran them before
+def legacy_date(v: str):
+    try:
+        return parser.parse(v).date() if v else None
+    except parser.ParserError:
+        return None
+
+
+def legacy_number(v: str):
+    if not v or not any(char.isdigit() for char in v):
+        return None
+    value_str = v.lower().replace("€", "").replace("+", "").replace("'", "").strip()
+    if "k" in value_str:
+        return int(float(value_str.replace("k", "")) * 1_000)
+    elif "m" in value_str:
+        return int(float(value_str.replace("m", "")) * 1_000_000)
+    elif "b" in value_str:
+        return int(float(value_str.replace("b", "")) * 1_000_000_000)
+    else:
+        return int(float(value_str))
+
+
+def collect(value, fields: set, samples: list) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in fields and isinstance(item, str):
+                samples.append(item)
+            collect(item, fields, samples)
+    elif isinstance(value, list):
+        for item in value:
+            collect(item, fields, samples)
+
+
+def field_samples() -> tuple[list, list]:
+    dates, numbers = [], []
+    for service, kwargs, method, fixtures in SERVICES:
+        responses = {}
+        for url, name in zip(service.upstream_urls(**kwargs), fixtures):
+            response = Response()
+            response.status_code, response.url, response._content = 200, url, (PAGES / name).read_bytes()
+            responses[url] = response
+        with mock.patch.object(service, "STREAM_UNTIL", ()):
+            result = getattr(service(prefetched=responses, **kwargs), method)()
+        collect(result, DATE_FIELDS, dates)
+        collect(result, NUMBER_FIELDS, numbers)
+    return dates, numbers
+
+
+def safely(coerce):
+    def call(value):
+        try:
+            return coerce(value)
+        except ValueError:
+            return ValueError
+
+    return call
+
+
+def main() -> None:
+    arguments = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arguments.add_argument("--repeat", type=int, default=1000, help="coercions of every sample per implementation")
+    args = arguments.parse_args()
+    dates, numbers = field_samples()
+
+    def clear() -> None:
+        parse_known_date.cache_clear()
+        parse_money.cache_clear()
+
+    print(f"{'field':<8}{'samples':>9}{'before (us)':>13}{'cold (us)':>11}{'warm (us)':>11}")
+    for name, samples, legacy, coerce in [
+        ("date", dates, legacy_date, parse_date),
+        ("number", numbers, safely(legacy_number), safely(parse_number)),
+    ]:
+        before = [legacy(sample) for sample in samples]
+        after = [coerce(sample) for sample in samples]
+        changed = [(sample, old, new) for sample, old, new in zip(samples, before, after) if old != new]
+        timings = [
+            min(timeit.repeat(call, number=args.repeat, repeat=3)) / args.repeat / len(samples) * 1e6
+            for call in (
+                lambda: [legacy(sample) for sample in samples],
+                lambda: (clear(), [coerce(sample) for sample in samples]),
+                lambda: [coerce(sample) for sample in samples],
+            )
+        ]
+        print(f"{name:<8}{len(samples):>9}" + "".join(f"{timing:>{w}.2f}" for timing, w in zip(timings, (13, 11, 11))))
+        for sample, old, new in changed:
+            print(f"    {sample!r}: {old!r} before, {new!r} now")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare the time each service takes to extract its saved Transfermarkt page with section-scoped selectors and with
+every selector walking the whole page.
+
+The page is parsed once per service; only the extraction is timed. Live pages are much larger than the saved ones,
+mostly in navigation, ads and footers outside the sections the services read: --padding appends that much markup, in
+kilobytes, to each page to get closer to them.
+
+Usage:
+    python benchmarks/xpath_sections.py [--repeat N] [--padding KB]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from unittest import mock
+
+from requests import Response
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests" / "services"))
+
+from test_services_parsing import SERVICES  # noqa: E402
+
+from app.services.base import TransfermarktBase  # noqa: E402
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+FILLER = (
+    b'<div class="row"><ul><li><a href="/wettbewerbe/europa" title="Competitions">'
+    b"<span>Competitions</span></a></li></ul></div>\n"
+)
+
+
+def build(service, kwargs: dict, fixtures: list[str], padding: int) -> TransfermarktBase:
+    prefetched = {}
+    for url, name in zip(service.upstream_urls(**kwargs), fixtures):
+        content = (PAGES / name).read_bytes()
+        if name.endswith(".html"):
+            content = content.replace(b"</body>", FILLER * (padding * 1024 // len(FILLER)) + b"</body>")
+        response = Response()
+        response.status_code, response.url, response._content = 200, url, content
+        prefetched[url] = response
+    return service(prefetched=prefetched, **kwargs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500, help="extractions per service and mode")
+    parser.add_argument("--padding", type=int, default=0, help="kilobytes of markup appended to each page")
+    args = parser.parse_args()
+
+    print(f"{'service':<36}{'whole page (ms)':>17}{'sections (ms)':>15}{'speedup':>10}")
+    for service, kwargs, method, fixtures in SERVICES:
+        with mock.patch.object(service, "STREAM_UNTIL", ()):
+            scoped = build(service, kwargs, fixtures, args.padding)
+            with mock.patch.object(TransfermarktBase, "get_section", lambda self, xpath: self.page):
+                whole = build(service, kwargs, fixtures, args.padding)
+                before = min(timeit.repeat(getattr(whole, method), number=args.repeat, repeat=3)) / args.repeat
+            after = min(timeit.repeat(getattr(scoped, method), number=args.repeat, repeat=3)) / args.repeat
+        print(f"{service.__name__:<36}{before * 1e3:>17.3f}{after * 1e3:>15.3f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compare the XPath cost of extracting a saved Transfermarkt page with selectors compiled per call and precompiled.
+
+Every selector of the service is evaluated against the page root once per request, the way the base helpers do.
+
+Usage:
+    python benchmarks/xpath_selectors.py [--repeat N]
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+from lxml import etree
+
+from app.utils.xpath import SELECTORS
+
+PAGES = Path(__file__).parent.parent / "tests" / "fixtures" / "pages"
+SERVICES = {
+    "Players.Profile": "players_profile.html",
+    "Clubs.Profile": "clubs_profile.html",
+    "Clubs.Players": "clubs_players.html",
+    "Players.Injuries": "players_injuries.html",
+    "Players.Stats": "players_stats.html",
+}
+
+
+def request_uncompiled(page, selectors: list[str]) -> None:
+    for xpath in selectors:
+        page.xpath(xpath)
+
+
+def request_compiled(page, selectors: list[etree.XPath]) -> None:
+    for xpath in selectors:
+        xpath(page)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=500, help="requests per service and mode")
+    args = parser.parse_args()
+
+    print(f"{'service':<20}{'selectors':>10}{'per call (ms)':>15}{'compiled (ms)':>15}{'speedup':>10}")
+    for prefix, page_name in SERVICES.items():
+        page = etree.HTML((PAGES / page_name).read_bytes())
+        compiled = [xpath for name, xpath in SELECTORS.items() if name.startswith(prefix + ".")]
+        paths = [xpath.path for xpath in compiled]
+        before = min(timeit.repeat(lambda: request_uncompiled(page, paths), number=args.repeat, repeat=3))
+        after = min(timeit.repeat(lambda: request_compiled(page, compiled), number=args.repeat, repeat=3))
+        before, after = before / args.repeat, after / args.repeat
+        print(f"{prefix:<20}{len(paths):>10}{before * 1e3:>15.3f}{after * 1e3:>15.3f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
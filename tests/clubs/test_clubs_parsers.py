@@ -0,0 +1,33 @@
+import pytest
+
+from app.services.clubs.players import TransfermarktClubPlayers
+from app.services.clubs.profile import TransfermarktClubProfile
+from app.services.clubs.search import TransfermarktClubSearch
+from app.utils.labels import LabelIndex
+
+
+@pytest.mark.parametrize(
+    "service,method,kwargs",
+    [
+        (TransfermarktClubPlayers, "get_club_players", {"club_id": "418"}),
+        (TransfermarktClubPlayers, "get_club_players", {"club_id": "131", "season_id": "2014"}),
+        (TransfermarktClubProfile, "get_club_profile", {"club_id": "210"}),
+        (TransfermarktClubProfile, "get_club_profile", {"club_id": "5"}),
+        (TransfermarktClubSearch, "search_clubs", {"query": "gremio", "page_number": 1}),
+    ],
+)
+def test_clubs_lxml_parse_matches_bsoup_parse(parse_live, service, method, kwargs):
+    expected, actual = parse_live(service, method, ("bs4", "lxml"), **kwargs)
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize("club_id", ["210", "131", "31", "27", "5"])
+def test_club_profile_label_index_matches_selectors(live_routes, static_session, monkeypatch, club_id):
+    routes = live_routes(TransfermarktClubProfile, club_id=club_id)
+
+    actual = TransfermarktClubProfile(session=static_session(routes), club_id=club_id).get_club_profile()
+    monkeypatch.setattr(LabelIndex, "lookup", lambda self, xpath: None)
+    expected = TransfermarktClubProfile(session=static_session(routes), club_id=club_id).get_club_profile()
+
+    assert actual == expected
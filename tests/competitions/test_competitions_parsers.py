@@ -0,0 +1,18 @@
+import pytest
+
+from app.services.competitions.clubs import TransfermarktCompetitionClubs
+from app.services.competitions.search import TransfermarktCompetitionSearch
+
+
+@pytest.mark.parametrize(
+    "service,method,kwargs",
+    [
+        (TransfermarktCompetitionClubs, "get_competition_clubs", {"competition_id": "ES1"}),
+        (TransfermarktCompetitionClubs, "get_competition_clubs", {"competition_id": "GB1", "season_id": "2016"}),
+        (TransfermarktCompetitionSearch, "search_competitions", {"query": "Serie A", "page_number": 1}),
+    ],
+)
+def test_competitions_lxml_parse_matches_bsoup_parse(parse_live, service, method, kwargs):
+    expected, actual = parse_live(service, method, ("bs4", "lxml"), **kwargs)
+
+    assert actual == expected
@@ -1,6 +1,19 @@
+import io
+import socketserver
+import threading
+import time
+from http import HTTPStatus
+from pathlib import Path
+
 import pytest
+from requests import Response, Session
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
 from schema import Regex
 
+from app.utils.http import build_session, get_timeout
+from app.utils.remotecache import UNLOCK_SCRIPT
+
 
 @pytest.fixture
 def len_greater_than_0():
@@ -40,3 +53,161 @@ def regex_integer():
 @pytest.fixture
 def regex_height():
     return Regex(r"^(\d+,\d+m)|(m)$")
+
+
+class StaticAdapter(BaseAdapter):
+    """Transport adapter serving canned responses, so services can be exercised without network access."""
+
+    def __init__(self, routes: dict):
+        super().__init__()
+        self.routes = routes
+        self.sent = []
+
+    def send(self, request, **kwargs) -> Response:
+        self.sent.append(request)
+        route = self.routes.get(request.url, (404, b"", {}))
+        route = route(request) if callable(route) else route
+        status_code, content, headers = route if isinstance(route, tuple) else (200, route, {})
+        response = Response()
+        response.status_code = status_code
+        response.reason = HTTPStatus(status_code).phrase
+        response.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=utf-8", **headers})
+        response.raw = io.BytesIO(content)
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def static_session():
+    def build(routes: dict) -> Session:
+        session = build_session()
+        adapter = StaticAdapter(routes)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    return build
+
+
+@pytest.fixture
+def load_fixture():
+    def load(name: str) -> bytes:
+        return (Path(__file__).parent / "fixtures" / "pages" / name).read_bytes()
+
+    return load
+
+
+@pytest.fixture
+def live_routes():
+    """Fetch the real upstream pages of a service once, as routes to serve them from a static session."""
+
+    def fetch(service, **kwargs) -> dict:
+        session = build_session()
+        return {url: session.get(url, timeout=get_timeout()).content for url in service.upstream_urls(**kwargs)}
+
+    return fetch
+
+
+@pytest.fixture
+def parse_live(live_routes, static_session, monkeypatch):
+    """Fetch the real upstream pages of a service once, then parse them with each of the given parsers."""
+
+    def parse(service, method: str, parsers: tuple, **kwargs) -> list:
+        routes = live_routes(service, **kwargs)
+        monkeypatch.setattr(service, "STREAM_UNTIL", ())
+        results = []
+        for parser in parsers:
+            monkeypatch.setattr(service, "PARSER", parser)
+            result = getattr(service(session=static_session(routes), **kwargs), method)()
+            result.pop("updatedAt", None)
+            results.append(result)
+        return results
+
+    return parse
+
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    def read_command(self) -> list:
+        # Clients send every command as an array of bulk strings
+        line = self.rfile.readline()
+        if not line.startswith(b"*"):
+            raise ConnectionError("Connection closed by the client")
+        command = []
+        for _ in range(int(line[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            command.append(self.rfile.read(length + 2)[:-2])
+        return command
+
+    def handle(self):
+        while True:
+            try:
+                command = self.read_command()
+            except (ConnectionError, OSError, ValueError):
+                return
+            self.wfile.write(self.server.execute(*command))
+
+
+class FakeRESPServer(socketserver.ThreadingTCPServer):
+    """In-memory server speaking the Redis protocol, with the commands the remote cache sends."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, password: str = None):
+        super().__init__(("127.0.0.1", 0), RESPHandler)
+        self.password = password
+        self.lock = threading.Lock()
+        self.data = {}
+        self.commands = []
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.server_address[1]}"
+
+    def get(self, key: bytes):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, name: bytes, *args: bytes) -> bytes:
+        name = name.decode().upper()
+        with self.lock:
+            self.commands.append(name)
+            if name == "AUTH":
+                return b"+OK\r\n" if args[-1].decode() == self.password else b"-WRONGPASS invalid password\r\n"
+            if name == "SELECT":
+                return b"+OK\r\n"
+            if name == "GET":
+                value = self.get(args[0])
+                return b"$-1\r\n" if value is None else b"$%d\r\n%b\r\n" % (len(value), value)
+            if name == "SET":
+                key, value, *options = args
+                options = [option.decode().upper() for option in options]
+                if "NX" in options and self.get(key) is not None:
+                    return b"$-1\r\n"
+                ttl = int(options[options.index("PX") + 1]) / 1000 if "PX" in options else None
+                self.data[key] = (value, None if ttl is None else time.monotonic() + ttl)
+                return b"+OK\r\n"
+            if name == "EVAL" and args[0].decode() == UNLOCK_SCRIPT:
+                key, token = args[2], args[3]
+                if self.get(key) != token:
+                    return b":0\r\n"
+                del self.data[key]
+                return b":1\r\n"
+            return b"-ERR unknown command\r\n"
+
+
+@pytest.fixture
+def resp_server():
+    server = FakeRESPServer()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,48 @@
+import pytest
+
+from app.services.players.achievements import TransfermarktPlayerAchievements
+from app.services.players.injuries import TransfermarktPlayerInjuries
+from app.services.players.jersey_numbers import TransfermarktPlayerJerseyNumbers
+from app.services.players.market_value import TransfermarktPlayerMarketValue
+from app.services.players.profile import TransfermarktPlayerProfile
+from app.services.players.search import TransfermarktPlayerSearch
+from app.services.players.stats import TransfermarktPlayerStats
+from app.services.players.transfers import TransfermarktPlayerTransfers
+from app.utils.labels import LabelIndex
+
+
+@pytest.mark.parametrize(
+    "service,method,kwargs",
+    [
+        (TransfermarktPlayerAchievements, "get_player_achievements", {"player_id": "28003"}),
+        (TransfermarktPlayerAchievements, "get_player_achievements", {"player_id": "8198"}),
+        (TransfermarktPlayerInjuries, "get_player_injuries", {"player_id": "28003", "page_number": 1}),
+        (TransfermarktPlayerInjuries, "get_player_injuries", {"player_id": "8198", "page_number": 1}),
+        (TransfermarktPlayerJerseyNumbers, "get_player_jersey_numbers", {"player_id": "28003"}),
+        (TransfermarktPlayerMarketValue, "get_player_market_value", {"player_id": "8198"}),
+        (TransfermarktPlayerMarketValue, "get_player_market_value", {"player_id": "3373"}),
+        (TransfermarktPlayerProfile, "get_player_profile", {"player_id": "28003"}),
+        (TransfermarktPlayerProfile, "get_player_profile", {"player_id": "8198"}),
+        (TransfermarktPlayerProfile, "get_player_profile", {"player_id": "68290"}),
+        (TransfermarktPlayerProfile, "get_player_profile", {"player_id": "3373"}),
+        (TransfermarktPlayerSearch, "search_players", {"query": "Messi", "page_number": 1}),
+        (TransfermarktPlayerStats, "get_player_stats", {"player_id": "3373"}),
+        (TransfermarktPlayerStats, "get_player_stats", {"player_id": "8198"}),
+        (TransfermarktPlayerTransfers, "get_player_transfers", {"player_id": "28003"}),
+    ],
+)
+def test_players_lxml_parse_matches_bsoup_parse(parse_live, service, method, kwargs):
+    expected, actual = parse_live(service, method, ("bs4", "lxml"), **kwargs)
+
+    assert actual == expected
+
+
+@pytest.mark.parametrize("player_id", ["28003", "8198", "68290", "3373", "418560", "342229"])
+def test_player_profile_label_index_matches_selectors(live_routes, static_session, monkeypatch, player_id):
+    routes = live_routes(TransfermarktPlayerProfile, player_id=player_id)
+
+    actual = TransfermarktPlayerProfile(session=static_session(routes), player_id=player_id).get_player_profile()
+    monkeypatch.setattr(LabelIndex, "lookup", lambda self, xpath: None)
+    expected = TransfermarktPlayerProfile(session=static_session(routes), player_id=player_id).get_player_profile()
+
+    assert actual == expected
@@ -0,0 +1,298 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.schemas.competitions.clubs import CompetitionClubs
+from app.services.base import UpstreamNotFoundError
+from app.services.clubs.players import TransfermarktClubPlayers
+from app.services.clubs.search import TransfermarktClubSearch
+from app.services.competitions.clubs import TransfermarktCompetitionClubs
+from app.services.players.market_value import TransfermarktPlayerMarketValue
+from app.settings import settings
+from app.utils.cache import result_cache
+from app.utils.codec import loads
+from app.utils.pagecache import DiskPageCache
+from app.utils.remotecache import RemoteCache, build_client
+from app.utils.responses import service_response
+from app.utils.revalidation import validator_store
+from app.utils.xpath import Clubs
+
+COMPETITION_PAGE = b"""
+<html><body>
+<div class="data-header__headline-container"><h1>Premier League</h1></div>
+<a class="tm-tab" href="/premier-league/startseite/wettbewerb/GB1/saison_id/2024">Overview</a>
+<div id="yw1"><table><tr>
+<td class="hauptlink no-border-links"><a href="/arsenal-fc/startseite/verein/11/saison_id/2024">Arsenal FC</a></td>
+</tr></table></div>
+</body></html>
+"""
+
+MARKET_VALUE_PAGE = b"""
+<html><body>
+<h1 class="data-header__headline-wrapper">Lionel Messi</h1>
+<a class="data-header__market-value-wrapper" href="/-/marktwertverlauf/spieler/28003">&#8364;20.00m</a>
+</body></html>
+"""
+MARKET_VALUE_CHART = json.dumps(
+    {"list": [{"datum_mw": "Jun 1, 2024", "verein": "Inter Miami", "mw": "&#8364;20.00m", "age": "36"}]},
+).encode()
+
+
+def create(service, routes: dict, **kwargs):
+    def handler(request: httpx.Request) -> httpx.Response:
+        status_code, content = routes.get(str(request.url), (404, b""))
+        return httpx.Response(status_code, content=content)
+
+    transport = httpx.MockTransport(handler)
+
+    async def run():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await service.create(client=client, **kwargs)
+
+    return asyncio.run(run())
+
+
+def test_upstream_urls_use_field_defaults():
+    assert TransfermarktClubSearch.upstream_urls(query="gremio") == [
+        "https://www.transfermarkt.com/schnellsuche/ergebnis/schnellsuche?query=gremio&Verein_page=1",
+    ]
+
+
+def test_create_prefetches_asynchronously():
+    kwargs = {"competition_id": "GB1", "season_id": "2024"}
+    url = TransfermarktCompetitionClubs.upstream_urls(**kwargs)[0]
+    tfmkt = create(TransfermarktCompetitionClubs, {url: (200, COMPETITION_PAGE)}, **kwargs)
+    result = tfmkt.get_competition_clubs()
+
+    assert tfmkt.prefetched == {}
+    assert result["name"] == "Premier League"
+    assert result["seasonId"] == "2024"
+    assert result["clubs"] == [{"id": "11", "name": "Arsenal FC"}]
+
+
+def test_create_not_found():
+    with pytest.raises(UpstreamNotFoundError) as e:
+        create(TransfermarktCompetitionClubs, {}, competition_id="0")
+    assert e.value.status_code == 404
+    assert e.value.url == TransfermarktCompetitionClubs.upstream_urls(competition_id="0")[0]
+
+
+def test_market_value_fetches_page_and_chart_concurrently(static_session):
+    urls = TransfermarktPlayerMarketValue.upstream_urls(player_id="28003")
+    both_in_flight = threading.Barrier(2, timeout=5)
+
+    def route(content: bytes):
+        def respond(request):
+            both_in_flight.wait()
+            return 200, content, {}
+
+        return respond
+
+    session = static_session({urls[0]: route(MARKET_VALUE_PAGE), urls[1]: route(MARKET_VALUE_CHART)})
+    result = TransfermarktPlayerMarketValue(player_id="28003", session=session).get_player_market_value()
+
+    assert result["marketValue"] == "\u20ac20.00m"
+    assert result["marketValueHistory"][0]["clubName"] == "Inter Miami"
+
+
+def test_market_value_create_fetches_page_and_chart():
+    urls = TransfermarktPlayerMarketValue.upstream_urls(player_id="28003")
+    tfmkt = create(
+        TransfermarktPlayerMarketValue,
+        {urls[0]: (200, MARKET_VALUE_PAGE), urls[1]: (200, MARKET_VALUE_CHART)},
+        player_id="28003",
+    )
+
+    assert tfmkt.prefetched == {}
+    assert tfmkt.get_player_market_value()["marketValueHistory"][0]["date"] == "Jun 1, 2024"
+
+
+def test_market_value_create_cancels_chart_when_page_fails():
+    urls = TransfermarktPlayerMarketValue.upstream_urls(player_id="404")
+    cancelled = []
+
+    async def run():
+        chart_requested = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if str(request.url) == urls[0]:
+                await chart_requested.wait()
+                return httpx.Response(404)
+            chart_requested.set()
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(str(request.url))
+                raise
+            return httpx.Response(200, content=MARKET_VALUE_CHART)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            with pytest.raises(UpstreamNotFoundError):
+                await TransfermarktPlayerMarketValue.create(client=client, player_id="404")
+            # Cancelled by create itself, not by the loop shutting down
+            assert cancelled == [urls[1]]
+
+    asyncio.run(run())
+
+
+def test_concurrent_instances_share_fetch_and_parse(static_session):
+    url = TransfermarktCompetitionClubs.upstream_urls(competition_id="GB1")[0]
+
+    def respond(request):
+        time.sleep(0.2)
+        return 200, COMPETITION_PAGE, {}
+
+    session = static_session({url: respond})
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        services = list(
+            executor.map(lambda _: TransfermarktCompetitionClubs(competition_id="GB1", session=session), range(4)),
+        )
+
+    assert len(session.get_adapter(url).sent) == 1
+    assert all(tfmkt.page is services[0].page for tfmkt in services)
+
+
+def test_club_players_parse_streamed_until_squad(static_session, monkeypatch):
+    page = (Path(__file__).parent.parent / "fixtures" / "pages" / "clubs_players.html").read_bytes()
+    monkeypatch.setattr(settings, "HTTP_STREAM_CHUNK_SIZE", 1024)
+    streamed_url = TransfermarktClubPlayers.upstream_urls(club_id="11", season_id="2024")[0]
+    full_url = TransfermarktClubPlayers.upstream_urls(club_id="11", season_id="2023")[0]
+    session = static_session({streamed_url: (200, page, {"ETag": '"v1"'}), full_url: (200, page, {})})
+
+    streamed = TransfermarktClubPlayers(club_id="11", season_id="2024", session=session)
+    monkeypatch.setattr(TransfermarktClubPlayers, "STREAM_UNTIL", ())
+    full = TransfermarktClubPlayers(club_id="11", season_id="2023", session=session)
+
+    assert len(validator_store.get(streamed_url).content) < len(page)
+    assert streamed.get_club_players()["players"] == full.get_club_players()["players"]
+    assert streamed.get_club_players()["players"][1]["name"] == "Martin Ødegaard"
+
+
+def test_partial_streamed_body_not_served_as_page(static_session, monkeypatch, tmp_path):
+    page = (Path(__file__).parent.parent / "fixtures" / "pages" / "clubs_players.html").read_bytes()
+    cache = DiskPageCache(directory=str(tmp_path), max_bytes=1 << 20)
+    monkeypatch.setattr("app.services.base.page_cache", cache)
+    monkeypatch.setattr(settings, "HTTP_STREAM_CHUNK_SIZE", 1024)
+    url = TransfermarktClubPlayers.upstream_urls(club_id="11", season_id="2022")[0]
+    conditional = []
+
+    def route(request):
+        conditional.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return 304, b"", {"ETag": '"v1"'}
+        return 200, page, {"ETag": '"v1"'}
+
+    session = static_session({url: route})
+    TransfermarktClubPlayers(club_id="11", season_id="2022", session=session)
+    assert validator_store.get(url).partial
+    assert cache.get(url, max_age=60) is None
+
+    # Streaming services revalidate the partial body, the others download the whole page
+    streamed = TransfermarktClubPlayers(club_id="11", season_id="2022", session=session)
+    monkeypatch.setattr(TransfermarktClubPlayers, "STREAM_UNTIL", ())
+    full = TransfermarktClubPlayers(club_id="11", season_id="2022", session=session)
+
+    assert conditional == [None, '"v1"', None]
+    assert cache.get(url, max_age=60).content == page
+    assert not validator_store.get(url).partial
+    assert streamed.get_club_players()["players"] == full.get_club_players()["players"]
+
+
+def test_get_section_scopes_selectors(static_session, load_fixture):
+    url = TransfermarktClubSearch.upstream_urls(query="arsenal")[0]
+    search = TransfermarktClubSearch(query="arsenal", session=static_session({url: load_fixture("search.html")}))
+    clubs = search.get_section(Clubs.Search.BASE)
+
+    assert search.get_list_by_xpath(Clubs.Search.NAMES, section=clubs) == ["Arsenal FC", "Arsenal de Sarandí"]
+    assert "Martin Ødegaard" in search.get_list_by_xpath(Clubs.Search.NAMES)
+
+
+def test_missing_section_finds_nothing(static_session, load_fixture):
+    page = load_fixture("search.html").replace(b"Search results: Clubs", b"Search results: Coaches")
+    url = TransfermarktClubSearch.upstream_urls(query="arsenal")[0]
+    search = TransfermarktClubSearch(query="arsenal", session=static_session({url: page}))
+
+    assert search.search_clubs()["results"] == []
+
+
+def test_club_players_empty_cell_keeps_rows_aligned(static_session, load_fixture):
+    page = load_fixture("clubs_players_past.html").replace(
+        b'<a href="/david-raya/marktwertverlauf/spieler/262749">\xe2\x82\xac8.00m</a>',
+        b"",
+    )
+    url = TransfermarktClubPlayers.upstream_urls(club_id="11", season_id="2019")[0]
+    players = TransfermarktClubPlayers(club_id="11", season_id="2019", session=static_session({url: page}))
+    result = players.get_club_players()["players"]
+
+    assert [player["marketValue"] for player in result] == [None, "€45.00m", "€35.00m"]
+    assert [player["currentClub"] for player in result] == ["Arsenal FC"] * 3
+    assert all(player["contract"] is None for player in result)
+
+
+def test_page_cache_serves_other_workers(static_session, monkeypatch, tmp_path):
+    monkeypatch.setattr("app.services.base.page_cache", DiskPageCache(directory=str(tmp_path), max_bytes=1 << 20))
+    kwargs = {"competition_id": "GB1", "season_id": "2024"}
+    url = TransfermarktCompetitionClubs.upstream_urls(**kwargs)[0]
+    fetched = TransfermarktCompetitionClubs(session=static_session({url: (200, COMPETITION_PAGE, {})}), **kwargs)
+
+    # Another worker process, with nothing in memory and upstream unreachable
+    monkeypatch.setattr("app.services.base.page_cache", DiskPageCache(directory=str(tmp_path), max_bytes=1 << 20))
+    cached = TransfermarktCompetitionClubs(session=static_session({}), **kwargs)
+    created = create(TransfermarktCompetitionClubs, {}, **kwargs)
+
+    assert cached.get_competition_clubs() == fetched.get_competition_clubs()
+    assert created.get_competition_clubs() == fetched.get_competition_clubs()
+
+
+def test_page_cache_keeps_fetch_time(static_session, monkeypatch, tmp_path):
+    cache = DiskPageCache(directory=str(tmp_path), max_bytes=1 << 20)
+    monkeypatch.setattr("app.services.base.page_cache", cache)
+    kwargs = {"competition_id": "GB1", "season_id": "2024"}
+    fetched_at = time.time() - 5 * 3600
+    cache.set(TransfermarktCompetitionClubs.upstream_urls(**kwargs)[0], COMPETITION_PAGE, fetched_at)
+
+    assert TransfermarktCompetitionClubs(session=static_session({}), **kwargs).fetched_at == fetched_at
+    assert create(TransfermarktCompetitionClubs, {}, **kwargs).fetched_at == fetched_at
+
+    result_cache.clear()
+    try:
+        response = asyncio.run(
+            service_response(TransfermarktCompetitionClubs, "get_competition_clubs", CompetitionClubs, kwargs),
+        )
+    finally:
+        result_cache.clear()
+    assert response.headers["X-Cache"] == "MISS"
+    assert int(response.headers["Age"]) >= 5 * 3600
+    assert loads(response.body)["updatedAt"] == datetime.fromtimestamp(fetched_at).isoformat()
+
+
+def test_remote_cache_serves_other_machines(static_session, monkeypatch, resp_server):
+    def machine():
+        client = build_client(resp_server.url, timeout=1.0)
+        cache = RemoteCache(client, prefix="tfmkt:", lock_ttl=5.0, lock_wait=5.0)
+        monkeypatch.setattr("app.services.base.remote_cache", cache)
+
+    kwargs = {"competition_id": "GB1", "season_id": "2024"}
+    url = TransfermarktCompetitionClubs.upstream_urls(**kwargs)[0]
+    machine()
+    started = time.time()
+    fetched = TransfermarktCompetitionClubs(session=static_session({url: (200, COMPETITION_PAGE, {})}), **kwargs)
+
+    time.sleep(0.01)
+    machine()
+    cached = TransfermarktCompetitionClubs(session=static_session({}), **kwargs)
+    created = create(TransfermarktCompetitionClubs, {}, **kwargs)
+
+    assert cached.get_competition_clubs() == fetched.get_competition_clubs()
+    assert created.get_competition_clubs() == fetched.get_competition_clubs()
+    # The pages keep the time the first machine fetched them
+    assert fetched.fetched_at is None
+    assert started <= cached.fetched_at == created.fetched_at < time.time() - 0.01
+    assert f"tfmkt:lock:page:{url}".encode() not in resp_server.data
@@ -0,0 +1,234 @@
+import pytest
+
+from app.schemas import clubs, competitions, players
+from app.services.clubs.players import TransfermarktClubPlayers
+from app.services.clubs.profile import TransfermarktClubProfile
+from app.services.clubs.search import TransfermarktClubSearch
+from app.services.competitions.clubs import TransfermarktCompetitionClubs
+from app.services.competitions.search import TransfermarktCompetitionSearch
+from app.services.players.achievements import TransfermarktPlayerAchievements
+from app.services.players.injuries import TransfermarktPlayerInjuries
+from app.services.players.jersey_numbers import TransfermarktPlayerJerseyNumbers
+from app.services.players.market_value import TransfermarktPlayerMarketValue
+from app.services.players.profile import TransfermarktPlayerProfile
+from app.services.players.search import TransfermarktPlayerSearch
+from app.services.players.stats import TransfermarktPlayerStats
+from app.services.players.transfers import TransfermarktPlayerTransfers
+from app.settings import settings
+from app.utils import parsers
+from app.utils.labels import LabelIndex
+from app.utils.parsers import LexborElement
+from app.utils.revalidation import validator_store
+from app.utils.xpath import evaluate
+
+SERVICES = [
+    (TransfermarktClubPlayers, {"club_id": "11"}, "get_club_players", ["clubs_players.html"]),
+    (TransfermarktClubPlayers, {"club_id": "11", "season_id": "2024"}, "get_club_players", ["clubs_players.html"]),
+    (TransfermarktClubPlayers, {"club_id": "11", "season_id": "2019"}, "get_club_players", ["clubs_players_past.html"]),
+    (TransfermarktClubProfile, {"club_id": "11"}, "get_club_profile", ["clubs_profile.html"]),
+    (TransfermarktClubSearch, {"query": "arsenal"}, "search_clubs", ["search.html"]),
+    (TransfermarktCompetitionClubs, {"competition_id": "GB1"}, "get_competition_clubs", ["competitions_clubs.html"]),
+    (TransfermarktCompetitionSearch, {"query": "arsenal"}, "search_competitions", ["search.html"]),
+    (
+        TransfermarktPlayerAchievements,
+        {"player_id": "316264"},
+        "get_player_achievements",
+        ["players_achievements.html"],
+    ),
+    (TransfermarktPlayerInjuries, {"player_id": "316264"}, "get_player_injuries", ["players_injuries.html"]),
+    (
+        TransfermarktPlayerJerseyNumbers,
+        {"player_id": "316264"},
+        "get_player_jersey_numbers",
+        ["players_jersey_numbers.html"],
+    ),
+    (
+        TransfermarktPlayerMarketValue,
+        {"player_id": "316264"},
+        "get_player_market_value",
+        ["players_market_value.html", "players_market_value.json"],
+    ),
+    (TransfermarktPlayerProfile, {"player_id": "316264"}, "get_player_profile", ["players_profile.html"]),
+    (TransfermarktPlayerProfile, {"player_id": "316264"}, "get_player_profile", ["players_profile_option.html"]),
+    (TransfermarktPlayerProfile, {"player_id": "316264"}, "get_player_profile", ["players_profile_retired.html"]),
+    (TransfermarktPlayerSearch, {"query": "arsenal"}, "search_players", ["search.html"]),
+    (TransfermarktPlayerStats, {"player_id": "316264"}, "get_player_stats", ["players_stats.html"]),
+    (
+        TransfermarktPlayerTransfers,
+        {"player_id": "316264"},
+        "get_player_transfers",
+        ["players_transfers.html", "players_transfers.json"],
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "service,kwargs,method,fixtures",
+    SERVICES,
+    ids=[f"{s[0].__name__}-{s[3][0]}" for s in SERVICES],
+)
+def test_lxml_parse_matches_bsoup_parse(static_session, load_fixture, monkeypatch, service, kwargs, method, fixtures):
+    routes = dict(zip(service.upstream_urls(**kwargs), map(load_fixture, fixtures)))
+    monkeypatch.setattr(service, "STREAM_UNTIL", ())
+
+    def extract(parser: str) -> dict:
+        monkeypatch.setattr(service, "PARSER", parser)
+        return getattr(service(session=static_session(routes), **kwargs), method)()
+
+    expected = extract(parser="bs4")
+    actual = extract(parser="lxml")
+
+    assert actual == expected
+    assert any(value for value in expected.values() if not isinstance(value, str))
+
+
+def key_paths(value, path: str = "") -> set:
+    if isinstance(value, dict):
+        return {f"{path}/{key}" for key in value} | {
+            sub for key, item in value.items() for sub in key_paths(item, f"{path}/{key}")
+        }
+    if isinstance(value, list):
+        return {sub for item in value for sub in key_paths(item, f"{path}[]")}
+    return set()
+
+
+# The response model of the endpoint of each service
+MODELS = {
+    TransfermarktClubPlayers: clubs.ClubPlayers,
+    TransfermarktClubProfile: clubs.ClubProfile,
+    TransfermarktClubSearch: clubs.ClubSearch,
+    TransfermarktCompetitionClubs: competitions.CompetitionClubs,
+    TransfermarktCompetitionSearch: competitions.CompetitionSearch,
+    TransfermarktPlayerAchievements: players.PlayerAchievements,
+    TransfermarktPlayerInjuries: players.PlayerInjuries,
+    TransfermarktPlayerJerseyNumbers: players.PlayerJerseyNumbers,
+    TransfermarktPlayerMarketValue: players.PlayerMarketValue,
+    TransfermarktPlayerProfile: players.PlayerProfile,
+    TransfermarktPlayerSearch: players.PlayerSearch,
+    TransfermarktPlayerStats: players.PlayerStats,
+    TransfermarktPlayerTransfers: players.PlayerTransfers,
+}
+
+
+@pytest.mark.parametrize(
+    "service,kwargs,method,fixtures",
+    SERVICES,
+    ids=[f"{s[0].__name__}-{s[3][0]}" for s in SERVICES],
+)
+def test_parse_fills_the_response_model(static_session, load_fixture, service, kwargs, method, fixtures):
+    routes = dict(zip(service.upstream_urls(**kwargs), map(load_fixture, fixtures)))
+    data = getattr(service(session=static_session(routes), **kwargs), method)()
+
+    model = MODELS[service].model_validate(data)
+
+    assert key_paths(model.model_dump(by_alias=True, exclude_unset=True)) == key_paths(data)
+
+
+# The services reading their page only through selectors that have a CSS equivalent
+LEXBOR_SERVICES = [
+    entry
+    for entry in SERVICES
+    if entry[0]
+    in (
+        TransfermarktCompetitionClubs,
+        TransfermarktPlayerInjuries,
+        TransfermarktPlayerJerseyNumbers,
+        TransfermarktPlayerStats,
+    )
+]
+
+
+@pytest.mark.parametrize(
+    "service,kwargs,method,fixtures",
+    LEXBOR_SERVICES,
+    ids=[f"{s[0].__name__}-{s[3][0]}" for s in LEXBOR_SERVICES],
+)
+def test_lexbor_parse_matches_lxml_parse(static_session, load_fixture, monkeypatch, service, kwargs, method, fixtures):
+    pytest.importorskip("selectolax")
+    routes = dict(zip(service.upstream_urls(**kwargs), map(load_fixture, fixtures)))
+    monkeypatch.setattr(service, "STREAM_UNTIL", ())
+
+    expected = getattr(service(session=static_session(routes), **kwargs), method)()
+    monkeypatch.setattr(settings, "PARSER_BACKENDS", {service.__name__: "lexbor"})
+    tfmkt = service(session=static_session(routes), **kwargs)
+    actual = getattr(tfmkt, method)()
+
+    assert isinstance(tfmkt.page, LexborElement)
+    assert actual == expected
+
+
+@pytest.mark.parametrize(
+    "service,kwargs,method,fixtures",
+    SERVICES,
+    ids=[f"{s[0].__name__}-{s[3][0]}" for s in SERVICES],
+)
+def test_pruned_parse_matches_full_parse(static_session, load_fixture, monkeypatch, service, kwargs, method, fixtures):
+    routes = dict(zip(service.upstream_urls(**kwargs), map(load_fixture, fixtures)))
+
+    regions = service.REGIONS
+    tfmkt = service(session=static_session(routes), **kwargs)
+    actual = getattr(tfmkt, method)()
+    monkeypatch.setattr(service, "REGIONS", ())
+    monkeypatch.setattr(parsers, "empty_boilerplate", lambda element: None)
+    expected = getattr(service(session=static_session(routes), **kwargs), method)()
+
+    assert actual == expected
+    assert [element.tag for element in tfmkt.page.find("body")] == [
+        evaluate(tfmkt.page, region)[0].tag for region in regions
+    ]
+
+
+PROFILE_SERVICES = [entry for entry in SERVICES if entry[0] in (TransfermarktClubProfile, TransfermarktPlayerProfile)]
+
+
+@pytest.mark.parametrize(
+    "service,kwargs,method,fixtures",
+    PROFILE_SERVICES,
+    ids=[f"{s[0].__name__}-{s[3][0]}" for s in PROFILE_SERVICES],
+)
+def test_label_index_matches_selectors(static_session, load_fixture, monkeypatch, service, kwargs, method, fixtures):
+    routes = dict(zip(service.upstream_urls(**kwargs), map(load_fixture, fixtures)))
+
+    actual = getattr(service(session=static_session(routes), **kwargs), method)()
+    monkeypatch.setattr(LabelIndex, "lookup", lambda self, xpath: None)
+    expected = getattr(service(session=static_session(routes), **kwargs), method)()
+
+    assert actual == expected
+
+
+STREAMED_SERVICES = [entry for entry in SERVICES if entry[0].STREAM_UNTIL]
+
+
+@pytest.mark.parametrize(
+    "service,kwargs,method,fixtures",
+    STREAMED_SERVICES,
+    ids=[f"{s[0].__name__}-{s[3][0]}" for s in STREAMED_SERVICES],
+)
+def test_streamed_parse_matches_downloaded_parse(
+    static_session,
+    load_fixture,
+    monkeypatch,
+    service,
+    kwargs,
+    method,
+    fixtures,
+):
+    url = service.upstream_urls(**kwargs)[0]
+    page = load_fixture(fixtures[0])
+    monkeypatch.setattr(settings, "HTTP_STREAM_CHUNK_SIZE", 256)
+
+    actual = getattr(service(session=static_session({url: (200, page, {"ETag": '"v1"'})}), **kwargs), method)()
+    streamed = validator_store.get(url).content
+    monkeypatch.setattr(service, "STREAM_UNTIL", ())
+    expected = getattr(service(session=static_session({url: page}), **kwargs), method)()
+
+    assert actual == expected
+    assert len(streamed) < len(page)
+
+
+def test_club_players_reads_current_season(static_session, load_fixture):
+    routes = {TransfermarktClubPlayers.upstream_urls(club_id="11")[0]: load_fixture("clubs_players.html")}
+
+    tfmkt = TransfermarktClubPlayers(session=static_session(routes), club_id="11")
+
+    assert tfmkt.season_id == "2024"
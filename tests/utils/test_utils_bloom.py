@@ -0,0 +1,56 @@
+from app.utils.bloom import BloomFilter, RotatingBloomFilter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=1e-3)
+    for index in range(1000):
+        bloom.add(f"player_id:{index}")
+
+    assert all(f"player_id:{index}" in bloom for index in range(1000))
+    assert bloom.count == 1000
+
+
+def test_bloom_filter_false_positive_rate_at_capacity():
+    bloom = BloomFilter(capacity=1000, error_rate=1e-2)
+    for index in range(1000):
+        bloom.add(f"player_id:{index}")
+
+    false_positives = sum(f"club_id:{index}" in bloom for index in range(10000))
+    assert false_positives < 300
+    # About 9.6 bits per item for 1%
+    assert len(bloom.bits) < 1250
+
+
+def test_rotating_bloom_filter_forgets_after_two_lifetimes():
+    clock = FakeClock()
+    bloom = RotatingBloomFilter(capacity=100, error_rate=1e-6, lifetime=60, clock=clock)
+    bloom.add("player_id:0")
+
+    clock.now = 90
+    assert "player_id:0" in bloom
+    bloom.add("player_id:1")
+
+    clock.now = 150
+    assert "player_id:0" not in bloom
+    assert "player_id:1" in bloom
+
+    clock.now = 300
+    assert "player_id:1" not in bloom
+    assert bloom.stats() == {"items": 0, "bytes": len(BloomFilter(100, 1e-6).bits), "rejected": 2}
+
+
+def test_rotating_bloom_filter_rotates_when_full():
+    bloom = RotatingBloomFilter(capacity=2, error_rate=1e-6, lifetime=60, clock=FakeClock())
+    for index in range(3):
+        bloom.add(f"player_id:{index}")
+
+    assert all(f"player_id:{index}" in bloom for index in range(3))
+    assert bloom.stats()["items"] == 1
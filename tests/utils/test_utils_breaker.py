@@ -0,0 +1,111 @@
+import pytest
+from fastapi import HTTPException
+
+from app.services.competitions.clubs import TransfermarktCompetitionClubs
+from app.utils.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakers
+from app.utils.ratelimit import RateLimiter
+
+PAGE = b"""
+<html><body>
+<div class="data-header__headline-container"><h1>Premier League</h1></div>
+</body></html>
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def build_breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        window=10,
+        min_calls=4,
+        failure_rate=0.5,
+        slow_call_duration=2,
+        slow_call_rate=0.5,
+        open_duration=5,
+        probes=1,
+        clock=clock,
+    )
+
+
+def test_breaker_opens_on_failure_rate_and_recovers_after_probe():
+    clock = FakeClock()
+    breaker = build_breaker(clock)
+    for failed in [False, True, False, True]:
+        assert breaker.allow()
+        breaker.record(failed=failed, duration=0.1)
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.now = 5
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record(failed=False, duration=0.1)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_breaker_opens_on_slow_calls_and_reopens_on_failed_probe():
+    clock = FakeClock()
+    breaker = build_breaker(clock)
+    for duration in [3, 3, 0.1, 0.1]:
+        breaker.allow()
+        breaker.record(failed=False, duration=duration)
+    assert breaker.state == OPEN
+
+    clock.now = 5
+    with pytest.raises(HTTPException):
+        with breaker.track():
+            assert breaker.allow()
+            raise HTTPException(status_code=502)
+    assert breaker.state == OPEN
+
+
+def test_breaker_ignores_client_errors_and_forgets_old_calls():
+    clock = FakeClock()
+    breaker = build_breaker(clock)
+    for _ in range(4):
+        with pytest.raises(HTTPException):
+            with breaker.track():
+                raise HTTPException(status_code=404)
+    assert breaker.state == CLOSED
+
+    breaker.record(failed=True, duration=0.1)
+    breaker.record(failed=True, duration=0.1)
+    clock.now = 20
+    breaker.record(failed=True, duration=0.1)
+    assert breaker.state == CLOSED
+
+
+def test_breakers_are_keyed_by_host_and_family():
+    assert CircuitBreakers.key("https://www.transfermarkt.com/ceapi/transferHistory/list/1") == (
+        "www.transfermarkt.com/ceapi"
+    )
+    assert CircuitBreakers.key("https://www.transfermarkt.us/-/profil/spieler/1") == "www.transfermarkt.us/html"
+
+
+def test_open_circuit_serves_stored_page(static_session, monkeypatch):
+    monkeypatch.setattr("app.services.base.rate_limiter", RateLimiter())
+    monkeypatch.setattr("app.services.base.circuit_breakers", CircuitBreakers())
+    url = TransfermarktCompetitionClubs.upstream_urls(competition_id="L1")[0]
+    session = static_session({url: (200, PAGE, {"ETag": '"v1"'})})
+    first = TransfermarktCompetitionClubs(competition_id="L1", session=session)
+
+    breaker = build_breaker(FakeClock())
+    breaker.state = OPEN
+    monkeypatch.setattr(CircuitBreakers, "get", lambda self, url: breaker)
+    second = TransfermarktCompetitionClubs(competition_id="L1", session=session)
+
+    assert second.page is first.page
+    assert len(session.get_adapter(url).sent) == 1
+
+    with pytest.raises(HTTPException) as e:
+        TransfermarktCompetitionClubs(competition_id="unknown", session=session)
+    assert e.value.status_code == 503
@@ -0,0 +1,378 @@
+import asyncio
+import math
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.clubs.profile import ClubProfile
+from app.schemas.players.market_value import PlayerMarketValue
+from app.schemas.players.profile import PlayerProfile
+from app.services.base import InvalidRequestError, UpstreamNotFoundError
+from app.services.clubs.profile import TransfermarktClubProfile
+from app.services.clubs.search import TransfermarktClubSearch
+from app.services.players.market_value import TransfermarktPlayerMarketValue
+from app.services.players.profile import TransfermarktPlayerProfile
+from app.settings import settings
+from app.utils.bloom import RotatingBloomFilter
+from app.utils.cache import NotFoundCache, ResultCache, result_cache, result_key
+from app.utils.codec import loads
+from app.utils.pagecache import DiskPageCache
+from app.utils.remotecache import RemoteCache, build_client
+from app.utils.responses import refresh_tasks, service_response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    result_cache.clear()
+    yield
+    result_cache.clear()
+
+
+def test_result_key_ignores_argument_order():
+    assert result_key("TransfermarktClubPlayers", club_id="11", season_id="2024") == result_key(
+        "TransfermarktClubPlayers",
+        season_id="2024",
+        club_id="11",
+    )
+    assert result_key("TransfermarktClubPlayers", club_id="11") != result_key("TransfermarktClubProfile", club_id="11")
+
+
+def test_result_cache_expires_after_ttl(clock):
+    cache = ResultCache(max_bytes=1024, clock=clock)
+    fetched_at = datetime(2025, 1, 1, 12, 30)
+    cache.set("key", b"{}", ttl=60, fetched_at=fetched_at)
+
+    clock.now = 59
+    cached = cache.get("key")
+    assert cached.content == b"{}"
+    assert cached.age(datetime(2025, 1, 1, 12, 31, 5)) == 65
+
+    clock.now = 60
+    assert cache.get("key") is None
+    assert cache.stats() == {
+        "entries": 0,
+        "bytes": 0,
+        "hits": 1,
+        "staleHits": 0,
+        "misses": 1,
+        "evictions": 0,
+        "refreshes": 0,
+    }
+
+
+def test_result_cache_evicts_least_recently_used_by_size(clock):
+    cache = ResultCache(max_bytes=10, clock=clock)
+    fetched_at = datetime(2025, 1, 1)
+    cache.set("a", b"aaaa", ttl=60, fetched_at=fetched_at)
+    cache.set("b", b"bbbb", ttl=60, fetched_at=fetched_at)
+    cache.get("a")
+    cache.set("c", b"cccc", ttl=60, fetched_at=fetched_at)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_result_cache_skips_oversized_and_uncached_results(clock):
+    cache = ResultCache(max_bytes=4, clock=clock)
+    cache.set("large", b"large", ttl=60, fetched_at=datetime(2025, 1, 1))
+    cache.set("disabled", b"{}", ttl=0, fetched_at=datetime(2025, 1, 1))
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_result_cache_keeps_stale_results_for_grace(clock):
+    cache = ResultCache(max_bytes=1024, clock=clock)
+    cache.set("key", b"{}", ttl=60, fetched_at=datetime(2025, 1, 1), grace=30)
+
+    clock.now = 70
+    cached = cache.get("key")
+    assert cache.is_stale(cached)
+    assert cache.needs_refresh(cached)
+
+    clock.now = 90
+    assert cache.get("key") is None
+    assert cache.stats()["staleHits"] == 1
+
+
+def test_result_cache_draws_early_refreshes(clock):
+    draws = [0.0, 1 - math.exp(-20)]
+    cache = ResultCache(max_bytes=1024, beta=1.0, clock=clock, random=draws.pop)
+    cached = cache.set("key", b"{}", ttl=60, fetched_at=datetime(2025, 1, 1), delta=1.0)
+    untimed = cache.set("untimed", b"{}", ttl=60, fetched_at=datetime(2025, 1, 1))
+
+    clock.now = 50
+    # -delta * log(1 - draw) is 20 seconds, then 0
+    assert cache.needs_refresh(cached)
+    assert not cache.needs_refresh(cached)
+    assert not cache.needs_refresh(untimed)
+    assert not cache.is_stale(cached)
+
+
+def test_result_cache_claims_refresh_once(clock):
+    cache = ResultCache(max_bytes=1024, clock=clock)
+    cached = cache.set("key", b"{}", ttl=60, fetched_at=datetime(2025, 1, 1))
+
+    assert cache.claim_refresh(cached)
+    assert not cache.claim_refresh(cached)
+    cache.release_refresh(cached)
+    assert cache.claim_refresh(cached)
+    assert cache.stats()["refreshes"] == 2
+
+
+def test_not_found_cache_expires_after_ttl(clock):
+    cache = NotFoundCache(max_entries=2, clock=clock)
+    cache.set("a", "Invalid request", ttl=60)
+    cache.set("disabled", "Invalid request", ttl=0)
+
+    clock.now = 59
+    assert cache.get("a") == "Invalid request"
+    assert cache.get("disabled") is None
+
+    clock.now = 60
+    assert cache.get("a") is None
+    assert cache.stats() == {"entries": 0, "hits": 1}
+
+
+def test_not_found_cache_evicts_least_recently_used(clock):
+    cache = NotFoundCache(max_entries=2, clock=clock)
+    cache.set("a", "a", ttl=60)
+    cache.set("b", "b", ttl=60)
+    cache.get("a")
+    cache.set("c", "c", ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+    assert cache.get("c") == "c"
+
+
+def test_cache_ttl_overridden_per_service(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_TTLS", {"TransfermarktClubSearch": 30.0})
+    monkeypatch.setattr(settings, "CACHE_GRACES", {"TransfermarktClubSearch": 0.0})
+
+    assert TransfermarktClubSearch.get_cache_ttl() == 30.0
+    assert TransfermarktClubSearch.get_cache_grace() == 0.0
+    assert TransfermarktClubProfile.get_cache_ttl() == TransfermarktClubProfile.CACHE_TTL
+    assert TransfermarktClubProfile.get_cache_grace() == TransfermarktClubProfile.CACHE_GRACE
+
+
+def test_service_response_serves_cached_result(static_session, load_fixture, monkeypatch, resp_server):
+    routes = {TransfermarktClubProfile.upstream_urls(club_id="11")[0]: load_fixture("clubs_profile.html")}
+    monkeypatch.setattr(TransfermarktClubProfile, "STREAM_UNTIL", ())
+    created = []
+
+    async def create(**kwargs):
+        created.append(kwargs)
+        return TransfermarktClubProfile(session=static_session(routes), **kwargs)
+
+    monkeypatch.setattr(TransfermarktClubProfile, "create", create)
+    remote_cache = RemoteCache(build_client(resp_server.url, timeout=1.0), prefix="tfmkt:", lock_ttl=5.0, lock_wait=5.0)
+    monkeypatch.setattr("app.utils.responses.remote_cache", remote_cache)
+
+    def respond():
+        return asyncio.run(
+            service_response(
+                TransfermarktClubProfile,
+                "get_club_profile",
+                ClubProfile,
+                {"club_id": "11"},
+                exclude_defaults=True,
+            ),
+        )
+
+    miss, hit = respond(), respond()
+
+    assert created == [{"club_id": "11"}]
+    assert miss.headers["X-Cache"] == "MISS"
+    assert miss.headers["Age"] == "0"
+    assert hit.headers["X-Cache"] == "HIT"
+    assert int(hit.headers["Age"]) >= 0
+    assert hit.body == miss.body
+    assert loads(hit.body)["id"] == "11"
+    assert result_cache.stats()["hits"] == 1
+
+    # Another machine, with an empty result cache, reads the result from the remote cache
+    result_cache.clear()
+    shared = respond()
+    assert created == [{"club_id": "11"}]
+    assert shared.headers["X-Cache"] == "HIT"
+    assert shared.body == miss.body
+
+
+def test_service_response_serves_stale_result_while_refreshing(static_session, load_fixture, monkeypatch, clock):
+    routes = {TransfermarktClubProfile.upstream_urls(club_id="11")[0]: load_fixture("clubs_profile.html")}
+    monkeypatch.setattr(TransfermarktClubProfile, "STREAM_UNTIL", ())
+    monkeypatch.setattr(result_cache, "clock", clock)
+    monkeypatch.setattr(result_cache, "beta", 0.0)
+    created, failing = [], []
+
+    async def create(**kwargs):
+        created.append(kwargs)
+        if failing:
+            raise HTTPException(status_code=503, detail="Service unavailable")
+        return TransfermarktClubProfile(session=static_session(routes), **kwargs)
+
+    monkeypatch.setattr(TransfermarktClubProfile, "create", create)
+
+    async def respond(count: int = 1) -> list:
+        responses = await asyncio.gather(
+            *(
+                service_response(TransfermarktClubProfile, "get_club_profile", ClubProfile, {"club_id": "11"})
+                for _ in range(count)
+            ),
+        )
+        await asyncio.gather(*refresh_tasks)
+        return responses
+
+    refreshes = result_cache.stats()["refreshes"]
+    (miss,) = asyncio.run(respond())
+    clock.now = TransfermarktClubProfile.CACHE_TTL + 1
+    failing.append(True)
+    (failed,) = asyncio.run(respond())
+    failing.clear()
+    stale = asyncio.run(respond(count=3))
+    (refreshed,) = asyncio.run(respond())
+
+    assert len(created) == 3
+    assert failed.headers["X-Cache"] == "STALE"
+    assert [response.headers["X-Cache"] for response in stale] == ["STALE"] * 3
+    assert all(response.body == miss.body for response in stale)
+    assert refreshed.headers["X-Cache"] == "HIT"
+    assert result_cache.stats()["refreshes"] == refreshes + 2
+
+    clock.now += TransfermarktClubProfile.CACHE_TTL + TransfermarktClubProfile.CACHE_GRACE
+    (expired,) = asyncio.run(respond())
+    assert expired.headers["X-Cache"] == "MISS"
+
+
+def test_early_refresh_skips_cached_pages(static_session, load_fixture, monkeypatch, tmp_path):
+    url = TransfermarktClubProfile.upstream_urls(club_id="11")[0]
+    downloads = []
+
+    def page(request):
+        downloads.append(request.url)
+        return 200, load_fixture("clubs_profile.html"), {}
+
+    monkeypatch.setattr("app.services.base.page_cache", DiskPageCache(directory=str(tmp_path), max_bytes=1 << 20))
+    monkeypatch.setattr(TransfermarktClubProfile, "STREAM_UNTIL", ())
+
+    async def create(**kwargs):
+        return TransfermarktClubProfile(session=static_session({url: page}), **kwargs)
+
+    monkeypatch.setattr(TransfermarktClubProfile, "create", create)
+
+    async def respond():
+        response = await service_response(TransfermarktClubProfile, "get_club_profile", ClubProfile, {"club_id": "11"})
+        await asyncio.gather(*refresh_tasks)
+        return response
+
+    miss = asyncio.run(respond())
+    cached = result_cache.get(result_key("TransfermarktClubProfile", club_id="11"))
+    # A fresh result drawn for an early refresh, while its page is still in the page cache
+    monkeypatch.setattr(result_cache, "needs_refresh", lambda entry: entry is cached)
+    hit = asyncio.run(respond())
+    refreshed = result_cache.get(result_key("TransfermarktClubProfile", club_id="11"))
+
+    assert [miss.headers["X-Cache"], hit.headers["X-Cache"]] == ["MISS", "HIT"]
+    assert len(downloads) == 2
+    assert refreshed.fetched_at > cached.fetched_at
+
+
+def test_service_response_rejects_known_invalid_ids(monkeypatch, clock):
+    not_found_cache = NotFoundCache(max_entries=100, clock=clock)
+    invalid_ids = RotatingBloomFilter(capacity=100, error_rate=1e-6, lifetime=3600, clock=clock)
+    monkeypatch.setattr("app.utils.responses.not_found_cache", not_found_cache)
+    monkeypatch.setattr("app.utils.responses.invalid_ids", invalid_ids)
+    created = []
+
+    async def create(**kwargs):
+        created.append(kwargs)
+        url = TransfermarktPlayerProfile.upstream_urls(**kwargs)[0]
+        raise UpstreamNotFoundError(url, detail="Client Error. Not Found for url: profile")
+
+    monkeypatch.setattr(TransfermarktPlayerProfile, "create", create)
+    monkeypatch.setattr(TransfermarktPlayerMarketValue, "create", create)
+
+    def respond(service, method, schema):
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(service_response(service, method, schema, {"player_id": "0"}))
+        assert e.value.status_code == 404
+        return e.value.detail
+
+    detail = "Client Error. Not Found for url: profile"
+    assert respond(TransfermarktPlayerProfile, "get_player_profile", PlayerProfile) == detail
+    assert respond(TransfermarktPlayerProfile, "get_player_profile", PlayerProfile) == detail
+    # Another service reading the same player is rejected too
+    detail = respond(TransfermarktPlayerMarketValue, "get_player_market_value", PlayerMarketValue)
+    assert detail == f"Invalid request (url: {TransfermarktPlayerMarketValue.upstream_urls(player_id='0')[0]})"
+
+    assert created == [{"player_id": "0"}]
+    assert not_found_cache.stats() == {"entries": 1, "hits": 1}
+    assert invalid_ids.stats()["rejected"] == 1
+
+    # Once the not found outcome expires, the id is still known invalid
+    clock.now = settings.CACHE_NOT_FOUND_TTL
+    respond(TransfermarktPlayerProfile, "get_player_profile", PlayerProfile)
+    assert created == [{"player_id": "0"}]
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        # As mirrored from the market value chart, not the profile page
+        UpstreamNotFoundError(
+            TransfermarktPlayerMarketValue.upstream_urls(player_id="28003")[1],
+            detail="Client Error. Not Found for url: chart",
+        ),
+        # As for a captcha or consent page served in place of the profile
+        InvalidRequestError(status_code=404, detail="Invalid request (url: profile)"),
+    ],
+)
+def test_service_response_keeps_other_not_found_errors_short(monkeypatch, clock, error):
+    not_found_cache = NotFoundCache(max_entries=100, clock=clock)
+    invalid_ids = RotatingBloomFilter(capacity=100, error_rate=1e-6, lifetime=3600, clock=clock)
+    monkeypatch.setattr("app.utils.responses.not_found_cache", not_found_cache)
+    monkeypatch.setattr("app.utils.responses.invalid_ids", invalid_ids)
+    created = []
+
+    async def create(**kwargs):
+        created.append(kwargs)
+        raise error
+
+    monkeypatch.setattr(TransfermarktPlayerMarketValue, "create", create)
+
+    def respond():
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(
+                service_response(
+                    TransfermarktPlayerMarketValue,
+                    "get_player_market_value",
+                    PlayerMarketValue,
+                    {"player_id": "28003"},
+                ),
+            )
+        return e.value.status_code
+
+    assert [respond(), respond()] == [404, 404]
+    assert len(created) == 1
+    assert invalid_ids.stats()["items"] == 0
+
+    clock.now = settings.CACHE_NOT_FOUND_TTL
+    respond()
+    assert len(created) == 2
@@ -0,0 +1,34 @@
+import pytest
+from starlette.responses import JSONResponse
+
+from app.utils import codec
+from app.utils.codec import FastJSONResponse, dumps, loads
+
+CONTENT = {
+    "id": "316264",
+    "marketValue": "€90.00m",
+    "marketValueHistory": [{"date": "2024-06-03", "age": 25, "clubName": "Arsenal FC", "marketValue": 90000000}],
+    "retired": False,
+    "injury": None,
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(codec, "orjson", None)
+    return request.param
+
+
+def test_dumps_matches_starlette(backend):
+    assert dumps(CONTENT) == JSONResponse(CONTENT).body
+    assert FastJSONResponse(CONTENT).body == JSONResponse(CONTENT).body
+
+
+def test_loads_round_trip(backend):
+    assert loads(dumps(CONTENT)) == CONTENT
+    assert loads(dumps(CONTENT).decode("utf-8")) == CONTENT
+    with pytest.raises(ValueError):
+        loads(b'{"list": [}')
@@ -0,0 +1,51 @@
+from datetime import date
+
+import pytest
+from dateutil import parser
+
+from app.utils.coercion import parse_date, parse_number
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Jun 30, 2028", "Sep 5, 2001", "Dec 1, 1886", "2024-06-30", "30.06.2028", "JUN 30, 2028", "Sept 5, 2001"],
+)
+def test_parse_date_matches_dateutil(text):
+    assert parse_date(text) == parser.parse(text).date()
+
+
+@pytest.mark.parametrize("text", [None, "", "-", "?", "Feb 30, 2024", "2024-13-01", "Sep 5, 2001 (23)"])
+def test_parse_date_without_date(text):
+    assert parse_date(text) is None
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("€1.50m", 1_500_000),
+        ("€500k", 500_000),
+        ("€1.34bn", 1_340_000_000),
+        ("&#8364;2.00m", 2_000_000),
+        ("+€2.00m", 2_000_000),
+        ("€-86.40m", -86_400_000),
+        ("25", 25),
+        ("1.234'", 1),
+        (" 12 ", 12),
+        (25, 25),
+        ("-", None),
+        ("free transfer", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_parse_number(value, expected):
+    assert parse_number(value) == expected
+
+
+def test_parse_number_not_a_number():
+    with pytest.raises(ValueError):
+        parse_number("loan fee:€1.00m")
+
+
+def test_parse_date_passes_dates_through():
+    assert parse_date(date(2028, 6, 30)) == date(2028, 6, 30)
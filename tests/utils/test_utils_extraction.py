@@ -0,0 +1,121 @@
+import pytest
+from lxml import etree
+
+from app.services.clubs.search import TransfermarktClubSearch
+from app.services.competitions.search import TransfermarktCompetitionSearch
+from app.services.players.achievements import TransfermarktPlayerAchievements
+from app.services.players.injuries import TransfermarktPlayerInjuries
+from app.services.players.search import TransfermarktPlayerSearch
+from app.services.players.stats import TransfermarktPlayerStats
+from app.utils.extraction import ExtractionPlan
+from app.utils.xpath import Clubs, Competitions, Players, evaluate
+
+PAGE = """
+<html><body><div id="grid">
+<div class="row"><p>one <b>bold</b> x<i title="inner">x</i></p><a href="/1" title="first"><img title="flag"></a></div>
+<div class="row"><p>outer<p>inner</p>after</p><span>a<!-- comment -->b</span><em> </em></div>
+<div class="row"><div class="row"><p>nested</p></div><a href="/3">third</a></div>
+<div class="row"></div>
+</div><p>outside</p></body></html>
+"""
+FIELDS = [
+    ".//p//text()",
+    ".//p/text()",
+    "./p/text()",
+    ".//text()",
+    "./text()",
+    ".//a/@href",
+    ".//a//@title",
+    ".//@title",
+    ".//p",
+    ".//span/node()",
+    ".//a[contains(@href, '/1')]/@title",
+    ".//p[1]//text()",
+    ".//p/following::a//text()",
+    "//p//text()",
+    "../p//text()",
+]
+
+
+@pytest.mark.parametrize("rows", ["//div[@class='row']", ".//div[@class='row']", "//div[@id='grid']"])
+def test_plan_matches_xpath_per_row(rows):
+    page = etree.HTML(PAGE)
+    plan = ExtractionPlan(rows=rows, fields=FIELDS)
+    extractions = plan.extract(page)
+
+    assert [extraction.node for extraction in extractions] == evaluate(page, rows)
+    for extraction in extractions:
+        assert {xpath: extraction.evaluate(xpath) for xpath in FIELDS} == {
+            xpath: extraction.node.xpath(xpath) for xpath in FIELDS
+        }
+
+
+NESTED_FIELDS = [".//span//@href", ".//span//text()", ".//span/@href", ".//span", ".//b//text()"]
+
+
+@pytest.mark.parametrize(
+    "page",
+    [
+        '<div><span><span><span href="/h3"/></span></span><span/><span/></div>',
+        '<div><span href="/1"><b>a</b><span><b>b</b><span href="/3">c<b>d</b></span></span></span><span/></div>',
+    ],
+)
+def test_plan_matches_xpath_per_nested_row(page):
+    root = etree.HTML(page)
+    plan = ExtractionPlan(rows=".//span", fields=NESTED_FIELDS)
+
+    for extraction in plan.extract(root):
+        assert {xpath: extraction.evaluate(xpath) for xpath in NESTED_FIELDS} == {
+            xpath: extraction.node.xpath(xpath) for xpath in NESTED_FIELDS
+        }
+
+
+def test_nested_plan_matches_xpath_per_row():
+    page = etree.HTML(PAGE)
+    cells = ExtractionPlan(rows=".//p", fields=["./text()", ".//text()"])
+    plan = ExtractionPlan(rows="//div[@class='row']", fields=[".//a/@href"], plans=[cells])
+
+    for extraction in plan.extract(page):
+        children = extraction.extract(cells)
+        assert [child.node for child in children] == extraction.node.xpath(".//p")
+        assert [child.evaluate("./text()") for child in children] == [
+            child.node.xpath("./text()") for child in children
+        ]
+        assert extraction.evaluate(".//a/@href") == extraction.node.xpath(".//a/@href")
+
+
+def test_plan_without_rows_extracts_context():
+    page = etree.HTML(PAGE)
+    grid = evaluate(page, "//div[@id='grid']")[0]
+    (extraction,) = ExtractionPlan(fields=[".//a/@href", ".//a//text()"]).extract(grid)
+
+    assert extraction.node is grid
+    assert extraction.evaluate(".//a/@href") == ["/1", "/3"]
+    assert extraction.evaluate(".//a//text()") == ["third"]
+
+
+@pytest.mark.parametrize(
+    "page_name,section,plan",
+    [
+        ("players_injuries.html", None, TransfermarktPlayerInjuries.PLAN),
+        ("players_achievements.html", None, TransfermarktPlayerAchievements.PLAN),
+        ("search.html", Players.Search.BASE, TransfermarktPlayerSearch.PLAN),
+        ("players_stats.html", Players.Stats.ITEMS, TransfermarktPlayerStats.PLAN),
+        ("search.html", Clubs.Search.BASE, TransfermarktClubSearch.PLAN),
+        ("search.html", Competitions.Search.BASE, TransfermarktCompetitionSearch.PLAN),
+    ],
+)
+def test_service_plans_match_xpath_per_row(load_fixture, page_name, section, plan):
+    page = etree.HTML(load_fixture(page_name))
+    context = page if section is None else evaluate(page, section)[0]
+
+    def check(plan, extractions, nodes):
+        assert extractions
+        assert [extraction.node for extraction in extractions] == nodes
+        for extraction in extractions:
+            for xpath in plan.fields:
+                assert extraction.evaluate(xpath) == extraction.node.xpath(xpath)
+            for child in plan.plans:
+                check(child, extraction.extract(child), extraction.node.xpath(child.rows))
+
+    check(plan, plan.extract(context), [context] if plan.rows is None else context.xpath(plan.rows))
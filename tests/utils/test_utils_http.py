@@ -0,0 +1,85 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.base import TransfermarktBase
+from app.settings import settings
+from app.utils.http import DEFAULT_HEADERS, build_session, get_session, prewarm_connections
+
+
+def test_build_session_pools():
+    session = build_session()
+    adapter = session.get_adapter("https://www.transfermarkt.com")
+
+    assert adapter._pool_connections == settings.HTTP_POOL_CONNECTIONS
+    assert adapter._pool_maxsize == settings.HTTP_POOL_MAXSIZE
+    assert session.headers["User-Agent"] == DEFAULT_HEADERS["User-Agent"]
+
+
+def test_get_session_is_shared():
+    assert get_session() is get_session()
+    assert TransfermarktBase(URL="https://www.transfermarkt.com").session is get_session()
+
+
+def test_make_request_uses_injected_session(static_session):
+    url = "https://www.transfermarkt.com/-/profil/spieler/1"
+    session = static_session({url: b"<html></html>"})
+    tfmkt = TransfermarktBase(URL=url, session=session)
+
+    assert tfmkt.make_request().content == b"<html></html>"
+    assert session.get_adapter(url).sent[0].headers["User-Agent"] == DEFAULT_HEADERS["User-Agent"]
+
+
+def test_make_request_not_found(static_session):
+    tfmkt = TransfermarktBase(URL="https://www.transfermarkt.com/-/profil/spieler/0", session=static_session({}))
+
+    with pytest.raises(HTTPException) as e:
+        tfmkt.make_request()
+    assert e.value.status_code == 404
+
+
+def test_prewarm_connections(static_session):
+    session = static_session({url: b"" for url in settings.HTTP_PREWARM_URLS})
+    prewarm_connections(session)
+
+    adapter = session.get_adapter(settings.HTTP_PREWARM_URLS[0])
+    assert sorted(request.url.rstrip("/") for request in adapter.sent) == sorted(
+        settings.HTTP_PREWARM_URLS * settings.HTTP_PREWARM_CONNECTIONS,
+    )
+
+
+def test_prewarm_connections_opens_pooled_connections(monkeypatch):
+    ports = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_HEAD(self):
+            ports.append(self.client_address[1])
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    monkeypatch.setattr(settings, "HTTP_PREWARM_URLS", [url])
+    monkeypatch.setattr(settings, "HTTP_PREWARM_CONNECTIONS", 3)
+    session = build_session()
+    try:
+        prewarm_connections(session)
+        warmed = set(ports)
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda _: session.head(url).content, range(3)))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert len(warmed) == 3
+    assert set(ports[3:]) <= warmed
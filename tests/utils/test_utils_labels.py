@@ -0,0 +1,63 @@
+import pytest
+from lxml import etree
+
+from app.utils.labels import LabelIndex
+from app.utils.xpath import SELECTORS, Clubs, Players, evaluate
+
+PAGE = """
+<html><body>
+<div class="info-table">
+<span>Height:</span><span>1,78&nbsp;m</span>
+<span>Joined:</span><span><a href="/club">Aug 20, 2021</a></span>
+<span>Foot:</span><span>left</span>
+<span>Foot:</span><span>right</span>
+<span>Agent: <b>relatives</b></span><span>Ginés Carvajal</span>
+<span>Contract expires:</span>
+</div>
+<span>Jun 30, 2028</span>
+</body></html>
+""".encode()
+
+
+@pytest.mark.parametrize(
+    "xpath",
+    [
+        ".//span[text()='Height:']//following::span[1]//text()",
+        ".//span[contains(text(),'Joined')]//following::span[1]//a//@href",
+        ".//span[text()='Joined:']//following::span[2]",
+        ".//span[text()='Foot:']//following::span[1]//text()",
+        ".//span[contains(text(),'Agent')]//following::span[1]//text()",
+        ".//span[contains(text(),'Contract expires')]//following::span[1]//text()",
+        ".//span[text()='Weight:']//following::span[1]//text()",
+        ".//span[text()='Height:']",
+    ],
+)
+def test_label_index_matches_xpath(xpath):
+    page = etree.HTML(PAGE)
+    section = evaluate(page, "//div[@class='info-table']")[0]
+
+    assert LabelIndex(section, ("span",)).evaluate(xpath) == evaluate(section, xpath)
+
+
+@pytest.mark.parametrize(
+    "name,fixture,section,tags",
+    [
+        ("Players.Profile", "players_profile.html", Players.Profile.INFO_TABLE, ("span",)),
+        ("Players.Profile", "players_profile.html", Players.Profile.HEADER, ("span",)),
+        ("Players.Profile", "players_profile.html", None, ("span",)),
+        ("Players.Profile", "players_profile_option.html", Players.Profile.INFO_TABLE, ("span",)),
+        ("Players.Profile", "players_profile_option.html", None, ("span",)),
+        ("Players.Profile", "players_profile_retired.html", Players.Profile.HEADER, ("span",)),
+        ("Players.Profile", "players_profile_retired.html", None, ("span",)),
+        ("Clubs.Profile", "clubs_profile.html", Clubs.Profile.HEADER, ("li",)),
+        ("Clubs.Profile", "clubs_profile.html", None, ("th", "td")),
+    ],
+)
+def test_label_index_matches_profile_selectors(load_fixture, name, fixture, section, tags):
+    page = etree.HTML(load_fixture(fixture))
+    root = evaluate(page, section)[0] if section else page
+    index = LabelIndex(root, tags)
+
+    for selector, xpath in SELECTORS.items():
+        if selector.startswith(name + "."):
+            assert index.evaluate(xpath.path) == evaluate(root, xpath.path), selector
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from app.utils.pagecache import DiskPageCache
+
+URL = "https://www.transfermarkt.com/-/profil/spieler/28003"
+PAGE = b"<html><head><script>var tracking = 1;</script></head><body><h1>Lionel Messi</h1></body></html>"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return DiskPageCache(directory=str(tmp_path), max_bytes=1024 * 1024, clock=clock)
+
+
+def test_page_cache_stores_pages(cache, clock):
+    cache.set(URL, PAGE)
+
+    assert cache.get(URL, max_age=60) == (PAGE, clock.now)
+    assert cache.stats()["hits"] == 1
+
+
+def test_page_cache_expires_after_max_age(cache, clock):
+    cache.set(URL, PAGE)
+
+    clock.now += 60
+    assert cache.get(URL, max_age=60) is None
+    assert cache.get(URL, max_age=3600) is not None
+    assert cache.get(URL, max_age=0) is None
+
+
+def test_page_cache_shared_between_processes(tmp_path, cache, clock):
+    cache.set(URL, PAGE)
+    other = DiskPageCache(directory=str(tmp_path), max_bytes=1024 * 1024, clock=clock)
+
+    assert other.get(URL, max_age=60) == cache.get(URL, max_age=60)
+    assert os.listdir(tmp_path) == [os.path.basename(cache.path(URL))]
+
+
+def test_page_cache_drops_corrupted_files(cache):
+    cache.set(URL, PAGE)
+    with open(cache.path(URL), "r+b") as file:
+        file.truncate(12)
+
+    assert cache.get(URL, max_age=60) is None
+    assert not os.path.exists(cache.path(URL))
+
+
+def test_page_cache_evicts_least_recently_used(tmp_path, clock):
+    pages = {f"https://www.transfermarkt.com/{index}": os.urandom(400) for index in range(3)}
+    cache = DiskPageCache(directory=str(tmp_path), max_bytes=10_000, clock=clock)
+    for age, (url, content) in zip((30, 10, 20), pages.items()):
+        cache.set(url, content)
+        os.utime(cache.path(url), (clock.now - age, clock.now - age))
+    cache.get(next(iter(pages)), max_age=60)
+    cache.max_bytes = 1000
+    cache.evict()
+
+    assert [os.path.exists(cache.path(url)) for url in pages] == [True, True, False]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_page_cache_disabled_without_directory():
+    cache = DiskPageCache(directory=None, max_bytes=1024)
+    cache.set(URL, PAGE)
+
+    assert cache.get(URL, max_age=60) is None
+    assert cache.stats()["enabled"] is False
@@ -0,0 +1,115 @@
+import pytest
+from lxml import etree
+
+from app.services.base import TransfermarktBase
+from app.services.players.injuries import TransfermarktPlayerInjuries
+from app.services.players.profile import TransfermarktPlayerProfile
+from app.settings import settings
+from app.utils.parsers import (
+    LexborParser,
+    LxmlParser,
+    SoupParser,
+    check_parser_backends,
+    get_parser,
+    service_selectors,
+    translate_xpath,
+)
+
+PAGE = b"""
+<html><body><div id="grid">
+<table class="items"><tbody>
+<tr class="odd"><td>1</td><td class="hauptlink"><a href="/a" title="A">A <b>bold</b> tail</a></td><td>x</td></tr>
+<tr class="even"><td>2</td><td class="hauptlink"><a href="/b" title="B">B</a><img title="flag"></td><td></td></tr>
+</tbody></table>
+<span data-x="it's">caf\xc3\xa9</span>
+</div></body></html>
+"""
+SELECTORS = [
+    "//tr",
+    "//table[@class='items']//tr",
+    ".//tr[2]//text()",
+    ".//td[3]/text()",
+    ".//tr//td[1]//text()",
+    ".//td[@class='hauptlink']//a/@href",
+    ".//td[contains(@class, 'haupt')]//@title",
+    ".//a[starts-with(@href, '/b')]/@title",
+    ".//a/text()",
+    ".//tbody/tr/*[2]//text()",
+    ".//span[@data-x]//text()",
+    '//span[@data-x="it\'s"]/@data-x',
+]
+
+
+@pytest.mark.parametrize(
+    "xpath,css",
+    [
+        (".//td[@class='hauptlink']//a/@href", ['td[class="hauptlink"]', "a"]),
+        ("./td[3][@class='zentriert']//text()", ['td:nth-of-type(3)[class="zentriert"]']),
+        ("//div[contains(@class, 'box')]/*[1]", ['div[class*="box"]', "*:nth-child(1)"]),
+        (".//text()", []),
+    ],
+)
+def test_translate_xpath(xpath, css):
+    assert [step.selector for step in translate_xpath(xpath).steps] == css
+
+
+@pytest.mark.parametrize(
+    "xpath",
+    [
+        "//div[@class='box'][h2[contains(text(), 'players')]]",
+        ".//td[@class='zentriert'][1]//text()",
+        ".//tr[@class='odd' or @class='even']",
+        ".//span[text()='Height:']//following::span[1]//text()",
+        "//text()",
+        "../td",
+    ],
+)
+def test_translate_xpath_without_css_equivalent(xpath):
+    assert translate_xpath(xpath) is None
+
+
+def test_get_parser_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "PARSER_BACKENDS", {"TransfermarktPlayerStats": "bs4"})
+    monkeypatch.setattr(LexborParser, "available", False)
+
+    assert get_parser("TransfermarktPlayerStats") is SoupParser
+    assert get_parser("TransfermarktPlayerInjuries", default="lexbor") is LxmlParser
+
+
+@pytest.mark.parametrize(
+    "backends,declared",
+    [
+        ({"TransfermarktPlayerInjuries": "html5"}, "lxml"),
+        ({"TransfermarktPlayerInjury": "bs4"}, "lxml"),
+        ({}, "html5"),
+        ({"TransfermarktPlayerProfile": "lexbor"}, "lxml"),
+    ],
+)
+def test_check_parser_backends_rejects_unusable_backends(monkeypatch, backends, declared):
+    monkeypatch.setattr(settings, "PARSER_BACKENDS", backends)
+    monkeypatch.setattr(TransfermarktPlayerInjuries, "PARSER", declared)
+
+    with pytest.raises(ValueError):
+        check_parser_backends([TransfermarktPlayerInjuries, TransfermarktPlayerProfile])
+
+
+def test_check_parser_backends_of_the_services(monkeypatch):
+    monkeypatch.setattr(settings, "PARSER_BACKENDS", {"TransfermarktPlayerInjuries": "lexbor"})
+
+    check_parser_backends(TransfermarktBase.services())
+    assert "Players.Injuries.RESULTS" in service_selectors(TransfermarktPlayerInjuries)
+    assert "Pagination.PAGE_NUMBER_LAST" in service_selectors(TransfermarktPlayerInjuries)
+
+
+@pytest.mark.parametrize("xpath", SELECTORS)
+def test_lexbor_matches_lxml(xpath):
+    pytest.importorskip("selectolax")
+    lxml_page, lexbor_page = LxmlParser.parse(PAGE, "utf-8"), LexborParser.parse(PAGE, "utf-8")
+    lxml_grid, lexbor_grid = lxml_page.xpath("//div[@id='grid']")[0], lexbor_page.evaluate("//div[@id='grid']")[0]
+
+    expected, actual = lxml_grid.xpath(xpath), lexbor_grid.evaluate(xpath)
+
+    if expected and isinstance(expected[0], etree._Element):
+        assert [element.node.tag for element in actual] == [element.tag for element in expected]
+    else:
+        assert actual == expected
@@ -0,0 +1,85 @@
+import pytest
+from lxml import etree
+
+from app.utils.parsers import LxmlParser
+from app.utils.pruning import prune_page
+
+PAGE = b"""<html><head><link rel="canonical" href="/a"><script>var ads = [];</script></head><body>
+<nav><a href="/">Home</a></nav>
+<header class="data-header"><h1>Name</h1></header>
+<div id="ad"><iframe src="/ad">frame</iframe></div>
+<main><div class="box">one<svg><path d="M0"/></svg>two<style>.box { color: red }</style></div></main>
+<footer>Footer</footer>
+<script type="text/javascript">new Highcharts.Chart({});</script><script>var tracking = 1;</script>
+</body></html>"""
+
+
+def test_parse_empties_blocks():
+    page = LxmlParser.parse(PAGE)
+    content = etree.tostring(page)
+
+    assert b"var ads" not in content and b"color: red" not in content and b"tracking" not in content
+    assert b"<path" not in content
+    assert b"new Highcharts.Chart({});" in content
+    assert page.xpath("//div[@class='box']/text()") == ["one", "two"]
+    assert page.xpath("//script/@type") == ["text/javascript"]
+
+
+@pytest.mark.parametrize(
+    "markup",
+    [
+        b'<div><svg class="icon"/><table id="yw1"><tr><td>Player</td></tr></table></div>',
+        b"<div><!-- <script> --><table id='yw1'><tr><td>Player</td></tr></table></div><script>var a;</script>",
+        b"<div><script>var a = '<table>';</script><table id='yw1'><tr><td>Player</td></tr></table></div>",
+        b"<div><svg><table id='yw1'><tr><td>Player</td></tr></table></svg></div>",
+    ],
+)
+def test_parse_keeps_content_around_blocks(markup):
+    page = LxmlParser.parse(b"<html><body>" + markup + b"</body></html>")
+
+    assert page.xpath("//table[@id='yw1']//td/text()") == etree.HTML(markup).xpath("//table[@id='yw1']//td/text()")
+    assert page.xpath("//table[@id='yw1']//td/text()") == ["Player"]
+
+
+def test_parse_chunks_wherever_they_are_cut():
+    expected = etree.tostring(LxmlParser.parse_chunks([PAGE])[1])
+
+    for size in range(1, len(PAGE)):
+        chunks = [PAGE[start : start + size] for start in range(0, len(PAGE), size)]
+        assert etree.tostring(LxmlParser.parse_chunks(chunks)[1]) == expected, size
+
+
+def test_parse_chunks_stops_after_elements():
+    chunks = [PAGE[start : start + 64] for start in range(0, len(PAGE), 64)]
+
+    consumed, page = LxmlParser.parse_chunks(chunks, until=("ad",))
+
+    assert len(consumed) < len(chunks)
+    assert page.xpath("//header/h1/text()") == ["Name"]
+    assert page.xpath("//footer") == []
+
+
+def test_parse_empty_page():
+    assert LxmlParser.parse(b"") is None
+
+
+def test_prune_page_keeps_head_and_regions():
+    page = prune_page(etree.HTML(PAGE), ("//header", "//main", "//main/div"))
+
+    assert [element.tag for element in page.find("body")] == ["header", "main"]
+    assert page.xpath("//link/@href") == ["/a"]
+    assert page.xpath("//main//text()") == ["one", "two", ".box { color: red }"]
+
+
+def test_prune_page_keeps_page_when_a_region_is_missing():
+    page = prune_page(etree.HTML(PAGE), ("//main", "//aside"))
+
+    assert [element.tag for element in page.find("body")] == [
+        "nav",
+        "header",
+        "div",
+        "main",
+        "footer",
+        "script",
+        "script",
+    ]
@@ -0,0 +1,103 @@
+import pytest
+from fastapi import HTTPException
+
+from app.services.clubs.players import TransfermarktClubPlayers
+from app.services.competitions.clubs import TransfermarktCompetitionClubs
+from app.settings import settings
+from app.utils.ratelimit import AdaptiveTokenBucket, RateLimiter, parse_retry_after
+
+PAGE = b"""
+<html><body>
+<div class="data-header__headline-container"><h1>Premier League</h1></div>
+</body></html>
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_RETRY_BACKOFF_BASE", 0.001)
+    monkeypatch.setattr("app.services.base.rate_limiter", RateLimiter())
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_bucket_paces_requests_beyond_burst():
+    clock = FakeClock()
+    bucket = AdaptiveTokenBucket(rate=2, min_rate=1, max_rate=10, burst=2, clock=clock)
+
+    assert [bucket.reserve(max_wait=10) for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    assert bucket.reserve(max_wait=1) is None
+    clock.now = 2.0
+    assert bucket.reserve(max_wait=10) == 0.0
+
+
+def test_bucket_adapts_rate_to_throttling():
+    clock = FakeClock()
+    bucket = AdaptiveTokenBucket(rate=8, min_rate=1, max_rate=10, burst=1, clock=clock)
+    bucket.on_throttled(retry_after=5)
+    bucket.on_throttled()
+
+    assert bucket.rate == 4
+    assert bucket.reserve(max_wait=10) == 5.0
+
+    bucket.on_success()
+    assert bucket.rate == 4.25
+
+
+def test_record_retries_only_retryable_outcomes(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_RETRY_ATTEMPTS", 2)
+    limiter = RateLimiter()
+    url = "https://www.transfermarkt.com/"
+
+    assert limiter.record(url, 0, 404) is None
+    assert limiter.record(url, 0, 429, retry_after="2") >= 2
+    assert limiter.record(url, 1, None) is not None
+    assert limiter.record(url, 2, 503) is None
+    assert limiter.record(url, 0, 503, retry_after="3600") is None
+    assert limiter.stats()["retries"] == 2
+
+
+def test_service_retries_throttled_requests(static_session, fast_retries):
+    url = TransfermarktCompetitionClubs.upstream_urls(competition_id="GB1")[0]
+    responses = iter([(429, b"", {"Retry-After": "0"}), (502, b"", {}), (200, PAGE, {})])
+    session = static_session({url: lambda request: next(responses)})
+    tfmkt = TransfermarktCompetitionClubs(competition_id="GB1", session=session)
+
+    assert tfmkt.get_competition_clubs()["name"] == "Premier League"
+    assert len(session.get_adapter(url).sent) == 3
+
+
+def test_service_closes_retried_streamed_responses(static_session, fast_retries, load_fixture):
+    url = TransfermarktClubPlayers.upstream_urls(club_id="11", season_id="2024")[0]
+    responses = iter([(503, b"<html>busy</html>", {}), (200, load_fixture("clubs_players.html"), {})])
+    session = static_session({url: lambda request: next(responses)})
+    received = []
+    session.hooks["response"].append(lambda response, **kwargs: received.append(response))
+
+    TransfermarktClubPlayers(club_id="11", season_id="2024", session=session)
+
+    assert [response.status_code for response in received] == [503, 200]
+    assert received[0].raw.closed
+
+
+def test_service_gives_up_after_retries(static_session, fast_retries):
+    url = TransfermarktCompetitionClubs.upstream_urls(competition_id="GB1")[0]
+    session = static_session({url: (503, b"", {})})
+
+    with pytest.raises(HTTPException) as e:
+        TransfermarktCompetitionClubs(competition_id="GB1", session=session)
+    assert e.value.status_code == 503
+    assert len(session.get_adapter(url).sent) == settings.HTTP_RETRY_ATTEMPTS + 1
@@ -0,0 +1,151 @@
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import FakeRESPServer
+
+from app.utils.remotecache import RemoteCache, build_client
+
+
+def remote(url: str, lock_wait: float = 5.0, **kwargs) -> RemoteCache:
+    return RemoteCache(build_client(url, timeout=1.0), prefix="test:", lock_ttl=5.0, lock_wait=lock_wait, **kwargs)
+
+
+def test_remote_cache_counts_error_replies(resp_server):
+    cache = remote(resp_server.url)
+
+    assert cache.execute("flushall") is None
+    assert cache.stats()["errors"] == 1
+    # An error reply does not take the server out of service
+    cache.set("page:url", b"page", ttl=60)
+    assert cache.get("page:url") == b"page"
+
+
+def test_remote_cache_authenticates():
+    server = FakeRESPServer(password="secret")
+    try:
+        cache = remote(f"redis://:secret@127.0.0.1:{server.server_address[1]}/2")
+
+        assert cache.get("page:url") is None
+        assert cache.stats()["errors"] == 0
+        assert [command for command in server.commands if command != "CLIENT"] == ["AUTH", "SELECT", "GET"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_remote_cache_stores_compressed_values(resp_server):
+    cache = remote(resp_server.url)
+    cache.set("page:url", b"<html>" * 100, ttl=60)
+
+    assert len(resp_server.data[b"test:page:url"][0]) < 600
+    assert cache.get("page:url") == b"<html>" * 100
+    assert cache.get("page:other") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_remote_cache_expires_values(resp_server):
+    cache = remote(resp_server.url)
+    cache.set("page:url", b"page", ttl=0.05)
+    time.sleep(0.1)
+
+    assert cache.get("page:url") is None
+
+
+def test_get_or_lock_elects_one_instance(resp_server):
+    leader, follower = remote(resp_server.url), remote(resp_server.url, lock_wait=5.0, poll=0.01)
+    value, token = leader.get_or_lock("page:url")
+    assert value is None and token is not None
+
+    def refresh():
+        time.sleep(0.1)
+        leader.set("page:url", b"page", ttl=60)
+        leader.unlock("page:url", token)
+
+    thread = threading.Thread(target=refresh)
+    thread.start()
+
+    assert follower.get_or_lock("page:url") == (b"page", None)
+    assert follower.stats()["waits"] == 1
+    thread.join()
+    assert b"test:lock:page:url" not in resp_server.data
+
+
+def test_get_or_lock_takes_over_released_lock(resp_server):
+    leader, follower = remote(resp_server.url), remote(resp_server.url, poll=0.01)
+    _, token = leader.get_or_lock("page:url")
+    threading.Timer(0.05, leader.unlock, ("page:url", token)).start()
+
+    value, taken = follower.get_or_lock("page:url")
+
+    assert value is None
+    assert taken not in (None, token)
+
+
+def test_get_or_lock_gives_up_after_wait(resp_server):
+    leader, follower = remote(resp_server.url), remote(resp_server.url, lock_wait=0.05, poll=0.01)
+    _, token = leader.get_or_lock("page:url")
+
+    assert follower.get_or_lock("page:url") == (None, None)
+
+    # Another token does not release the lock
+    follower.unlock("page:url", "other")
+    assert b"test:lock:page:url" in resp_server.data
+    leader.unlock("page:url", token)
+    assert b"test:lock:page:url" not in resp_server.data
+
+
+def test_get_or_lock_bounds_waiting_threads(resp_server):
+    leader, follower = remote(resp_server.url), remote(resp_server.url, lock_wait=0.5, max_waiters=2, poll=0.01)
+    _, token = leader.get_or_lock("page:url")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: follower.get_or_lock("page:url"), range(4)))
+
+    assert results == [(None, None)] * 4
+    assert follower.stats()["waits"] == 2
+    leader.unlock("page:url", token)
+
+
+def test_remote_cache_single_flight_across_instances(resp_server):
+    instances = [remote(resp_server.url, poll=0.01) for _ in range(4)]
+    fetches = []
+
+    def fetch(cache: RemoteCache) -> bytes:
+        value, token = cache.get_or_lock("page:url")
+        if value is not None:
+            return value
+        try:
+            time.sleep(0.1)
+            fetches.append(cache)
+            cache.set("page:url", b"page", ttl=60)
+            return b"page"
+        finally:
+            cache.unlock("page:url", token)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(fetch, instances))
+
+    assert results == [b"page"] * 4
+    assert len(fetches) == 1
+
+
+def test_remote_cache_fails_open_when_unreachable():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    cache = remote(f"redis://127.0.0.1:{port}")
+
+    assert cache.get_or_lock("page:url") == (None, None)
+    cache.set("page:url", b"page", ttl=60)
+    assert cache.stats()["errors"] == 1
+
+
+def test_remote_cache_disabled_without_client():
+    cache = RemoteCache(None, prefix="test:", lock_ttl=5.0, lock_wait=5.0)
+    cache.set("page:url", b"page", ttl=60)
+
+    assert cache.get_or_lock("page:url") == (None, None)
+    assert cache.stats()["enabled"] is False
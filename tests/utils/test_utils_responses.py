@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.schemas import clubs, competitions, players
+from app.services.clubs.players import TransfermarktClubPlayers
+from app.services.clubs.profile import TransfermarktClubProfile
+from app.services.competitions.clubs import TransfermarktCompetitionClubs
+from app.services.players.achievements import TransfermarktPlayerAchievements
+from app.services.players.market_value import TransfermarktPlayerMarketValue
+from app.services.players.profile import TransfermarktPlayerProfile
+from app.services.players.transfers import TransfermarktPlayerTransfers
+from app.utils.responses import model_response
+
+RESPONSES = [
+    (TransfermarktClubPlayers, {"club_id": "11", "season_id": "2024"}, "get_club_players", ["clubs_players.html"]),
+    (TransfermarktClubProfile, {"club_id": "11"}, "get_club_profile", ["clubs_profile.html"]),
+    (TransfermarktCompetitionClubs, {"competition_id": "GB1"}, "get_competition_clubs", ["competitions_clubs.html"]),
+    (
+        TransfermarktPlayerAchievements,
+        {"player_id": "316264"},
+        "get_player_achievements",
+        ["players_achievements.html"],
+    ),
+    (
+        TransfermarktPlayerMarketValue,
+        {"player_id": "316264"},
+        "get_player_market_value",
+        ["players_market_value.html", "players_market_value.json"],
+    ),
+    (TransfermarktPlayerProfile, {"player_id": "316264"}, "get_player_profile", ["players_profile.html"]),
+    (
+        TransfermarktPlayerTransfers,
+        {"player_id": "316264"},
+        "get_player_transfers",
+        ["players_transfers.html", "players_transfers.json"],
+    ),
+]
+# The response model and the serialization options of the endpoint of each service
+ENDPOINTS = {
+    TransfermarktClubPlayers: (clubs.ClubPlayers, {"exclude_defaults": True}),
+    TransfermarktClubProfile: (clubs.ClubProfile, {"exclude_defaults": True}),
+    TransfermarktCompetitionClubs: (competitions.CompetitionClubs, {}),
+    TransfermarktPlayerAchievements: (players.PlayerAchievements, {"exclude_none": True}),
+    TransfermarktPlayerMarketValue: (players.PlayerMarketValue, {"exclude_none": True}),
+    TransfermarktPlayerProfile: (players.PlayerProfile, {"exclude_none": True}),
+    TransfermarktPlayerTransfers: (players.PlayerTransfers, {"exclude_none": True}),
+}
+
+
+def fastapi_body(schema, data: dict, options: dict) -> bytes:
+    app = FastAPI()
+
+    @app.get("/", response_model=schema, **{f"response_model_{key}": value for key, value in options.items()})
+    def endpoint():
+        return data
+
+    return TestClient(app).get("/").content
+
+
+@pytest.mark.parametrize(
+    "service,kwargs,method,fixtures",
+    RESPONSES,
+    ids=[service.__name__ for service, *_ in RESPONSES],
+)
+def test_model_response_matches_fastapi(static_session, load_fixture, monkeypatch, service, kwargs, method, fixtures):
+    routes = dict(zip(service.upstream_urls(**kwargs), map(load_fixture, fixtures)))
+    monkeypatch.setattr(service, "STREAM_UNTIL", ())
+    data = getattr(service(session=static_session(routes), **kwargs), method)()
+    data["updatedAt"] = datetime(2025, 1, 1, 12, 30)
+    schema, options = ENDPOINTS[service]
+
+    body = model_response(schema, data, **options).body
+
+    assert body == fastapi_body(schema, data, options)
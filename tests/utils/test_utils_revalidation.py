@@ -0,0 +1,51 @@
+from app.services.competitions.clubs import TransfermarktCompetitionClubs
+from app.utils.revalidation import ValidatorStore, validator_store
+
+PAGE = b"""
+<html><body>
+<div class="data-header__headline-container"><h1>Premier League</h1></div>
+</body></html>
+"""
+
+
+def test_store_keeps_only_responses_with_validators():
+    store = ValidatorStore(max_entries=2)
+    store.store("a", {"ETag": '"v1"'}, b"a")
+    store.store("b", {"Last-Modified": "Sat, 01 Jun 2024 10:00:00 GMT"}, b"b")
+    store.store("c", {}, b"c")
+
+    assert store.conditional_headers("a") == {"If-None-Match": '"v1"'}
+    assert store.conditional_headers("b") == {"If-Modified-Since": "Sat, 01 Jun 2024 10:00:00 GMT"}
+    assert store.conditional_headers("c") == {}
+
+
+def test_store_evicts_least_recently_used():
+    store = ValidatorStore(max_entries=2)
+    store.store("a", {"ETag": "a"}, b"a")
+    store.store("b", {"ETag": "b"}, b"b")
+    store.get("a")
+    store.store("c", {"ETag": "c"}, b"c")
+
+    assert store.get("b") is None
+    assert store.get("a").content == b"a"
+
+
+def test_not_modified_reuses_body_and_parsed_page(static_session):
+    url = TransfermarktCompetitionClubs.upstream_urls(competition_id="GB1")[0]
+
+    def respond(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return 304, b"", {"ETag": '"v1"'}
+        return 200, PAGE, {"ETag": '"v1"'}
+
+    session = static_session({url: respond})
+    before = validator_store.stats()
+    first = TransfermarktCompetitionClubs(competition_id="GB1", session=session)
+    second = TransfermarktCompetitionClubs(competition_id="GB1", session=session)
+    after = validator_store.stats()
+
+    assert second.page is first.page
+    assert second.get_competition_clubs()["name"] == "Premier League"
+    assert after["revalidated"] - before["revalidated"] == 1
+    assert after["downloaded"] - before["downloaded"] == 1
+    assert after["bytesSaved"] - before["bytesSaved"] == len(PAGE)
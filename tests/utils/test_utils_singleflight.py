@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+def test_do_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    executions = []
+
+    def fetch():
+        executions.append(threading.get_ident())
+        time.sleep(0.2)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: flight.do("url", fetch), range(8)))
+
+    assert len(executions) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"calls": 8, "executions": 1, "coalesced": 7, "coalescingRatio": 7 / 8}
+
+
+def test_do_shares_errors_and_forgets_finished_calls():
+    flight = SingleFlight()
+
+    with pytest.raises(ValueError):
+        flight.do("url", lambda: int("not a number"))
+    assert flight.do("url", lambda: 1) == 1
+    assert flight.stats()["executions"] == 2
+
+
+def test_do_async_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.1)
+        return "page"
+
+    async def run():
+        return await asyncio.gather(*(flight.do_async("url", fetch) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["page"] * 5
+    assert len(executions) == 1
+    assert flight.stats()["coalesced"] == 4
+
+
+def test_do_async_hands_over_a_cancelled_call():
+    flight = SingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.1)
+        return "page"
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do_async("url", fetch))
+        await asyncio.sleep(0.01)
+        followers = asyncio.gather(*(flight.do_async("url", fetch) for _ in range(3)))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await followers
+
+    assert asyncio.run(run()) == ["page"] * 3
+    assert len(executions) == 2
+    assert flight.stats()["calls"] == 4
@@ -0,0 +1,49 @@
+import pytest
+
+from app.utils.regex import REGEX_DOB, REGEX_TFMKT_URL
+from app.utils.utils import extract_from_url, extract_from_urls, parse_url, safe_regex, trim_list
+
+URLS = [
+    "/bukayo-saka/profil/spieler/433177",
+    "/premier-league/startseite/wettbewerb/GB1/saison_id/2023",
+    "/arsenal-fc/spielplan/verein/11/saison_id/2024",
+    "/bukayo-saka/transfers/spieler/433177/transfer_id/4075632",
+    "/jugend/transfers/spieler/1/saison_id/2019/transfer_id/12",
+    "/fc-bayern-m%C3%BCnchen/startseite/verein/27",
+    "/ea-guingamp/startseite/verein/855/",
+    "/a/b/c/12-3",
+    "/a/b/c/1/saison_id/23",
+    "/a/b/c/1/plus/1",
+    "/a/b/c",
+    "/-/b/c/1",
+    "https://www.transfermarkt.com/a/b/c/1",
+]
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_parse_url_matches_regex(url):
+    match = REGEX_TFMKT_URL.match(url)
+
+    assert parse_url(url) == (match and match.groupdict())
+
+
+def test_extract_from_url():
+    assert extract_from_url(" /premier-league/startseite/wettbewerb/GB1/saison_id/2023\xa0", "season_id") == "2023"
+    assert extract_from_url("/premier-league/startseite/wettbewerb/GB1", "season_id") is None
+    assert extract_from_url("/premier-league/startseite/wettbewerb/GB1", "count") is None
+    assert extract_from_url("https://www.transfermarkt.com/a/b/c/1") is None
+    assert extract_from_urls(["/arsenal-fc/spielplan/verein/11", None, "/a/b/c/12-3"]) == ["11", None, "12"]
+
+
+def test_trim_list():
+    texts = ["\n  Arsenal FC\xa0 ", " ", "", "€90.00m"]
+
+    assert trim_list(texts) == ["Arsenal FC", "€90.00m"]
+    assert trim_list(texts, remove_empty=False) == ["Arsenal FC", "", "", "€90.00m"]
+
+
+def test_safe_regex():
+    assert safe_regex(" Sep 5, 2001 (23) ", REGEX_DOB, "age") == "23"
+    assert safe_regex(["Sep 5, 2001", " (23)"], REGEX_DOB.pattern, "dob") == "Sep 5, 2001"
+    assert safe_regex("Sep 5, 2001", REGEX_DOB, "age") is None
+    assert safe_regex(None, REGEX_DOB, "age") is None
@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from lxml import etree
+
+from app.utils.xpath import SELECTORS, Clubs, Players, compile_selectors, compile_xpath, evaluate
+
+
+def test_selectors_compiled_at_import():
+    assert SELECTORS["Players.Profile.NAME"] is compile_xpath(Players.Profile.NAME)
+    assert SELECTORS["Clubs.Players.SIGNED_FROM"].path == Clubs.Players.SIGNED_FROM
+
+
+def test_compile_xpath_per_thread():
+    compiled = compile_xpath(Players.Profile.NAME)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other = executor.submit(compile_xpath, Players.Profile.NAME).result()
+
+    assert compile_xpath(Players.Profile.NAME) is compiled
+    assert other is not compiled
+    assert other.path == compiled.path
+
+
+def test_compile_selectors_rejects_malformed_xpath():
+    class Broken:
+        class Profile:
+            NAME = "//h1[@class='name'"
+
+    with pytest.raises(ValueError, match="Broken.Profile.NAME"):
+        compile_selectors(Broken)
+
+
+def test_evaluate_matches_element_xpath(load_fixture):
+    page = etree.HTML(load_fixture("players_injuries.html"))
+    rows = evaluate(page, Players.Injuries.RESULTS)
+
+    assert rows == page.xpath(Players.Injuries.RESULTS)
+    assert [evaluate(row, Players.Injuries.INJURY) for row in rows] == [
+        row.xpath(Players.Injuries.INJURY) for row in rows
+    ]